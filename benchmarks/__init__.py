@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Benchmarks of the performance critical parts of Eapii.
+
+Each module can be run as a script, for example :
+
+    $ python -m benchmarks.bench_accessors
+
+All the benchmarks can be run at once, and compared to a previous run, using
+the benchmarks package itself (see benchmarks.__main__) :
+
+    $ python -m benchmarks --save reference.json
+    $ python -m benchmarks --compare reference.json
+
+"""
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Run the benchmarks and compare the results to a previous run.
+
+    $ python -m benchmarks --save before.json
+    $ python -m benchmarks hot_path accessors --compare before.json
+
+The process exits with a non-zero code if any measurement got slower than the
+reference by more than the tolerance.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+import io
+import json
+import sys
+from argparse import ArgumentParser
+from importlib import import_module
+
+from .tools import RESULTS
+
+#: Benchmark modules (without the bench_ prefix) run by default.
+BENCHMARKS = ('accessors', 'hot_path', 'proxies', 'range', 'register',
+              'channels', 'simulation', 'group', 'import')
+
+
+def compare(results, reference, tolerance):
+    """Compare results to a reference.
+
+    Returns
+    -------
+    regressions : list
+        Names of the measurements slower than the reference by more than the
+        tolerance.
+
+    """
+    regressions = []
+    for name, time in results.items():
+        if name not in reference:
+            continue
+        ratio = time/reference[name]
+        flag = ''
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('{:<45} x{:.2f}{}'.format(name, ratio, flag))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('benchmarks', nargs='*', default=BENCHMARKS,
+                        help='Benchmarks to run (default: all)')
+    parser.add_argument('--save', help='File in which to save the results')
+    parser.add_argument('--compare', help='Results file to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Accepted relative slow down (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    for name in args.benchmarks:
+        print('--- {}'.format(name))
+        module = import_module('.bench_' + name, __package__)
+        getattr(module, 'bench_' + name)()
+
+    if args.save:
+        with io.open(args.save, 'w', encoding='utf-8') as f:
+            f.write(type('')(json.dumps(RESULTS, indent=1)))
+
+    if args.compare:
+        with io.open(args.compare, encoding='utf-8') as f:
+            reference = json.load(f)
+        print('--- comparison to {}'.format(args.compare))
+        if compare(RESULTS, reference, args.tolerance):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
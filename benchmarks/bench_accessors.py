@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Compare the generic IProperty chains to the compiled accessors.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+
+from eapii.core.iprops.api import Float, Mapping, Register
+from .tools import BenchDriver, measure, report
+
+
+class AccessorsDriver(BenchDriver):
+
+    caching_permissions = ('cached_float', 'cached_mapping',
+                           'cached_register')
+
+    float = Float('F?', 'F {}', unit='V')
+
+    cached_float = Float('F?', 'F {}', unit='V')
+
+    mapping = Mapping('M?', 'M {}', mapping={'On': '1', 'Off': '0'})
+
+    cached_mapping = Mapping('M?', 'M {}', mapping={'On': '1', 'Off': '0'})
+
+    register = Register('R?', 'R {}', names=list('abcdefgh'))
+
+    cached_register = Register('R?', 'R {}', names=list('abcdefgh'))
+
+
+def _use_generic_accessors(iprop):
+    """Make the IProperty use the generic chains.
+
+    """
+    property.__init__(iprop, iprop._get, iprop._set, iprop._del)
+
+
+def bench_accessors():
+    """Time gets and sets using the generic and the compiled chains.
+
+    """
+    driver = AccessorsDriver({'F?': '1.0', 'M?': '1', 'R?': '5'})
+    cls = type(driver)
+    operations = []
+    for name, value in (('float', 1.0), ('mapping', 'On'),
+                        ('register', {'a': True, 'c': True})):
+        get = lambda n=name: getattr(driver, n)
+        c_get = lambda n='cached_' + name: getattr(driver, n)
+        set = lambda n=name, v=value: setattr(driver, n, v)
+        operations.extend((('get ' + name, name, get),
+                           ('get cached_' + name, 'cached_' + name, c_get),
+                           ('set ' + name, name, set)))
+
+    for label, name, operation in operations:
+        iprop = getattr(cls, name)
+        _use_generic_accessors(iprop)
+        operation()
+        generic = measure(operation)
+        iprop.compile_accessors()
+        compiled = measure(operation)
+        report(label + ' (generic)', generic)
+        report(label + ' (compiled)', compiled, generic)
+
+
+if __name__ == '__main__':
+    bench_accessors()
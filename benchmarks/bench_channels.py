@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Time the accesses to the IProperties of many channels at once.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+
+from eapii.core.api import Channel
+from eapii.core.iprops.api import Float
+from .tools import BenchDriver, measure, report, count_calls
+
+
+IDS = list(range(1, 65))
+
+
+class DacChannel(Channel):
+
+    voltage = Float('V?', 'V {}')
+
+
+class DacDriver(BenchDriver):
+
+    ch = DacChannel()
+
+
+class ListDacDriver(BenchDriver):
+    """Driver answering with a single (list) command for all the channels.
+
+    """
+    ch = DacChannel()
+
+    def default_get_channels(self, iprop, cmd, ch_ids, *args, **kwargs):
+        self.get_calls += 1
+        return [self.answers[cmd]]*len(ch_ids)
+
+    def default_set_channels(self, iprop, cmd, values, ch_ids, *args,
+                             **kwargs):
+        self.set_calls += 1
+
+
+def bench_channels(number=1000):
+    """Time the get and set of a Float on 64 channels, one channel at a time
+    and through a channel collection.
+
+    """
+    values = [[float(i) for i in range(64)], [float(-i) for i in range(64)]]
+    for label, cls in (('', DacDriver), (' (list commands)', ListDacDriver)):
+        driver = cls({'V?': '1.0'})
+        channels = driver.get_channels(IDS)
+
+        def loop():
+            for i in IDS:
+                driver.get_ch(i).voltage
+
+        def get():
+            channels.voltage
+
+        def set_values(it=[0]):
+            it[0] ^= 1
+            channels.voltage = values[it[0]]
+
+        if not label:
+            report('get 64 channels (loop)', measure(loop, number),
+                   calls=count_calls(driver, loop))
+        report('get 64 channels' + label, measure(get, number),
+               calls=count_calls(driver, get))
+        report('set 64 channels' + label, measure(set_values, number),
+               calls=count_calls(driver, set_values))
+
+
+if __name__ == '__main__':
+    bench_channels()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Compare setting/getting a value on many instruments sequentially and using
+an InstrumentGroup.
+
+The instruments answer after a fixed delay emulating the communication
+latency. They are either all independent (as TCPIP instruments) or spread
+over a few GPIB boards.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from time import sleep
+
+from eapii.core.group import InstrumentGroup
+from eapii.core.iprops.api import Float
+from .tools import BenchDriver, measure, report
+
+
+class LatencyDriver(BenchDriver):
+    """Driver sleeping for each communication.
+
+    """
+    voltage = Float('V?', 'V {}')
+
+    def __init__(self, latency, bus_id=None):
+        super(LatencyDriver, self).__init__({'V?': '1.0'})
+        self.latency = latency
+        self.bus_id = bus_id
+
+    def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+        sleep(self.latency)
+        return super(LatencyDriver, self).default_get_iproperty(iprop, cmd)
+
+    def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
+        sleep(self.latency)
+        super(LatencyDriver, self).default_set_iproperty(iprop, cmd)
+
+
+def bench_group(instr_number=16, latency=2e-3, boards=4):
+    """Time a set followed by a get on all the instruments.
+
+    """
+    layouts = (('independent', lambda i: None),
+               ('{} GPIB boards'.format(boards),
+                lambda i: 'GPIB{}'.format(i % boards)),
+               ('single GPIB board', lambda i: 'GPIB0'))
+    for label, bus in layouts:
+        instrs = [LatencyDriver(latency, bus(i)) for i in range(instr_number)]
+        values = [0.1*i for i in range(instr_number)]
+
+        def sequential():
+            for instr, value in zip(instrs, values):
+                instr.voltage = value
+            return [instr.voltage for instr in instrs]
+
+        with InstrumentGroup(instrs) as group:
+
+            def grouped():
+                group.set('voltage', values)
+                return group.get('voltage')
+
+            ref = measure(sequential, number=5)
+            report('{} instrs {}: sequential'.format(instr_number, label),
+                   ref)
+            report('{} instrs {}: group'.format(instr_number, label),
+                   measure(grouped, number=5), ref)
+
+
+if __name__ == '__main__':
+    bench_group()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Time the operations executed for each access to an IProperty.
+
+The number of calls to the communication methods of the driver performed by
+each operation is reported along its duration.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from itertools import cycle
+
+from eapii.core.api import (Channel, SubSystem, FloatRangeValidator,
+                            IntRangeValidator)
+from eapii.core.iprops.api import Float, Int, Mapping, Register
+from eapii.core.unit import get_unit_registry
+from eapii import explore
+from .tools import BenchDriver, measure, report, count_calls
+
+
+class InnerSubSystem(SubSystem):
+
+    ch = Channel()
+    ch.value = Float('C?', 'C {}')
+
+
+class OuterChannel(Channel):
+
+    sub = InnerSubSystem()
+
+
+class OuterSubSystem(SubSystem):
+
+    ch = OuterChannel()
+
+
+class HotPathDriver(BenchDriver):
+
+    caching_permissions = ('cached_float', 'mode')
+
+    float = Float('F?', 'F {}')
+
+    cached_float = Float('F?', 'F {}')
+
+    unit_float = Float('F?', 'F {}', unit='V')
+
+    magnitude_float = Float('F?', 'F {}', unit='V', quantity=False)
+
+    ranged_float = Float('F?', 'F {}', unit='V', range='voltage')
+
+    int = Int('I?', 'I {}', range='int')
+
+    mapping = Mapping('M?', 'M {}', mapping={'On': '1', 'Off': '0'})
+
+    mode = Mapping('M?', 'M {}', mapping={'On': '1', 'Off': '0'})
+
+    checked_float = Float('F?', 'F {}', checks='{mode} == "On"')
+
+    register = Register('R?', 'R {}', names=list('abcdefgh'))
+
+    patched = Float('F?', 'F {}')
+
+    ch = Channel()
+    ch.value = Float('C?', 'C {}')
+
+    deep = OuterSubSystem()
+
+    def _range_voltage(self):
+        return FloatRangeValidator(-10.0, 10.0, 1e-3, 'V')
+
+    def _range_int(self):
+        return IntRangeValidator(-10, 10, 1)
+
+
+def _values(*values):
+    """Alternate between values so that sets are not skipped.
+
+    """
+    it = cycle(values)
+    return lambda: next(it)
+
+
+def bench_hot_path(number=20000):
+    """Time gets and sets exercising the different validation paths.
+
+    """
+    ureg = get_unit_registry()
+    driver = HotPathDriver({'F?': '1.0', 'I?': '1', 'M?': '1', 'R?': '5',
+                            'C?': '2.0'})
+    driver.patch_iprop('patched', getter='C?')
+    ch = driver.get_ch(1)
+    deep_ch = driver.deep.get_ch(1).sub.get_ch(2)
+
+    floats = _values(1.0, 2.0)
+    ints = _values(1, 2)
+    volts = _values(1*ureg.V, 2*ureg.V)
+    modes = _values('On', 'Off')
+    registers = _values({'a': True}, {'b': True})
+
+    operations = (
+        ('get float', driver, lambda: driver.float),
+        ('get cached float', driver, lambda: driver.cached_float),
+        ('get float with unit', driver, lambda: driver.unit_float),
+        ('get float with unit as float', driver,
+         lambda: driver.magnitude_float),
+        ('get mapping', driver, lambda: driver.mapping),
+        ('get float with checks', driver, lambda: driver.checked_float),
+        ('get register', driver, lambda: driver.register),
+        ('get proxy patched float', driver, lambda: driver.patched),
+        ('get channel float', ch, lambda: ch.value),
+        ('get nested channel float', deep_ch, lambda: deep_ch.value),
+        ('access channel and get float', driver,
+         lambda: driver.get_ch(1).value),
+        ('set float', driver, lambda: setattr(driver, 'float', floats())),
+        ('set float with unit', driver,
+         lambda: setattr(driver, 'unit_float', volts())),
+        ('set float with range and unit', driver,
+         lambda: setattr(driver, 'ranged_float', volts())),
+        ('set int with range', driver,
+         lambda: setattr(driver, 'int', ints())),
+        ('set float with checks', driver,
+         lambda: setattr(driver, 'checked_float', floats())),
+        ('set mapping', driver,
+         lambda: setattr(driver, 'mapping', modes())),
+        ('set register', driver,
+         lambda: setattr(driver, 'register', registers())),
+        )
+
+    for label, obj, operation in operations:
+        driver.mode = 'On'
+        operation()
+        calls = count_calls(obj, operation)
+        report(label, measure(operation, number), calls=calls)
+
+    report('list drivers (indexed)', measure(explore.list_drivers, 1000))
+    report('get driver (loaded)',
+           measure(lambda: explore.get_driver('YokogawaGS200'), 1000))
+
+
+if __name__ == '__main__':
+    bench_hot_path()
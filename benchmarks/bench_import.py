@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Measure the time necessary to import the bundled drivers.
+
+Each measurement is performed in a fresh interpreter so that no module is
+already imported. The time needed to later extract the docstrings of all the
+IProperties is reported separately.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+import os
+import sys
+from subprocess import check_output
+
+import eapii
+from .tools import report
+
+
+SCRIPT = '''
+from timeit import default_timer
+from importlib import import_module
+start = default_timer()
+import eapii.core.api
+core = default_timer()
+modules = [import_module(m) for m in {modules!r}]
+drivers = default_timer()
+from eapii.core.has_i_props import HasIProps
+for m in modules:
+    for obj in vars(m).values():
+        if isinstance(obj, type) and issubclass(obj, HasIProps):
+            for iprop in obj.__iprops__.values():
+                iprop.__doc__
+docs = default_timer()
+print('%r %r %r' % (core - start, drivers - core, docs - drivers))
+'''
+
+
+def driver_modules():
+    """List the modules of the bundled drivers.
+
+    """
+    root = os.path.dirname(os.path.abspath(eapii.__file__))
+    modules = []
+    for pack in ('visa', 'clib'):
+        for dirpath, _, filenames in os.walk(os.path.join(root, pack)):
+            rel = os.path.relpath(dirpath, os.path.dirname(root))
+            for f in sorted(filenames):
+                if f.endswith('.py') and not f.startswith('_'):
+                    path = os.path.join(rel, f[:-3])
+                    modules.append(str('.'.join(path.split(os.sep))))
+
+    return modules
+
+
+def bench_import(repeat=5):
+    """Time the import of eapii core and of the bundled drivers.
+
+    """
+    script = SCRIPT.format(modules=driver_modules())
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(eapii.__file__)))
+    best = None
+    for _ in range(repeat):
+        out = check_output([sys.executable, '-c', script], cwd=cwd)
+        times = [float(t) for t in out.split()]
+        if best is None:
+            best = times
+        else:
+            best = [min(b, t) for b, t in zip(best, times)]
+
+    report('import eapii.core.api', best[0])
+    report('import bundled drivers', best[1])
+    report('extract all iprops docstrings', best[2])
+
+
+if __name__ == '__main__':
+    bench_import()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Time the accesses to IProperties once some instances have been patched.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+
+from eapii.core.iprops.api import Float
+from .tools import BenchDriver, measure, report
+
+
+class ProxiesDriver(BenchDriver):
+
+    value = Float('F?', 'F {}')
+
+
+def bench_proxies(counts=(1, 100, 10000)):
+    """Time gets and sets on patched and unpatched drivers, and the patching
+    itself.
+
+    For each number of drivers, all but the first one have their IProperty
+    patched.
+
+    """
+    answers = {'F?': '1.0'}
+    for count in counts:
+        drivers = [ProxiesDriver(answers) for _ in range(count)]
+        for driver in drivers[1:]:
+            driver.patch_iprop('value', post_get=lambda p, o, v: v)
+
+        label = ' ({} drivers)'.format(count)
+        free, patched = drivers[0], drivers[-1]
+        report('get unpatched' + label, measure(lambda: free.value))
+        if count > 1:
+            report('get patched' + label, measure(lambda: patched.value))
+
+        def set_value(driver=free):
+            driver.clear_cache()
+            driver.value = 2.0
+        report('set unpatched' + label, measure(set_value))
+
+    driver = ProxiesDriver(answers)
+
+    def cycle():
+        driver.patch_iprop('value', secure_comm=1)
+        driver.unpatch_iprop('value', 'secure_comm')
+    report('patch/unpatch', measure(cycle, number=10000))
+
+
+if __name__ == '__main__':
+    bench_proxies()
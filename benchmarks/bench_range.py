@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Time the validation of a whole sweep against a range.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+import numpy as np
+
+from eapii.core.api import FloatRangeValidator
+from eapii.core.unit import get_unit_registry
+from .tools import measure, report
+
+
+def bench_range(points=100000):
+    """Compare validating a sweep point by point and at once.
+
+    """
+    ureg = get_unit_registry()
+    validator = FloatRangeValidator(-10.0, 10.0, 1e-3, 'V')
+    sweep = np.round(np.linspace(-5, 5, points), 3)
+    quantities = sweep*ureg.V
+
+    def one_by_one():
+        return all(validator.validate(v) for v in sweep)
+
+    ref = measure(one_by_one, number=1, repeat=1)
+    report('validate {} points one by one'.format(points), ref)
+    report('validate_array {} points'.format(points),
+           measure(lambda: validator.validate_array(sweep), number=10), ref)
+    report('validate_array {} points (Quantity)'.format(points),
+           measure(lambda: validator.validate_array(quantities), number=10),
+           ref)
+
+
+if __name__ == '__main__':
+    bench_range()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Time the decoding and encoding of registers.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from collections import OrderedDict
+
+import numpy as np
+
+from eapii.core.iprops.api import Register
+from .tools import measure, report
+
+
+def _dict_decode(names, value):
+    """Decoding building a dict with a lambda per bit (former behaviour).
+
+    """
+    val = int(value)
+    bit_conversion = lambda x, i: bool(x & (1 << i))
+    return OrderedDict((n, bit_conversion(val, i))
+                       for i, n in enumerate(names))
+
+
+def _dict_encode(names, value):
+    """Encoding looking up the index of each name (former behaviour).
+
+    """
+    return sum((2**names.index(k) for k in value if value[k]))
+
+
+def bench_register(snapshots=10000):
+    """Compare the table driven register to the former implementation.
+
+    """
+    register = Register('R?', 'R {}', names=list('abcdefgh'))
+    names = register.names
+    state = {'a': True, 'c': True, 'h': False}
+
+    ref = measure(lambda: _dict_decode(names, '5')['c'])
+    report('decode register (dict)', ref)
+    report('decode register (flags)',
+           measure(lambda: register.post_get(None, '5')['c']), ref)
+
+    ref = measure(lambda: _dict_encode(names, state))
+    report('encode register (dict)', ref)
+    report('encode register (table)',
+           measure(lambda: register.pre_set(None, state)), ref)
+
+    values = np.random.RandomState(0).randint(0, 256, snapshots)
+    ref = measure(lambda: [register.post_get(None, v) for v in values],
+                  number=10)
+    report('decode {} snapshots one by one'.format(snapshots), ref)
+    report('decode_array {} snapshots'.format(snapshots),
+           measure(lambda: register.decode_array(values), number=10), ref)
+
+
+if __name__ == '__main__':
+    bench_register()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Measure the end to end cost of driver operations on simulated instruments.
+
+The whole VISA path of the drivers is exercised, the simulated instrument
+adding a fixed latency to each message. The number of messages exchanged per
+operation is reported along the time.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from itertools import cycle
+
+from eapii.core.unit import get_unit_registry
+from eapii.visa.visa import get_backend_resource_manager, SIMULATION_BACKEND
+from eapii.visa.simulation import SimulatedGS200, Simulated7651
+from eapii.visa.yokogawa.model_gs200 import YokogawaGS200
+from eapii.visa.yokogawa.model_7651 import Yokogawa7651
+from .tools import measure, report
+
+
+def simulated_driver(driver_cls, instrument, address):
+    """Create a driver connected to a simulated instrument.
+
+    """
+    rm = get_backend_resource_manager(SIMULATION_BACKEND)
+    rm.add_instrument('GPIB::{}::INSTR'.format(address), instrument)
+    return driver_cls({'type': 'GPIB', 'address': address,
+                       'backend': SIMULATION_BACKEND})
+
+
+def bench_round_trip(label, instr, func, reference=None, number=20):
+    """Time an operation and count the messages it exchanges.
+
+    """
+    instr.reset_counters()
+    func()
+    counts = (instr.writes, instr.reads, instr.polls)
+    time = measure(func, number=number)
+    report('{} ({}w/{}r/{}p)'.format(label, *counts), time, reference)
+    return time
+
+
+def bench_simulation(latency=1e-3):
+    """Time common operations of the GS200 and 7651 drivers.
+
+    """
+    ureg = get_unit_registry()
+    names = ['function', 'output', 'voltage_range', 'voltage']
+
+    gs200 = SimulatedGS200(latency=latency)
+    driver = simulated_driver(YokogawaGS200, gs200, 'sim1')
+
+    def get_one_by_one():
+        driver.clear_cache()
+        return [getattr(driver, n) for n in names]
+
+    def get_many():
+        driver.clear_cache()
+        return driver.get_many(names)
+
+    voltages = cycle([1*ureg.V, 2*ureg.V])
+
+    def set_voltage():
+        driver.voltage = next(voltages)
+
+    ref = bench_round_trip('GS200 get 4 iprops', gs200, get_one_by_one)
+    bench_round_trip('GS200 get_many 4 iprops', gs200, get_many, ref)
+    bench_round_trip('GS200 set voltage', gs200, set_voltage)
+
+    y7651 = Simulated7651(latency=latency)
+    driver2 = simulated_driver(Yokogawa7651, y7651, 'sim2')
+
+    def get_7651():
+        driver2.clear_cache()
+        return [getattr(driver2, n) for n in names]
+
+    def set_7651():
+        driver2.voltage = next(voltages)
+
+    bench_round_trip('7651 get 4 iprops', y7651, get_7651)
+    bench_round_trip('7651 set voltage', y7651, set_7651)
+
+
+if __name__ == '__main__':
+    bench_simulation()
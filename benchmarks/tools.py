@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Common tools used to write the benchmarks.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from collections import OrderedDict
+from timeit import default_timer
+from threading import RLock
+
+from eapii.core.has_i_props import HasIProps
+
+
+def measure(func, number=100000, repeat=3):
+    """Measure the time necessary to call a function.
+
+    Parameters
+    ----------
+    func : callable
+        Callable taking no argument to benchmark.
+    number : int, optional
+        Number of calls per measurement.
+    repeat : int, optional
+        Number of measurements, the best one is kept.
+
+    Returns
+    -------
+    time : float
+        Best time per call in seconds.
+
+    """
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        for _ in range(number):
+            func()
+        elapsed = (default_timer() - start)/number
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+
+#: Results of all the measurements reported so far (name: time per call).
+RESULTS = OrderedDict()
+
+
+def report(name, time, reference=None, calls=None):
+    """Print the result of a measurement and record it in RESULTS.
+
+    Parameters
+    ----------
+    name : unicode
+        Name of the measurement.
+    time : float
+        Time per call in seconds.
+    reference : float, optional
+        Time to which compare the measurement.
+    calls : int, optional
+        Number of calls to the driver communication methods per operation.
+
+    """
+    RESULTS[name] = time
+    line = '{:<45} {:>9.3f} us'.format(name, time*1e6)
+    if calls is not None:
+        line += '  [{} com]'.format(calls)
+    if reference:
+        line += '  (x{:.2f})'.format(reference/time)
+    print(line)
+
+
+def count_calls(driver, func):
+    """Count the calls to the communication methods performed by an operation.
+
+    Parameters
+    ----------
+    driver : BenchDriver
+        Driver (or subsystem/channel of a driver) used by the operation.
+    func : callable
+        Operation to perform.
+
+    Returns
+    -------
+    calls : int
+        Number of calls to default_get_iproperty and default_set_iproperty.
+
+    """
+    driver = getattr(driver, 'root', driver)
+    before = driver.get_calls + driver.set_calls
+    func()
+    return driver.get_calls + driver.set_calls - before
+
+
+class BenchDriver(HasIProps):
+    """Driver answering all queries without any communication.
+
+    Attributes
+    ----------
+    answers : dict
+        Answer to return for a given command.
+    get_calls : int
+        Number of calls to default_get_iproperty.
+    set_calls : int
+        Number of calls to default_set_iproperty.
+
+    """
+    def __init__(self, answers={}, caching_allowed=True,
+                 caching_permissions={}):
+        super(BenchDriver, self).__init__(caching_allowed,
+                                          caching_permissions)
+        self.lock = RLock()
+        self.answers = answers
+        self.get_calls = 0
+        self.set_calls = 0
+
+    def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+        self.get_calls += 1
+        return self.answers[cmd]
+
+    def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
+        self.set_calls += 1
+
+    def default_check_instr_operation(self, iprop, value, i_value):
+        return True, None
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Tools used to access IProperties from asyncio coroutines.
+
+The communication with the instruments is performed by blocking calls (VISA
+does not provide an asynchronous API). To avoid blocking the event loop, the
+operations are run in a worker thread. Each instrument owns a single worker
+thread shared by all its subsystems and channels so that operations are
+executed in the order in which they were requested while different
+instruments are accessed concurrently.
+
+This module requires asyncio and is hence only available on Python 3.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+#: Executors used to perform the operations of each instrument.
+_EXECUTORS = WeakKeyDictionary()
+
+#: Lock used to ensure a single executor is created per instrument.
+_EXECUTORS_LOCK = Lock()
+
+
+def get_executor(obj):
+    """Access the executor in charge of an instrument operations.
+
+    Parameters
+    ----------
+    obj : HasIProps
+        Instrument, subsystem or channel. Subsystems and channels use the
+        executor of the instrument they belong to.
+
+    Returns
+    -------
+    executor : ThreadPoolExecutor
+        Executor with a single worker thread.
+
+    """
+    obj = getattr(obj, 'root', obj)
+
+    try:
+        return _EXECUTORS[obj]
+    except KeyError:
+        with _EXECUTORS_LOCK:
+            if obj not in _EXECUTORS:
+                _EXECUTORS[obj] = ThreadPoolExecutor(max_workers=1)
+            return _EXECUTORS[obj]
+
+
+def run_async(obj, func, *args):
+    """Run a blocking operation of an instrument in its worker thread.
+
+    Parameters
+    ----------
+    obj : HasIProps
+        Object on which the operation is performed.
+    func : callable
+        Blocking function to call.
+    *args :
+        Positional arguments to pass to the function.
+
+    Returns
+    -------
+    future : asyncio.Future
+        Future bound to the current event loop which can be awaited to get
+        the result of the operation.
+
+    """
+    return asyncio.wrap_future(get_executor(obj).submit(func, *args))
+
+
+def shutdown_executor(obj, wait=True):
+    """Stop the worker thread of an instrument.
+
+    A new worker is created if an asynchronous operation is later requested.
+
+    Parameters
+    ----------
+    obj : HasIProps
+        Instrument, subsystem or channel.
+    wait : bool, optional
+        Whether to wait for the pending operations to complete.
+
+    """
+    obj = getattr(obj, 'root', obj)
+
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.pop(obj, None)
+    if executor is not None:
+        executor.shutdown(wait)
@@ -13,7 +13,8 @@ from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
 
 from .subsystem import SubSystem
-from .channel import Channel
-from .has_i_props import set_iprop_paras
+from .channel import Channel, ChannelCollection
+from .has_i_props import set_iprop_paras, depends_on, UNTIL_SET
 from .errors import InstrError, InstrIOError
+from .group import InstrumentGroup, GroupError
 from .range import IntRangeValidator, FloatRangeValidator
@@ -68,19 +68,21 @@ class BaseInstrument(with_metaclass(InstrumentSigleton, HasIProps)):
         Boolean use to determine if instrument properties can be cached
     caching_permissions : dict(str : bool), optionnal
         Dict specifying which instrument properties can be cached, override the
-        default parameters specified in the class attribute.
+        default parameters specified in the class attribute. Instead of a bool
+        the value can be a number of seconds after which the cached value
+        expires, or UNTIL_SET to keep the value only until the next set.
     auto_open : bool, optional
         Whether to automatically open the connection to the instrument when the
         driver is instantiated.
 
     Attributes
     ----------
-    secure_com_except : tuple
+    secure_com_exceptions : tuple
         Class attributes used to determine which errors to take into account
         when securing a communication.
 
     """
-    secure_com_except = (InstrIOError)
+    secure_com_exceptions = (InstrIOError,)
 
     def __init__(self, connection_info, caching_allowed=True,
                  caching_permissions={}, auto_open=True):
@@ -141,6 +143,18 @@ class BaseInstrument(with_metaclass(InstrumentSigleton, HasIProps)):
         """
         return False
 
+    @property
+    def bus_id(self):
+        """Identifier of the bus serializing the communications with the
+        instrument.
+
+        Instruments sharing the same bus id cannot communicate simultaneously.
+        None means the communications of this instrument are independent of
+        the ones of other instruments.
+
+        """
+        return None
+
     @property
     def connected(self):
         """Return whether or not commands can be sent to the instrument.
@@ -9,13 +9,30 @@
 """ Channel simplifies the writing of instrument implementing channel specific
 behaviour.
 
+Several channels can be accessed at once through a ChannelCollection.
+
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
+from numbers import Number
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+from future.utils import istext
+from pint.quantity import _Quantity
 
 from .has_i_props import AbstractChannel
+from .iprops.i_property import (IProperty, cached_value, cache_value,
+                                _is_default_hook, _MISSING)
 from .subsystem import SubSystem
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
 
 class Channel(SubSystem):
     """Channels are used to represent instrument channels identified by a id
@@ -45,32 +62,244 @@ class Channel(SubSystem):
 
     """
     def __init__(self, parent, id, **kwargs):
-        super(Channel, self).__init__(parent, **kwargs)
+        # The id is part of the routing computed by SubSystem.
         self.id = id
+        super(Channel, self).__init__(parent, **kwargs)
+
+    def _own_route(self):
+        """Channels add their id to the calls as the kwarg 'ch_id'.
+
+        """
+        return {'ch_id': self.id}
+
+AbstractChannel.register(Channel)
+
+
+class ChannelCollection(object):
+    """Channels of a driver whose IProperties are accessed at once.
+
+    Getting an IProperty on the collection returns the values of all the
+    channels, setting it sets the value of all the channels, either to the
+    same value or to the corresponding item of a sequence of values. When the
+    IProperty relies on the default get/set behaviour, the values are
+    transferred through a single call to the default_get_channels or
+    default_set_channels method of the driver, which can use the list commands
+    of the instrument. Otherwise the channels are accessed one by one.
+
+    Collections are usually created through the get_channels method of the
+    driver.
+
+    Parameters
+    ----------
+    channels : iterable of Channel
+        Channels of the collection, which should belong to the same driver.
+
+    Attributes
+    ----------
+    channels : tuple
+        Channels of the collection.
+    ids : tuple
+        Ids of the channels.
+
+    """
+    __slots__ = ('channels', 'ids')
+
+    def __init__(self, channels):
+        channels = tuple(channels)
+        if not channels:
+            raise ValueError('A channel collection cannot be empty.')
+        object.__setattr__(self, 'channels', channels)
+        object.__setattr__(self, 'ids', tuple(ch.id for ch in channels))
+
+    def __len__(self):
+        return len(self.channels)
+
+    def __iter__(self):
+        return iter(self.channels)
+
+    def __getitem__(self, index):
+        return self.channels[index]
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name in self.__slots__ or\
+                not isinstance(self._iprop(name), IProperty):
+            raise AttributeError(name)
+        return self.get(name)
 
-    @property
-    def lock(self):
-        """Access parent lock."""
-        return self.parent.lock
+    def __setattr__(self, name, value):
+        if not isinstance(self._iprop(name), IProperty):
+            raise AttributeError('Only the IProperties of a channel '
+                                 'collection can be set.')
+        self.set(name, value)
 
-    def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
-        """Channels simply pipes the call to their parent.
+    def get(self, name):
+        """Retrieve the value of an IProperty for all the channels.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty whose values should be retrieved.
+
+        Returns
+        -------
+        values : numpy.ndarray or Quantity or list
+            Values of the channels in order. Numbers are returned as an array
+            (a Quantity if they have a unit), other values as a list.
 
         """
-        kwargs['ch_id'] = self.id
-        return self.parent.default_get_iproperty(iprop, cmd, *args, **kwargs)
+        iprop = self._iprop(name)
+        channels = self.channels
+        with channels[0].lock:
+            values = [cached_value(ch, name) for ch in channels]
+            missing = [i for i, v in enumerate(values) if v is _MISSING]
+            if not missing:
+                return _pack(values)
+
+            if iprop._getter is None or not _is_default_hook(iprop, 'get')\
+                    or not self._routable(name, missing):
+                for i in missing:
+                    values[i] = getattr(channels[i], name)
+                return _pack(values)
+
+            for i in missing:
+                iprop.pre_get(channels[i])
+
+            target = channels[0]._target
+            ids = [self.ids[i] for i in missing]
+            answers = self._secured(iprop, target.default_get_channels,
+                                    iprop, iprop._getter, ids)
+
+            for i, answer in zip(missing, answers):
+                ch = channels[i]
+                value = iprop.post_get(ch, answer)
+                cache_value(ch, name, value)
+                values[i] = value
+
+            return _pack(values)
 
-    def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
-        """Channels simply pipes the call to their parent.
+    def set(self, name, values):
+        """Set the value of an IProperty for all the channels.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty to set.
+        values :
+            Sequence holding the value of each channel, or value to set on all
+            the channels. Strings and mappings are always considered as single
+            values. For IProperties whose values are themselves arrays, one
+            value per channel must be provided.
 
         """
-        kwargs['ch_id'] = self.id
-        return self.parent.default_set_iproperty(iprop, cmd, *args, **kwargs)
+        iprop = self._iprop(name)
+        channels = self.channels
+        values = _broadcast(values, len(channels))
+        with channels[0].lock:
+            same = iprop.same_value
+            todo = []
+            for i, (ch, value) in enumerate(zip(channels, values)):
+                cache = ch._cache
+                if name in cache and (same(value, cache[name]) if same else
+                                      value == cache[name]):
+                    continue
+                todo.append(i)
+            if not todo:
+                return
+
+            if iprop._setter is None or not _is_default_hook(iprop, 'set')\
+                    or not self._routable(name, todo):
+                for i in todo:
+                    setattr(channels[i], name, values[i])
+                return
+
+            i_values = []
+            for i in todo:
+                ch = channels[i]
+                i_values.append(iprop.pre_set(ch, values[i]))
+                ch.invalidate_dependents(name)
+
+            target = channels[0]._target
+            ids = [self.ids[i] for i in todo]
+            self._secured(iprop, target.default_set_channels,
+                          iprop, iprop._setter, i_values, ids)
 
-    def default_check_instr_operation(self, iprop, value, i_value):
-        """Channels simply pipes the call to their parent.
+            coerce = getattr(iprop, 'coerce', False)
+            copy = iprop.cached_copy
+            for i, i_value in zip(todo, i_values):
+                ch = channels[i]
+                iprop.post_set(ch, values[i], i_value)
+                if not coerce:
+                    cache_value(ch, name,
+                                copy(values[i]) if copy else values[i])
+            if channels[0]._until_set_owners:
+                channels[0].clear_until_set_caches()
+
+    def _iprop(self, name):
+        """Get the object declared under name on the class of the channels.
 
         """
-        return self.parent.default_check_instr_operation(iprop, value, i_value)
+        return getattr(type(self.channels[0]), name, None)
 
-AbstractChannel.register(Channel)
+    def _routable(self, name, indexes):
+        """Check that the channels can be accessed through the bulk hooks.
+
+        The channels must have the same target, not be nested in another
+        channel and the IProperty must not be patched.
+
+        """
+        target = self.channels[0]._target
+        for i in indexes:
+            ch = self.channels[i]
+            if (ch._target is not target or ch._route != {'ch_id': ch.id} or
+                    name in ch._proxies):
+                return False
+        return True
+
+    def _secured(self, iprop, call, *args):
+        """Perform a call, retrying after re-opening the connection according
+        to the secure_comm value of the IProperty.
+
+        """
+        driver = self.channels[0]
+        i = 0
+        while True:
+            try:
+                return call(*args)
+            except driver.secure_com_exceptions:
+                if i == iprop._secur:
+                    raise
+                i += 1
+                driver.reopen_connection()
+
+
+def _broadcast(values, count):
+    """Build the list of the values to set on count channels.
+
+    """
+    if istext(values) or isinstance(values, Mapping):
+        return [values]*count
+    try:
+        values = list(values)
+    except TypeError:
+        return [values]*count
+    if len(values) != count:
+        mess = '{} values provided for {} channels.'
+        raise ValueError(mess.format(len(values), count))
+    return values
+
+
+def _pack(values):
+    """Gather the values retrieved from channels into an array if possible.
+
+    """
+    if np is None:
+        return values
+    if all(isinstance(v, _Quantity) for v in values):
+        units = values[0].units
+        if all(v.units == units for v in values):
+            return units._REGISTRY.Quantity(np.array([v.magnitude
+                                                      for v in values]),
+                                            units)
+    elif all(isinstance(v, Number) for v in values):
+        return np.array(values)
+    return values
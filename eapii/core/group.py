@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""InstrumentGroup allows to access several instruments concurrently.
+
+The instruments are sorted according to the bus they are connected to (see
+BaseInstrument.bus_id). Instruments sharing a bus are accessed one after the
+other, as the bus would serialize the communications anyway, while the
+different buses are handled in parallel by a bounded pool of threads.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
+from .errors import InstrError
+
+
+class GroupError(InstrError):
+    """Error raised when some operations of an InstrumentGroup failed.
+
+    Attributes
+    ----------
+    errors : OrderedDict
+        Exceptions raised by the operations, indexed by the position of the
+        instrument in the group.
+    results : list
+        Results of the operations, None for the failed ones.
+
+    """
+    def __init__(self, errors, results):
+        mess = '{} operation(s) failed :\n'.format(len(errors))
+        mess += '\n'.join('- instrument {}: {!r}'.format(i, e)
+                          for i, e in errors.items())
+        super(GroupError, self).__init__(mess)
+        self.errors = errors
+        self.results = results
+
+
+class InstrumentGroup(object):
+    """Collection of instruments on which the same operations can be
+    performed concurrently.
+
+    The results are always returned in the order of the instruments. If some
+    operations fail, the remaining ones are still performed and a GroupError
+    aggregating all the errors is raised.
+
+    Parameters
+    ----------
+    instruments : iterable of BaseInstrument
+        Instruments of the group, at least one is required.
+    max_workers : int, optional
+        Maximal number of threads used to communicate. Defaults to the number
+        of buses used by the instruments.
+
+    """
+    def __init__(self, instruments, max_workers=None):
+        self.instruments = list(instruments)
+        if not self.instruments:
+            raise ValueError('An instrument group cannot be empty.')
+
+        buses = OrderedDict()
+        for i, instr in enumerate(self.instruments):
+            bus = getattr(instr, 'bus_id', None)
+            key = ('bus', bus) if bus is not None else ('instr', i)
+            buses.setdefault(key, []).append(i)
+        self._buses = list(buses.values())
+
+        self.max_workers = max_workers or len(self._buses)
+        self._pool = None
+        self._pool_lock = Lock()
+
+    def __len__(self):
+        return len(self.instruments)
+
+    def __iter__(self):
+        return iter(self.instruments)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stop the worker threads.
+
+        A new pool of workers is created if the group is used again.
+
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def call(self, func, *args):
+        """Call a function on each instrument while holding its lock.
+
+        Parameters
+        ----------
+        func : callable
+            Function taking as first argument the instrument.
+        *args :
+            Sequences of the additional arguments to pass to the function,
+            each sequence holding one value per instrument.
+
+        Returns
+        -------
+        results : list
+            Values returned by the function in the order of the instruments.
+
+        Raises
+        ------
+        GroupError :
+            If any of the call failed.
+
+        """
+        n = len(self.instruments)
+        args = [list(a) for a in args]
+        if any(len(a) != n for a in args):
+            mess = 'Expected one argument per instrument ({}).'.format(n)
+            raise ValueError(mess)
+
+        def run(indexes):
+            outcomes = []
+            for i in indexes:
+                instr = self.instruments[i]
+                try:
+                    with instr.lock:
+                        res = func(instr, *[a[i] for a in args])
+                    outcomes.append((i, res, None))
+                except Exception as e:
+                    outcomes.append((i, None, e))
+            return outcomes
+
+        if len(self._buses) == 1:
+            outcomes = [run(self._buses[0])]
+        else:
+            outcomes = self._get_pool().map(run, self._buses, chunksize=1)
+
+        results = [None]*n
+        errors = {}
+        for i, res, err in (o for bus in outcomes for o in bus):
+            results[i] = res
+            if err is not None:
+                errors[i] = err
+
+        if errors:
+            raise GroupError(OrderedDict(sorted(errors.items())), results)
+
+        return results
+
+    def get(self, name):
+        """Retrieve the value of an IProperty on all the instruments.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty.
+
+        Returns
+        -------
+        values : list
+            Values in the order of the instruments.
+
+        """
+        return self.call(getattr, [name]*len(self.instruments))
+
+    def set(self, name, values):
+        """Set the value of an IProperty on all the instruments.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty.
+        values : sequence
+            Values to set, one per instrument in the order of the instruments.
+
+        """
+        self.call(setattr, [name]*len(self.instruments), values)
+
+    def set_all(self, name, value):
+        """Set the same value of an IProperty on all the instruments.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty.
+        value :
+            Value to set on every instrument.
+
+        """
+        self.set(name, [value]*len(self.instruments))
+
+    def get_many(self, names, max_age=None):
+        """Retrieve the values of multiple IProperties on all the instruments.
+
+        See HasIProps.get_many for details.
+
+        Returns
+        -------
+        values : list(OrderedDict)
+            Values in the order of the instruments.
+
+        """
+        return self.call(lambda instr: instr.get_many(names, max_age))
+
+    def set_many(self, values):
+        """Set the values of multiple IProperties on all the instruments.
+
+        Parameters
+        ----------
+        values : sequence
+            Values to pass to HasIProps.set_many for each instrument.
+
+        """
+        self.call(lambda instr, v: instr.set_many(v), values)
+
+    def _get_pool(self):
+        """Access the pool of workers, creating it if necessary.
+
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPool(min(self.max_workers,
+                                            len(self._buses)))
+            return self._pool
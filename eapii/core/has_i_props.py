@@ -17,13 +17,18 @@ from __future__ import (division, unicode_literals, print_function,
 from future.utils import with_metaclass, bind_method
 from types import FunctionType, MethodType
 from functools import update_wrapper
-from inspect import cleandoc, getsourcelines
+from inspect import cleandoc
 from textwrap import fill
 from abc import ABCMeta
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
 
-from .iprops.i_property import IProperty
+from .iprops.i_property import IProperty, _is_default_hook, cache_value
 from .iprops.proxies import make_proxy
+from .util import monotonic
 
 # Prefixes for IProperty specially named methods.
 PRE_GET_PREFIX = '_pre_get_'
@@ -40,6 +45,10 @@ CUSTOMIZABLE = ((PRE_GET_PREFIX, 'pre_get'), (GET_PREFIX, 'get'),
 
 RANGE_PREFIX = '_range_'
 
+#: Caching policy used to keep a value in cache only until the next time an
+#: IProperty of the instrument is set.
+UNTIL_SET = 'until_set'
+
 
 def wrap_custom_iprop_methods(cls, meth_name, iprop):
     """ Wrap a HasIProp method to make it an instance method of a IProperty.
@@ -104,6 +113,85 @@ def channel_getter_factory(cls, name, ch_cls):
         bind_method(cls, f_name, channel_getter)
 
 
+def depends_on(*names):
+    """Decorator declaring the IProperties a range depends on.
+
+    When one of those IProperties is set the cached range is discarded. If a
+    range does not declare its dependencies it is assumed to depend only on
+    the IProperty with the same name (if it exists).
+
+    Parameters
+    ----------
+    *names : unicode
+        Names of the IProperties on which the range depends.
+
+    """
+    def decorator(func):
+        func.depends_on = names
+        return func
+
+    return decorator
+
+
+def build_dependents(cls, iprops, ranges):
+    """Build the map of the IProperties and ranges to invalidate when an
+    IProperty is set.
+
+    Parameters
+    ----------
+    cls : type
+        Class for which to build the dependency graph.
+    iprops : dict
+        All the IProperties of the class.
+    ranges : iterable
+        Names of all the ranges of the class.
+
+    Returns
+    -------
+    dependents : dict
+        Mapping between IProperty names and a tuple holding the names of the
+        IProperties and the names of the ranges depending (even indirectly) on
+        it. Only the IProperties having dependents are present.
+
+    """
+    mess = cleandoc('''{} has no IProperty {} on which {} can
+                    depend''')
+    direct = defaultdict(set)
+    for name, iprop in iprops.items():
+        for dep in iprop.depends_on:
+            if dep not in iprops:
+                raise AttributeError(mess.format(cls, dep, name))
+            direct[dep].add(name)
+
+    direct_ranges = defaultdict(set)
+    for r in ranges:
+        meth = getattr(cls, RANGE_PREFIX + r)
+        deps = getattr(meth, 'depends_on', (r,) if r in iprops else ())
+        for dep in deps:
+            if dep not in iprops:
+                raise AttributeError(mess.format(cls, dep, 'range ' + r))
+            direct_ranges[dep].add(r)
+
+    dependents = {}
+    for name in iprops:
+        found = set()
+        stack = [name]
+        while stack:
+            for dep in direct[stack.pop()]:
+                if dep not in found and dep != name:
+                    found.add(dep)
+                    stack.append(dep)
+
+        found_ranges = set(direct_ranges[name])
+        for dep in found:
+            found_ranges |= direct_ranges[dep]
+
+        if found or found_ranges:
+            dependents[name] = (tuple(found), tuple(found_ranges))
+
+    return dependents
+
+
 class set_iprop_paras(object):
     """Placeholder use to alter an iprop in a subclass.
 
@@ -136,6 +224,11 @@ class set_iprop_paras(object):
                     setattr(new, k, MethodType(v.__func__, new))
                 else:
                     setattr(new, k, v)
+
+        # Keep the docstring of the original IProperty.
+        ndict.pop('_doc_source', None)
+        ndict.update({k: v for k, v in iprop.__dict__.items()
+                      if k in ('_doc', '_doc_source')})
         return new
 
 
@@ -186,7 +279,7 @@ class HasIPropsMeta(type):
                                         # behaviour.
         ranges = []                     # Names of the defined ranges.
 
-        for key, value in dct.iteritems():
+        for key, value in dct.items():
             if isinstance(value, IProperty):
                 iprops[key] = value
                 value.name = key
@@ -220,19 +313,12 @@ class HasIPropsMeta(type):
         # Create the class object.
         cls = super(HasIPropsMeta, meta).__new__(meta, name, bases, dct)
 
-        # Analyse the source code to find the doc for the defined IProperties.
+        # The doc of the defined IProperties is extracted from the source
+        # code only when first accessed as reading the source is costly.
         if iprops:
-            lines, _ = getsourcelines(cls)
-            doc = ''
-            for line in lines:
-                l = line.strip()
-                if l.startswith('#:'):
-                    doc += ' ' + l[2:].strip()
-                elif ' = ' in l:
-                    name = l.split(' = ', 1)[0]
-                    if name in iprops:
-                        iprops[name].__doc__ = fill(doc.strip(), 79)
-                        doc = ''
+            doc_source = (cls, frozenset(iprops))
+            for iprop in iprops.values():
+                iprop._doc_source = doc_source
 
         # Walk the mro of the class, excluding itself, in reverse order
         # collecting all of the iprops into a single dict. The reverse
@@ -255,7 +341,10 @@ class HasIPropsMeta(type):
         # declared.
         for k, v in iprop_paras.items():
             ip = v.customize(all_iprops[k])
+            ip.name = k
             owned_iprops.add(k)
+            all_iprops[k] = ip
+            iprops[k] = ip
             setattr(cls, k, ip)
 
         # Add the special statically defined behaviours for the iprops.
@@ -267,7 +356,7 @@ class HasIPropsMeta(type):
                 ip = ip.clone()
                 all_iprops[ip.name] = ip
                 iprops[ip.name] = ip
-                owned_iprops.add(ip)
+                owned_iprops.add(ip.name)
                 setattr(cls, ip.name, ip)
             return ip
 
@@ -287,6 +376,11 @@ class HasIPropsMeta(type):
         for prefix, attr in CUSTOMIZABLE:
             customize_iprops(cls, cust_iprops[attr], prefix, attr)
 
+        # Now that all the hooks are known build the specialised accessors of
+        # the iprops living on this class.
+        for iprop in iprops.values():
+            iprop.compile_accessors()
+
         for ss in subsystems.values():
             if not ss.secure_com_exceptions:
                 ss.secure_com_exceptions = cls.secure_com_exceptions
@@ -306,6 +400,12 @@ class HasIPropsMeta(type):
         # Keep a ref to names of the declared ranges accessors.
         cls.__ranges__ = set([r[7:] for r in ranges])
 
+        # Build the map of the cache entries to discard when setting an iprop.
+        all_ranges = set(cls.__ranges__)
+        for base in cls.__mro__[1:]:
+            all_ranges |= getattr(base, '__ranges__', set())
+        cls.__dependents__ = build_dependents(cls, all_iprops, all_ranges)
+
         # Create channel initialisation methods.
         cls.__channels__ = set(channels)
         for ch, ch_cls in channels.items():
@@ -318,7 +418,10 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
     """ Base class for objects using the IProperties mechanisms.
 
     """
-    #: Tuple of iproperties names which shoulb be cached by default.
+    #: Iproperties names which should be cached by default. If a dict is
+    #: used, the values specify the caching policy : True to cache until the
+    #: cache is cleared, a number of seconds after which the value expires or
+    #: UNTIL_SET to cache until any IProperty of the instrument is set.
     caching_permissions = ()
 
     #: Tuple of exception to consider when securing a communication (either via
@@ -329,19 +432,41 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
     def __init__(self, caching_allowed=True, caching_permissions={}):
 
         self._cache = {}
+        self._timed_cache = {}
+        self._cache_stamps = {}
         self._range_cache = {}
         self._proxies = {}
 
+        # Objects having iproperties cached until the next set are shared by
+        # all the objects of an instrument (a subsystem or channel set its
+        # parent before calling this method).
+        parent = getattr(self, 'parent', None)
+        if parent is not None:
+            self._until_set_owners = parent._until_set_owners
+        else:
+            self._until_set_owners = []
+
         subsystems = self.__subsystems__
         channels = self.__channels__
 
         if caching_allowed:
             # Avoid overriding class attribute
-            perms = {p: True for p in self.caching_permissions}
+            perms = self.caching_permissions
+            if isinstance(perms, Mapping):
+                perms = dict(perms)
+            else:
+                perms = {p: True for p in perms}
             perms.update(caching_permissions)
+
+            self._cache_ttls = {k: v for k, v in perms.items()
+                                if isinstance(v, (int, float))
+                                and not isinstance(v, bool)}
+            self._until_set = set([k for k, v in perms.items()
+                                   if v == UNTIL_SET])
             self._caching_permissions = set([key for key in perms
                                              if isinstance(perms[key], bool)
                                              and perms[key]])
+            self._caching_permissions |= self._until_set
 
             ss_cache_allowed = {ss: bool(perms.get(ss)) for ss in subsystems}
 
@@ -356,12 +481,17 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
 
         else:
             self._caching_permissions = set()
+            self._cache_ttls = {}
+            self._until_set = set()
             ss_cache_allowed = {ss: False for ss in subsystems}
             ss_caching = {}
 
             self._ch_cache_allowed = {ch: False for ch in channels}
             self._ch_caching = {}
 
+        if self._until_set:
+            self._until_set_owners.append(self)
+
         for ss, cls in subsystems.items():
             subsystem = cls(self, caching_allowed=ss_cache_allowed[ss],
                             caching_permissions=ss_caching.get(ss, {}))
@@ -386,6 +516,200 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
         """
         return getattr(self.__class__, name)
 
+    def get_many(self, names, max_age=None):
+        """Retrieve the values of multiple IProperties at once.
+
+        The cached values are used when available, the IProperties relying on
+        the default get behaviour are then retrieved all at once through the
+        default_get_iproperties method of the driver, allowing it to query all
+        of them in a single transaction. The remaining IProperties are
+        retrieved one by one. The whole operation is performed while holding
+        the lock.
+
+        Parameters
+        ----------
+        names : iterable of unicode
+            Names of the IProperties whose value should be retrieved.
+        max_age : float, optional
+            Maximum age in seconds of the cached values which can be used.
+            Older values are retrieved anew from the instrument.
+
+        Returns
+        -------
+        values : OrderedDict
+            Values of the IProperties in the order of the provided names.
+
+        """
+        with self.lock:
+            cls = type(self)
+            cache = self._cache
+            timed = self._timed_cache
+            names = list(names)
+            stale = self._stale_names(names, max_age) if max_age is not None\
+                else ()
+            now = monotonic()
+            values = OrderedDict()
+            batch = []
+            for name in names:
+                if name in values:
+                    continue
+                if name not in stale:
+                    if name in cache:
+                        values[name] = cache[name]
+                        continue
+                    if name in timed and now < timed[name][1]:
+                        values[name] = timed[name][0]
+                        continue
+                iprop = getattr(cls, name)
+                if (iprop._getter is not None and name not in self._proxies
+                        and _is_default_hook(iprop, 'get')):
+                    values[name] = None
+                    batch.append(iprop)
+                else:
+                    if name in stale:
+                        # The accessor would otherwise return the old value.
+                        cache.pop(name, None)
+                        timed.pop(name, None)
+                    values[name] = getattr(self, name)
+
+            if batch:
+                # Retrieve at once the values used by the checks which will be
+                # cached and hence available when running the checks.
+                refs = self._check_refs_to_prefetch(batch)
+                if refs:
+                    prefetched = self.get_many(refs)
+                    for iprop in batch[:]:
+                        if iprop.name in prefetched:
+                            values[iprop.name] = prefetched[iprop.name]
+                            batch.remove(iprop)
+
+            if batch:
+                for iprop in batch:
+                    iprop.pre_get(self)
+
+                cmds = [iprop._getter for iprop in batch]
+                secur = max(iprop._secur for iprop in batch)
+                i = 0
+                while True:
+                    try:
+                        answers = self.default_get_iproperties(batch, cmds)
+                        break
+                    except self.secure_com_exceptions:
+                        if i == secur:
+                            raise
+                        i += 1
+                        self.reopen_connection()
+
+                for iprop, answer in zip(batch, answers):
+                    name = iprop.name
+                    value = iprop.post_get(self, answer)
+                    cache_value(self, name, value)
+                    values[name] = value
+
+            return values
+
+    def _check_refs_to_prefetch(self, iprops):
+        """List the IProperties referenced by the checks of iprops which
+        are not cached yet but will be once retrieved.
+
+        Dotted references live on other objects and are hence ignored.
+
+        """
+        cls = type(self)
+        refs = []
+        for iprop in iprops:
+            for ref in iprop.get_check_refs:
+                if (ref not in refs and '.' not in ref
+                        and ref not in self._cache
+                        and ref not in self._timed_cache
+                        and (ref in self._caching_permissions
+                             or ref in self._cache_ttls)
+                        and isinstance(getattr(cls, ref, None), IProperty)):
+                    refs.append(ref)
+        return refs
+
+    def set_many(self, values):
+        """Set the values of multiple IProperties while holding the lock.
+
+        The IProperties are set one after the other in the specified order, as
+        setting one IProperty can change the validity of the next ones (for
+        example when changing the operation mode of a source).
+
+        Parameters
+        ----------
+        values : Mapping or iterable of pairs
+            Names of the IProperties and values to set. When the order matters
+            an OrderedDict or an iterable of pairs should be used.
+
+        """
+        if isinstance(values, Mapping):
+            values = values.items()
+
+        with self.lock:
+            for name, value in values:
+                setattr(self, name, value)
+
+    def aget(self, name):
+        """Retrieve the value of an IProperty without blocking the event loop.
+
+        The IProperty is accessed as usual (hooks, checks, caching) in the
+        worker thread of the instrument, which ensures that the operations
+        on an instrument are performed in the order they were requested.
+        Requires Python 3.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty whose value should be retrieved.
+
+        Returns
+        -------
+        future : asyncio.Future
+            Future to await to get the value.
+
+        """
+        from .aio import run_async
+        return run_async(self, getattr, self, name)
+
+    def aset(self, name, value):
+        """Set the value of an IProperty without blocking the event loop.
+
+        See aget for details.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty to set.
+        value :
+            Value to set.
+
+        Returns
+        -------
+        future : asyncio.Future
+            Future to await to know when the operation is complete.
+
+        """
+        from .aio import run_async
+        return run_async(self, setattr, self, name, value)
+
+    def aget_many(self, names, max_age=None):
+        """Asynchronous version of get_many.
+
+        See aget and get_many for details.
+
+        """
+        from .aio import run_async
+        return run_async(self, self.get_many, names, max_age)
+
+    def aset_many(self, values):
+        """Asynchronous version of set_many.
+
+        See aget and set_many for details.
+
+        """
+        from .aio import run_async
+        return run_async(self, self.set_many, values)
+
     @property
     def declared_ranges(self):
         """Set of declared ranges for the class.
@@ -451,17 +775,11 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
             Attributes of the IProperty to override in the proxy.
 
         """
-        if not hasattr(self, '_proxied'):
-            self._proxied = []
-
-        i_p = getattr(type(self), iprop)
-        if self not in i_p._proxies:
-            make_proxy(i_p, self, kwargs)
-            self._proxied.append(i_p)
+        if iprop not in self._proxies:
+            make_proxy(getattr(type(self), iprop), self, kwargs)
 
         else:
-            proxy = i_p._proxies[self]
-            proxy.patch(kwargs)
+            self._proxies[iprop].patch(kwargs)
 
     def unpatch_iprop(self, iprop, *args):
         """Restore the behaviour of an IProperty to its default.
@@ -483,19 +801,16 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
             If no proxy exists for the given IProp.
 
         """
-        i_p = getattr(type(self), iprop)
-        if self not in i_p._proxies:
+        if iprop not in self._proxies:
             raise KeyError('No proxy found for {}'.format(iprop))
 
         if not args:
-            del i_p._proxies[self]
-            self._proxied.remove(i_p)
+            del self._proxies[iprop]
         else:
-            proxy = i_p._proxies[self]
+            proxy = self._proxies[iprop]
             proxy.unpatch(args)
             if proxy.obsolete:
-                del i_p._proxies[self]
-                self._proxied.remove(i_p)
+                del self._proxies[iprop]
 
     def unpatch_all(self):
         """Restore all IProperties behaviour to their default one.
@@ -503,10 +818,7 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
         The class overidden behaviour are of course preserved.
 
         """
-        for iprop in self._proxied:
-            del iprop._proxies[self]
-
-        self._proxied = []
+        self._proxies.clear()
 
     def clear_cache(self, subsystems=True, channels=True, properties=None):
         """ Clear the cache of all the properties or only of the specified
@@ -538,8 +850,9 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
                         sss[aux].append(n)
                     else:
                         chs[aux].append(n)
-                elif name in cache:
-                    del cache[name]
+                else:
+                    cache.pop(name, None)
+                    self._timed_cache.pop(name, None)
 
             for ss in sss:
                 getattr(self, ss).clear_cache(properties=sss[ss])
@@ -550,6 +863,7 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
                         o.clear_cache(properties=chs[ch])
         else:
             self._cache = {}
+            self._timed_cache = {}
             if subsystems:
                 for ss in self.__subsystems__:
                     getattr(self, ss).clear_cache(channels=channels)
@@ -593,8 +907,10 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
                         sss[aux].append(n)
                     else:
                         chs[aux].append(n)
-                elif name in self._cache:
-                    cache[name] = self._cache[name]
+                else:
+                    cached = self._valid_cache()
+                    if name in cached:
+                        cache[name] = cached[name]
 
             for ss in sss:
                 cache[ss] = getattr(self, ss).check_cache(properties=sss[ss])
@@ -606,20 +922,74 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
                     for ch_id, o in self._channel_cache.get(ch, {}).items():
                         ch_cache[ch_id] = o.check_cache(properties=chs[ch])
         else:
-            cache = self._cache.copy()
+            cache = self._valid_cache()
             if subsystems:
                 for ss in self.__subsystems__:
-                    cache[ss] = getattr(self, ss)._cache.copy()
+                    cache[ss] = getattr(self, ss)._valid_cache()
 
             if channels:
                 for chs, ch_dict in self._channel_cache.items():
                     ch_cache = {}
                     cache[chs] = ch_cache
                     for ch in ch_dict:
-                        ch_cache[ch] = ch_dict[ch]._cache.copy()
+                        ch_cache[ch] = ch_dict[ch]._valid_cache()
+
+        return cache
 
+    def invalidate_dependents(self, name):
+        """Discard the cached values and ranges depending on an IProperty.
+
+        This is called each time an IProperty is set.
+
+        Parameters
+        ----------
+        name : unicode
+            Name of the IProperty whose dependents should be discarded.
+
+        """
+        if name in self.__dependents__:
+            iprops, ranges = self.__dependents__[name]
+            cache = self._cache
+            timed = self._timed_cache
+            for dep in iprops:
+                cache.pop(dep, None)
+                timed.pop(dep, None)
+            range_cache = self._range_cache
+            for r in ranges:
+                range_cache.pop(r, None)
+
+    def clear_until_set_caches(self):
+        """Clear the cached values of the IProperties which should be cached
+        only until the next set on the instrument.
+
+        This is called each time an IProperty is set and affects all the
+        objects (subsystems, channels) of the instrument.
+
+        """
+        for owner in self._until_set_owners:
+            cache = owner._cache
+            for name in owner._until_set:
+                cache.pop(name, None)
+
+    def _valid_cache(self):
+        """Build a dict containing the cached values which did not expire.
+
+        """
+        cache = self._cache.copy()
+        now = monotonic()
+        cache.update({k: v[0] for k, v in self._timed_cache.items()
+                      if now < v[1]})
         return cache
 
+    def _stale_names(self, names, max_age):
+        """Select among names the IProperties whose cached value is older
+        than max_age seconds.
+
+        """
+        limit = monotonic() - max_age
+        stamps = self._cache_stamps
+        return set(n for n in names if stamps.get(n, limit) <= limit)
+
     def reopen_connection(self):
         """Reopen the connection to the instrument.
 
@@ -655,6 +1025,36 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
             classes subclassing HasIProps.'''), 80)
         raise NotImplementedError(mess)
 
+    def default_get_iproperties(self, iprops, cmds, *args, **kwargs):
+        """Method used by get_many to retrieve the values of multiple
+        IProperties from an instrument.
+
+        By default the values are retrieved one by one using
+        default_get_iproperty, drivers able to retrieve multiple values in a
+        single transaction should override it.
+
+        Parameters
+        ----------
+        iprops : list(IProperty)
+            References to the properties whose value should be retrieved.
+        cmds : list
+            Commands used by the implementation to determine what should be
+            done to get the answer from the instrument for each IProperty.
+        *args :
+            Additional arguments necessary to retrieve the instrument state.
+        **kwargs :
+            Additional keywords arguments necessary to retrieve the instrument
+            state.
+
+        Returns
+        -------
+        answers : list
+            Answers of the instrument in the same order as the IProperties.
+
+        """
+        return [self.default_get_iproperty(iprop, cmd, *args, **kwargs)
+                for iprop, cmd in zip(iprops, cmds)]
+
     def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
         """Method used by default by the IProperty to set an instrument value.
 
@@ -677,6 +1077,126 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
             classes subclassing HasIProps.'''), 80)
         raise NotImplementedError(mess)
 
+    def default_get_array(self, iprop, cmd, *args, **kwargs):
+        """Method used by the Array IProperties to retrieve an array from an
+        instrument.
+
+        Parameters
+        ----------
+        iprop : Array
+            Reference to the property issuing this call. Its dtype attribute
+            gives the type of the transferred values.
+        cmd :
+            Command used by the implementation to determine what should be done
+            to get the answer from the instrument.
+        *args :
+            Additional arguments necessary to retrieve the instrument state.
+        **kwargs :
+            Additional keywords arguments necessary to retrieve the instrument
+            state.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            Array of values of type iprop.dtype.
+
+        """
+        mess = fill(cleandoc('''Method used by the Array IProperties to
+            retrieve an array from an instrument. Should be implemented by
+            classes subclassing HasIProps.'''), 80)
+        raise NotImplementedError(mess)
+
+    def default_set_array(self, iprop, cmd, values, *args, **kwargs):
+        """Method used by the Array IProperties to send an array to an
+        instrument.
+
+        Parameters
+        ----------
+        iprop : Array
+            Reference to the property issuing this call.
+        cmd :
+            Command used by the implementation to determine what should be done
+            to set the instrument state.
+        values : numpy.ndarray
+            Array of values of type iprop.dtype.
+        *args :
+            Additional arguments necessary to set the instrument state.
+        **kwargs :
+            Additional keywords arguments necessary to set the instrument
+            state.
+
+        """
+        mess = fill(cleandoc('''Method used by the Array IProperties to
+            send an array to an instrument. Should be implemented by
+            classes subclassing HasIProps.'''), 80)
+        raise NotImplementedError(mess)
+
+    def default_get_channels(self, iprop, cmd, ch_ids, *args, **kwargs):
+        """Method used by channel collections to retrieve the value of an
+        IProperty for multiple channels.
+
+        By default the values are retrieved one by one using
+        default_get_iproperty (the id of each channel being passed as the
+        kwarg 'ch_id'), drivers whose instrument supports list commands should
+        override it.
+
+        Parameters
+        ----------
+        iprop : IProperty
+            Reference to the property whose values should be retrieved.
+        cmd :
+            Command used by the implementation to determine what should be done
+            to get the answer from the instrument.
+        ch_ids : list
+            Ids of the channels whose value should be retrieved.
+        *args :
+            Additional arguments necessary to retrieve the instrument state.
+        **kwargs :
+            Additional keywords arguments necessary to retrieve the instrument
+            state.
+
+        Returns
+        -------
+        answers : list
+            Answers of the instrument in the same order as the channel ids.
+
+        """
+        return [self.default_get_iproperty(iprop, cmd, *args, ch_id=ch_id,
+                                           **kwargs)
+                for ch_id in ch_ids]
+
+    def default_set_channels(self, iprop, cmd, values, ch_ids, *args,
+                             **kwargs):
+        """Method used by channel collections to set the value of an
+        IProperty for multiple channels.
+
+        By default the values are set one by one using default_set_iproperty
+        (the id of each channel being passed as the kwarg 'ch_id'), drivers
+        whose instrument supports list commands should override it.
+
+        Parameters
+        ----------
+        iprop : IProperty
+            Reference to the property whose values should be set.
+        cmd :
+            Command used by the implementation to determine what should be done
+            to set the instrument state.
+        values : list
+            Values computed by the pre_set method of the IProperty for each
+            channel.
+        ch_ids : list
+            Ids of the channels in the same order as the values.
+        *args :
+            Additional arguments necessary to set the instrument state.
+        **kwargs :
+            Additional keywords arguments necessary to set the instrument
+            state.
+
+        """
+        for ch_id, value in zip(ch_ids, values):
+            self.default_set_iproperty(iprop, cmd, value, *args, ch_id=ch_id,
+                                       **kwargs)
+
     def default_check_instr_operation(self, iprop, value, i_value):
         """Method used by default by the IProperty to check the instrument
         operation.
@@ -704,6 +1224,39 @@ class HasIProps(with_metaclass(HasIPropsMeta, object)):
             classes subclassing HasIProps.'''), 80)
         raise NotImplementedError(mess)
 
+    def get_channels(self, ids=None, name=None):
+        """Access multiple channels at once.
+
+        Parameters
+        ----------
+        ids : iterable, optional
+            Ids of the channels. By default all the channels returned by the
+            list_{channel name}s method of the driver are used.
+        name : unicode, optional
+            Name of the channel. Can be omitted if only one kind of channel is
+            declared.
+
+        Returns
+        -------
+        collection : ChannelCollection
+            Collection whose IProperties give access to the values of all
+            the channels.
+
+        """
+        from .channel import ChannelCollection
+        if name is None:
+            if len(self.__channels__) != 1:
+                mess = 'The name of the channel must be specified among {}.'
+                raise ValueError(mess.format(sorted(self.__channels__)))
+            name = next(iter(self.__channels__))
+        elif name not in self.__channels__:
+            raise ValueError('No channel named {}.'.format(name))
+
+        if ids is None:
+            ids = getattr(self, 'list_' + name + 's')()
+        getter = getattr(self, 'get_' + name)
+        return ChannelCollection(getter(ch_id) for ch_id in ids)
+
     def _generic_get_channel(self, name, ch_cls, ch_id):
         """ Generic implementation of the channel getter.
 
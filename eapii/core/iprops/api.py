@@ -15,4 +15,5 @@ from __future__ import (division, unicode_literals, print_function,
 from .i_property import IProperty
 from .mappings import Mapping, Bool
 from .scalars import Unicode, Int, Float
-from .register import Register
+from .register import Register, BitField
+from .arrays import Array
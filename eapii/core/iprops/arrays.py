@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+""" Property for arrays of numbers such as waveforms or traces.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from copy import copy
+from inspect import cleandoc
+from future.utils import istext
+from pint.quantity import _Quantity
+
+from .i_property import IProperty
+from ..range import AbstractRangeValidator
+from ..unit import get_unit_registry, convert, to_quantity
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class Array(IProperty):
+    """ Property transferring arrays of numbers as NumPy arrays.
+
+    The values are not transferred as text but as binary data : the driver
+    default_get_array and default_set_array methods are used instead of
+    default_get_iproperty and default_set_iproperty. NumPy is required.
+
+    Parameters
+    ----------
+    getter : optional
+        Object used to access the instrument property value through the use
+        of the driver. If absent the IProperty will be considered write only.
+        This is typically a string. If the default get behaviour is overwritten
+        True should be passed to mark the property as readable.
+    setter : optional
+        Object used to set the instrument property value through the use
+        of the driver. If absent the IProperty will be considered read-only.
+        For message based instruments this is the header of the message, the
+        data being appended to it.
+    secure_comm : int, optional
+        Whether or not a failed communication should result in a new attempt
+        to communicate after re-opening the communication. The value is used to
+        determine how many times to retry.
+    dtype : unicode, optional
+        NumPy type of the values as transferred (default 'f4' ie 32 bits
+        floats).
+    is_big_endian : bool, optional
+        Byte order of the transferred values.
+    unit : unicode, optional
+        Unit of the values (once scaled). If specified the arrays are returned
+        as Quantities, unless quantity is False.
+    scale : float, optional
+        Factor by which to multiply the transferred values to get the actual
+        values (for example to convert the output of an ADC to volts).
+    offset : float, optional
+        Offset to add to the transferred values after scaling them.
+    range : RangeValidator or str, optional
+        Range in which all the values must be when setting, validated at once
+        using validate_array. If a string is provided it is used to retrieve
+        the range from the driver at runtime.
+    quantity : bool, optional
+        Whether to return Quantities when a unit is declared.
+
+    Attributes
+    ----------
+    dtype : numpy.dtype
+        Type (including the byte order) of the transferred values.
+
+    """
+    def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
+                 dtype='f4', is_big_endian=False, unit=None, scale=None,
+                 offset=0.0, range=None, quantity=True, depends_on=()):
+        if np is None:
+            raise ImportError('The Array IProperty requires NumPy.')
+        super(Array, self).__init__(getter, setter, secure_comm, checks,
+                                    depends_on=depends_on)
+        self.dtype = np.dtype(dtype).newbyteorder('>' if is_big_endian
+                                                  else '<')
+        self.unit = get_unit_registry().parse_expression(unit) if unit\
+            else None
+        self.scale = scale
+        self.offset = offset
+        self.quantity = quantity
+
+        self.range = None
+        self.range_id = None
+        if isinstance(range, AbstractRangeValidator):
+            self.range = range
+        elif istext(range):
+            self.range_id = range
+        elif range is not None:
+            mess = cleandoc('''The range kwarg should either be a range
+                validator or a string used to retrieve the range through
+                get_range''')
+            raise TypeError(mess)
+
+        if setter is not None:
+            self._wrap_with_checker(self.to_instrument, 'pre_set')
+
+        self.creation_kwargs.update({'dtype': dtype,
+                                     'is_big_endian': is_big_endian,
+                                     'unit': unit, 'scale': scale,
+                                     'offset': offset, 'range': range,
+                                     'quantity': quantity})
+
+    @staticmethod
+    def same_value(value, cached):
+        """Compare arrays element-wise to decide whether to skip a set.
+
+        """
+        try:
+            return (np.shape(value) == np.shape(cached) and
+                    bool(np.all(value == cached)))
+        except Exception:
+            return False
+
+    @staticmethod
+    def cached_copy(value):
+        """Copy the set array so that changing it in place does not alter the
+        cache (and hence does not cause the next set to be skipped).
+
+        """
+        if isinstance(value, _Quantity):
+            return copy(value)
+        return np.array(value, copy=True)
+
+    def get(self, instance):
+        """Retrieve the array using the driver default_get_array method.
+
+        """
+        return instance.default_get_array(self, self._getter)
+
+    def post_get(self, instance, value):
+        """Scale the array and attach the unit.
+
+        """
+        if self.scale is not None:
+            value = value*self.scale + self.offset
+        elif self.offset:
+            value = value + self.offset
+        if self.unit and self.quantity:
+            value = to_quantity(value, self.unit)
+        return value
+
+    def to_instrument(self, instance, value):
+        """Convert, validate and cast the values to send to the instrument.
+
+        This method is meant to be used as a pre_set.
+
+        """
+        if isinstance(value, _Quantity):
+            value = convert(value, self.unit)
+        value = np.asarray(value)
+
+        rng = self.range
+        if self.range_id:
+            rng = instance.get_range(self.range_id)
+        if rng is not None:
+            checked = to_quantity(value, self.unit) if self.unit else value
+            index = rng.validate_array(checked, first_invalid=True)
+            if index is not None:
+                mess = 'The value {} at index {} is out of bound for {}.'
+                raise ValueError(mess.format(value.flat[index], index,
+                                             self.name))
+
+        if self.offset:
+            value = value - self.offset
+        if self.scale is not None:
+            value = value/self.scale
+        if self.dtype.kind in 'iu' and value.dtype.kind not in 'iub':
+            value = np.rint(value)
+        return value.astype(self.dtype, copy=False)
+
+    def set(self, instance, value):
+        """Send the array using the driver default_set_array method.
+
+        """
+        instance.default_set_array(self, self._setter, value)
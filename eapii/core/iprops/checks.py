@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Compiler for the checks performed before getting or setting IProperties.
+
+A check is a ';' separated list of Python boolean expressions in which the
+values of IProperties are referenced using {name}. Dotted names can be used to
+reference the IProperties of other objects, typically {parent.function} from
+a subsystem or a channel. When checking a set operation the value being set is
+available under the name value.
+
+The checks are tokenized and parsed into an abstract syntax tree which is
+validated (only the referenced values, value and a few builtins can be used,
+private attributes cannot be accessed) before being compiled. The result is
+cached so that all the IProperties using the same check (and in particular
+the clones created when customizing an IProperty) share the same function.
+
+The referenced values are retrieved only when the evaluation reaches them
+(and at most once per check), so that an assertion failing or a guard such as
+{a} and {b} prevents querying the instrument for the values that are not
+needed. Checks which always need all their values retrieve them at once.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+import ast
+import io
+import tokenize
+from copy import deepcopy
+from operator import attrgetter
+
+try:
+    import __builtin__ as _builtins
+except ImportError:
+    import builtins as _builtins
+
+
+#: Builtins which can be used in the checks.
+SAFE_BUILTINS = {name: getattr(_builtins, name)
+                 for name in ('abs', 'all', 'any', 'bool', 'float', 'int',
+                              'len', 'max', 'min', 'round', 'str', 'True',
+                              'False', 'None')}
+
+#: Compiled checks indexed by source and kind (get or set).
+_CHECKS_CACHE = {}
+
+
+class CompiledCheck(object):
+    """Result of the compilation of a check.
+
+    Parameters
+    ----------
+    source : unicode
+        Check from which this object was compiled.
+    setting : bool
+        Whether the check is performed before a set operation.
+    refs : tuple(unicode)
+        Names (possibly dotted) of the values referenced in the check in the
+        order of their first appearance.
+    assertions : tuple
+        Text of each assertion, indexes (in refs) of the values it references
+        and function evaluating it. The functions take the value being set
+        (for set checks) followed by a callable returning the value of a
+        reference given its index.
+    test : function
+        Function evaluating all the assertions at once. It takes the value
+        being set (for set checks) followed by the values listed in refs.
+    lazy_test : function or None
+        Function evaluating all the assertions at once, taking the same
+        arguments as the functions of the assertions. None if all the
+        referenced values are always needed (single assertion which cannot
+        short-circuit), in which case they are retrieved at once and test is
+        used.
+
+    Attributes
+    ----------
+    checker : function
+        Function to bind to an IProperty as get_check or set_check.
+
+    """
+    __slots__ = ('source', 'setting', 'refs', 'assertions', 'test',
+                 'lazy_test', 'checker')
+
+    def __init__(self, source, setting, refs, assertions, test, lazy_test):
+        self.source = source
+        self.setting = setting
+        self.refs = refs
+        self.assertions = assertions
+        self.test = test
+        self.lazy_test = lazy_test
+        self.checker = _make_checker(self)
+
+    def failure_message(self, iprop, args):
+        """Build the error message explaining why the check failed.
+
+        Parameters
+        ----------
+        iprop : IProperty
+            IProperty whose check failed.
+        args : tuple
+            Arguments passed to the lazy_test function, the last one being
+            the _LazyValues used to retrieve the referenced values.
+
+        """
+        values = args[-1].values
+        text, indexes = self.source, range(len(self.refs))
+        for a_text, a_indexes, func in self.assertions:
+            if not func(*args):
+                text, indexes = a_text, a_indexes
+                break
+
+        # Only the values which were needed to evaluate the check are known.
+        vals = ', '.join('{}={}'.format(self.refs[i], values[i])
+                         for i in indexes if i in values)
+        mess = '{} {} assertion {} failed, values are : {}'
+        return mess.format('Setting' if self.setting else 'Getting',
+                           iprop.name, text, vals)
+
+
+def compile_check(check, setting=False):
+    """Compile a check into a CompiledCheck.
+
+    The result is cached, compiling the same check twice returns the same
+    object.
+
+    Parameters
+    ----------
+    check : unicode
+        ; separated string containing boolean tests to assert. '{' and '}'
+        delimit the values which should be retrieved from the instrument.
+    setting : bool, optional
+        Whether the check is performed before a set operation, in which case
+        the value being set can be referred to as value.
+
+    Returns
+    -------
+    compiled : CompiledCheck
+        Compiled check.
+
+    Raises
+    ------
+    ValueError :
+        Raised if the check is not a valid expression or uses forbidden
+        names or attributes.
+
+    """
+    if isinstance(check, bytes):
+        check = check.decode('utf-8')
+    key = (check, setting)
+    try:
+        return _CHECKS_CACHE[key]
+    except KeyError:
+        pass
+
+    refs = []
+    parsed = []
+    for text, expr, fields in _split_assertions(check):
+        indexes = []
+        for f in fields:
+            if f not in refs:
+                refs.append(f)
+            if refs.index(f) not in indexes:
+                indexes.append(refs.index(f))
+        for f in fields:
+            expr = expr.replace(_FIELD_MARK.format(f),
+                                '_v{}'.format(refs.index(f)))
+        try:
+            node = ast.parse(expr, mode='eval').body
+        except SyntaxError as e:
+            raise ValueError('Invalid check {!r} : {}'.format(check, e))
+        parsed.append((text, node, tuple(indexes)))
+
+    allowed = set('_v{}'.format(i) for i in range(len(refs)))
+    allowed.update(SAFE_BUILTINS)
+    if setting:
+        allowed.add('value')
+    for _, node, _ in parsed:
+        _validate(check, node, allowed)
+
+    args = (['value'] if setting else []) + ['_v{}'.format(i)
+                                             for i in range(len(refs))]
+    test = _make_function(check, args, [node for _, node, _ in parsed])
+
+    lazy_args = (['value'] if setting else []) + ['_f']
+    lazy_nodes = [_LazyRefs().visit(deepcopy(node)) for _, node, _ in parsed]
+    assertions = tuple((text, indexes,
+                        _make_function(check, lazy_args, [node]))
+                       for (text, _, indexes), node in zip(parsed, lazy_nodes))
+    lazy_test = None
+    if len(parsed) > 1 or any(_short_circuits(node) for _, node, _ in parsed):
+        lazy_test = _make_function(check, lazy_args, lazy_nodes)
+
+    compiled = CompiledCheck(check, setting, tuple(refs), assertions, test,
+                             lazy_test)
+    _CHECKS_CACHE[key] = compiled
+    return compiled
+
+
+# --- Private API -------------------------------------------------------------
+
+#: Sentinel used when checking a get operation.
+_NO_VALUE = object()
+
+#: Marker replacing the fields in the assertions before the names used to
+#: pass the values are known.
+_FIELD_MARK = '\x00{}\x00'
+
+
+def _split_assertions(check):
+    """Tokenize a check and split it into assertions.
+
+    Returns
+    -------
+    assertions : list
+        Tuples containing the text of the assertion (braces removed), the
+        assertion in which the fields are replaced by markers and the names
+        of the fields in order of appearance.
+
+    """
+    lines = check.splitlines(True) or ['']
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    def pos(point):
+        return offsets[point[0] - 1] + point[1]
+
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(check).readline))
+    except (tokenize.TokenError, SyntaxError) as e:
+        raise ValueError('Invalid check {!r} : {}'.format(check, e))
+
+    assertions = []
+    start = 0
+    text = expr = ''
+    fields = []
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+        tok_type, string = tok[0], tok[1]
+        if tok_type == tokenize.OP and string == ';':
+            assertions.append((text + check[start:pos(tok[2])],
+                               expr + check[start:pos(tok[2])], fields))
+            start = pos(tok[3])
+            text = expr = ''
+            fields = []
+        elif tok_type == tokenize.OP and string == '{':
+            end = _read_field(tokens, i + 1)
+            if end:
+                field = ''.join(t[1] for t in tokens[i+1:end])
+                chunk = check[start:pos(tok[2])]
+                text += chunk + field
+                expr += chunk + _FIELD_MARK.format(field)
+                fields.append(field)
+                start = pos(tokens[end][3])
+                i = end
+        i += 1
+
+    assertions.append((text + check[start:], expr + check[start:], fields))
+    return [(t.strip(), e.strip(), f) for t, e, f in assertions if e.strip()]
+
+
+def _read_field(tokens, i):
+    """Read a field (NAME (. NAME)* }) starting at index i.
+
+    Returns
+    -------
+    end : int or None
+        Index of the closing brace or None if the tokens do not form a field.
+
+    """
+    while i + 1 < len(tokens) and tokens[i][0] == tokenize.NAME:
+        if tokens[i + 1][1] == '}':
+            return i + 1
+        if tokens[i + 1][1] != '.':
+            return None
+        i += 2
+    return None
+
+
+def _validate(check, node, allowed):
+    """Ensure that an assertion only uses allowed names and attributes.
+
+    """
+    for n in ast.walk(node):
+        if isinstance(n, ast.Name) and n.id not in allowed:
+            mess = 'Check {!r} uses the unknown name {}.'
+            raise ValueError(mess.format(check, n.id))
+        if isinstance(n, ast.Attribute) and n.attr.startswith('_'):
+            mess = 'Check {!r} accesses the private attribute {}.'
+            raise ValueError(mess.format(check, n.attr))
+        if isinstance(n, ast.Lambda):
+            raise ValueError('Check {!r} defines a lambda.'.format(check))
+
+
+#: Nodes whose evaluation can skip some of their operands.
+_SHORT_CIRCUITS = (ast.BoolOp, ast.IfExp, ast.GeneratorExp, ast.ListComp,
+                   ast.SetComp, ast.DictComp)
+
+
+def _short_circuits(node):
+    """Check whether some parts of an assertion may not be evaluated.
+
+    """
+    return any(isinstance(n, _SHORT_CIRCUITS) or
+               (isinstance(n, ast.Compare) and len(n.ops) > 1)
+               for n in ast.walk(node))
+
+
+class _LazyRefs(ast.NodeTransformer):
+    """Replace the names of the referenced values (_v0, _v1, ...) by calls
+    retrieving them (_f(0), _f(1), ...).
+
+    """
+    def visit_Name(self, node):
+        if not node.id.startswith('_v'):
+            return node
+        call = ast.parse('_f({})'.format(node.id[2:]), mode='eval').body
+        return ast.copy_location(call, node)
+
+
+class _LazyValues(object):
+    """Callable retrieving the referenced values of an object on demand.
+
+    Each value is retrieved at most once, the values already retrieved are
+    stored in the values dict under their index.
+
+    """
+    __slots__ = ('instance', 'getters', 'values')
+
+    def __init__(self, instance, getters):
+        self.instance = instance
+        self.getters = getters
+        self.values = {}
+
+    def __call__(self, index):
+        values = self.values
+        if index in values:
+            return values[index]
+        value = values[index] = self.getters[index](self.instance)
+        return value
+
+
+def _make_function(check, args, nodes):
+    """Build a function taking args and returning True if all the nodes
+    evaluate to True.
+
+    """
+    tree = ast.parse('lambda {}: True'.format(', '.join(args)), mode='eval')
+    if len(nodes) > 1:
+        tree.body.body = ast.BoolOp(op=ast.And(), values=nodes)
+    elif nodes:
+        tree.body.body = nodes[0]
+    ast.fix_missing_locations(tree)
+    code = compile(tree, '<check {}>'.format(check), 'eval')
+    return eval(code, {'__builtins__': SAFE_BUILTINS})
+
+
+def _make_checker(compiled):
+    """Build the function running a compiled check.
+
+    """
+    getters = tuple(attrgetter(r) for r in compiled.refs)
+    if compiled.lazy_test is None:
+        return _make_eager_checker(compiled, getters)
+
+    test = compiled.lazy_test
+    if compiled.setting:
+        def check(self, instance, value):
+            values = _LazyValues(instance, getters)
+            if not test(value, values):
+                raise AssertionError(compiled.failure_message(self,
+                                                              (value, values)))
+    else:
+        def check(self, instance):
+            values = _LazyValues(instance, getters)
+            if not test(values):
+                raise AssertionError(compiled.failure_message(self,
+                                                              (values,)))
+
+    return check
+
+
+def _make_eager_checker(compiled, getters):
+    """Build the function running a check needing all its values.
+
+    """
+    refs = compiled.refs
+    test = compiled.test
+    if not refs:
+        def fetch(instance):
+            return ()
+    elif len(refs) == 1:
+        getter = getters[0]
+
+        def fetch(instance):
+            return (getter(instance),)
+    else:
+        fetch = attrgetter(*refs)
+
+    def fail(iprop, instance, values, value=_NO_VALUE):
+        known = _LazyValues(instance, getters)
+        known.values.update(enumerate(values))
+        args = (known,) if value is _NO_VALUE else (value, known)
+        return AssertionError(compiled.failure_message(iprop, args))
+
+    if compiled.setting:
+        def check(self, instance, value):
+            values = fetch(instance)
+            if not test(value, *values):
+                raise fail(self, instance, values, value)
+    else:
+        def check(self, instance):
+            values = fetch(instance)
+            if not test(*values):
+                raise fail(self, instance, values)
+
+    return check
@@ -12,14 +12,115 @@
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
 from types import MethodType
-from future.utils import exec_
-from inspect import cleandoc
+from future.utils import exec_, string_types, with_metaclass
+from inspect import cleandoc, getsourcelines
 from functools import update_wrapper
+from textwrap import fill
+from weakref import WeakKeyDictionary
 
 from ..errors import InstrIOError
+from ..util import monotonic
+from .checks import compile_check
 
 
-class IProperty(property):
+#: Docstrings of the IProperties extracted from the source of the classes.
+_DOCS_CACHE = WeakKeyDictionary()
+
+#: Marker returned by cached_value when no value is cached.
+_MISSING = object()
+
+
+def extract_iprops_docs(cls, names):
+    """Extract the docstrings of the IProperties declared on a class.
+
+    The docstrings are built from the comments starting with '#:' preceding
+    the IProperty declaration in the source code of the class. As reading the
+    source is costly, the results are cached.
+
+    Parameters
+    ----------
+    cls : type
+        Class on which the IProperties are declared.
+    names : iterable
+        Names of the IProperties declared on the class.
+
+    Returns
+    -------
+    docs : dict
+        Mapping between the names of the IProperties and their docstring. If
+        the source is not available (frozen application for example) the
+        dict is empty.
+
+    """
+    if cls in _DOCS_CACHE:
+        return _DOCS_CACHE[cls]
+
+    try:
+        lines, _ = getsourcelines(cls)
+    except (IOError, OSError, TypeError):
+        lines = []
+
+    docs = {}
+    doc = ''
+    for line in lines:
+        l = line.strip()
+        if l.startswith('#:'):
+            doc += ' ' + l[2:].strip()
+        elif ' = ' in l:
+            name = l.split(' = ', 1)[0]
+            if name in names:
+                docs[name] = fill(doc.strip(), 79)
+                doc = ''
+
+    _DOCS_CACHE[cls] = docs
+    return docs
+
+
+class _LazyDoc(object):
+    """Data descriptor giving access to the docstring of IProperties.
+
+    The docstrings of the IProperties declared on a HasIProps class are only
+    extracted from the source code of the class when first accessed. When
+    accessed on the class the docstring of the class is returned.
+
+    """
+    __slots__ = ('class_doc',)
+
+    def __init__(self, class_doc):
+        self.class_doc = class_doc
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self.class_doc
+
+        dct = obj.__dict__
+        if '_doc_source' in dct:
+            owner, names = dct.pop('_doc_source')
+            docs = extract_iprops_docs(owner, names)
+            if obj.name in docs:
+                dct['_doc'] = docs[obj.name]
+
+        return dct.get('_doc')
+
+    def __set__(self, obj, value):
+        dct = obj.__dict__
+        dct.pop('_doc_source', None)
+        dct['_doc'] = value
+
+
+class IPropertyMeta(type):
+    """Metaclass installing the lazy docstring descriptor on IProperties.
+
+    As the descriptor must live in the class dict of each subclass (where it
+    replaces the class docstring) this cannot be achieved by inheritance.
+
+    """
+    def __new__(meta, name, bases, dct):
+        dct['__doc__'] = _LazyDoc(dct.get('__doc__'))
+        return super(IPropertyMeta, meta).__new__(meta, name, bases, dct)
+
+
+class IProperty(with_metaclass(IPropertyMeta, property)):
     """Descriptor representing the most basic instrument property.
 
     IProperties should not be used outside the definition of a class to avoid
@@ -59,7 +160,11 @@ class IProperty(property):
         the get operation, the second for the set operation, None can be used
         to indicate no check should be performed.
         The check methods built from this are bound to the get_check and
-        set_check names.
+        set_check names. Dotted names ({parent.function}) can be used to
+        refer to the IProperties of other objects, see the checks module.
+    depends_on : tuple(unicode), optional
+        Names of the IProperties on which the value of this one depends. When
+        one of them is set, the cached value of this IProperty is discarded.
 
     Attributes
     ----------
@@ -69,16 +174,44 @@ class IProperty(property):
     creation_kwargs : dict
         Dictionary in which all the creation args should be stored to allow
         subclass customisation. This should not be manipulated by user code.
+    get_check_refs : tuple(unicode)
+        Names of the IProperties referenced by the checks performed before
+        getting. They can be retrieved beforehand in a single batched read.
+    set_check_refs : tuple(unicode)
+        Names of the IProperties referenced by the checks performed before
+        setting.
+    same_value : callable or None
+        Function comparing a value being set to the cached value, the set is
+        skipped if it returns True. None means using ==.
+    cached_copy : callable or None
+        Function returning the copy of a set value to store in the cache, so
+        that mutable values changed in place by the user do not alter the
+        cache. None means caching the value itself.
 
     """
-    def __init__(self, getter=None, setter=None, secure_comm=0, checks=None):
+    get_check_refs = ()
+
+    set_check_refs = ()
+
+    same_value = None
+
+    cached_copy = None
+
+    def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
+                 depends_on=()):
         self._getter = getter
         self._setter = setter
         self._secur = secure_comm
-        # Don't create the weak values dict if it is not used.
-        self._proxies = ()
+        self.depends_on = tuple(depends_on)
+        # Set when a first instance patches this IProperty, the accessors
+        # only look for proxies after that.
+        self._patched = False
         self.creation_kwargs = {'getter': getter, 'setter': setter,
                                 'secure_comm': secure_comm, 'checks': checks}
+        # Only stored if used to preserve compatibility with subclasses not
+        # supporting this argument.
+        if depends_on:
+            self.creation_kwargs['depends_on'] = depends_on
 
         super(IProperty,
               self).__init__(self._get if getter is not None else None,
@@ -210,14 +343,15 @@ class IProperty(property):
             Raised if the driver detects an issue.
 
         """
-        res, details = instance.default_check_instr_operation(self)
+        res, details = instance.default_check_instr_operation(self, value,
+                                                               i_value)
         if not res:
             mess = 'The instrument did not succeed to set {} to {} ({})'
             if details:
                 mess += ':' + str(details)
             else:
                 mess += '.'
-            raise InstrIOError(mess.format(self._name, value, i_value))
+            raise InstrIOError(mess.format(self.name, value, i_value))
 
     def clone(self):
         """Clone the IProperty by copying all the local attributes and instance
@@ -225,8 +359,9 @@ class IProperty(property):
 
         """
         p = self.__class__(self._getter, self._setter, secure_comm=self._secur)
-        p.__doc__ = self.__doc__
 
+        # The docstring state (_doc, _doc_source) is copied without resolving
+        # the docstring.
         for k, v in self.__dict__.items():
             if isinstance(v, MethodType):
                 setattr(p, k, MethodType(v.__func__, p))
@@ -235,6 +370,30 @@ class IProperty(property):
 
         return p
 
+    def compile_accessors(self):
+        """Build the specialised getter and setter used when the IProperty is
+        accessed through an object.
+
+        The getting and setting chains are flattened into a single function in
+        which the hooks which are no-op are skipped, the retry loop only exists
+        if secure_comm is non zero and the proxy lookup is only performed if
+        proxies exist for this IProperty. This method is called by the
+        HasIPropsMeta once all the hooks have been customized, it should be
+        called again if the hooks are altered afterwards.
+
+        """
+        fget = _compile_getter(self) if self._getter is not None else None
+        fset = _compile_setter(self) if self._setter is not None else None
+
+        # Re-initialising the property is the only way to change the
+        # accessors but it can alter the docstring so we restore it (without
+        # resolving it).
+        dct = self.__dict__
+        doc_state = {k: dct[k] for k in ('_doc', '_doc_source') if k in dct}
+        super(IProperty, self).__init__(fget, fset, self._del)
+        dct.pop('_doc', None)
+        dct.update(doc_state)
+
     def _wrap_with_checker(self, func, target='pre_get'):
         """Wrap a func to execute checker before it if necessary and bind as
         method.
@@ -282,7 +441,7 @@ class IProperty(property):
 
         """
         build = self._build_checker
-        if len(checks) == 2:
+        if not isinstance(checks, string_types):
             if checks[0]:
                 self.get_check = MethodType(build(checks[0]), self)
                 self.pre_get = self.get_check
@@ -296,7 +455,11 @@ class IProperty(property):
             self.pre_set = self.set_check
 
     def _build_checker(self, check, set=False):
-        """Assemble a checker function from the provided assertions.
+        """Get the checker function corresponding to the provided assertions.
+
+        The compilation is delegated to compile_check which caches its
+        results. The names of the referenced IProperties are stored in the
+        get_check_refs and set_check_refs attributes.
 
         Parameters
         ----------
@@ -305,6 +468,8 @@ class IProperty(property):
             delimit field which should be replaced by instrument state. 'value'
             should be considered a reserved keyword available when checking
             a set operation.
+        set : bool, optional
+            Whether the checker is used before a set operation.
 
         Returns
         -------
@@ -312,58 +477,37 @@ class IProperty(property):
             Function to use
 
         """
-        func_def = 'def check(self, instance):\n' if not set\
-            else 'def check(self, instance, value):\n'
-        assertions = check.split(';')
-        for assertion in assertions:
-            # First find replacement fields.
-            aux = assertion.split('{')
-            if len(aux) < 2:
-                # Silently ignore checks unrelated to instrument state.
-                continue
-            line = 'assert '
-            els = [el.strip() for s in aux for el in s.split('}')]
-            for i in range(0, len(els), 2):
-                e = els[i]
-                if i+1 < len(els):
-                    line += e + ' getattr(instance, "{}") '.format(els[i+1])
-                else:
-                    line += e
-            values = ', '.join(('getattr(instance,  "{}")'.format(el)
-                                for el in els[1::2]))
-
-            val_fmt = ', '.join(('{}'.format(el)+'={}' for el in els[1::2]))
-            a_mess = 'assertion {} failed, '.format(' '.join(els).strip())
-            a_mess += 'values are : {}".format(self.name, {})'.format(val_fmt,
-                                                                      values)
-
-            if set:
-                a_mess = '"Setting {} ' + a_mess
-            else:
-                a_mess = '"Getting {} ' + a_mess
-
-            func_def += '    ' + line + ', ' + a_mess + '\n'
-
-        loc = {}
-        exec_(func_def, locs=loc)
-        return loc['check']
+        compiled = compile_check(check, set)
+        if set:
+            self.set_check_refs = compiled.refs
+        else:
+            self.get_check_refs = compiled.refs
+        return compiled.checker
 
     def _get(self, instance):
         """Getter defined when the user provides a value for the get arg.
 
+        Cached values are returned without taking the lock of the instance.
+
         """
+        name = self.name
+        val = cached_value(instance, name)
+        if val is not _MISSING:
+            return val
+
         with instance.lock:
-            cache = instance._cache
-            name = self.name
-            if name in cache:
-                return cache[name]
+            # Another thread may have retrieved the value while we were
+            # waiting for the lock.
+            val = cached_value(instance, name)
+            if val is not _MISSING:
+                return val
 
-            if instance in self._proxies:
-                return self._proxies[instance].proxy_get(instance)
+            proxies = instance._proxies
+            if proxies and name in proxies:
+                return proxies[name].proxy_get(instance)
 
             val = get_chain(self, instance)
-            if name in instance._caching_permissions:
-                cache[name] = val
+            cache_value(instance, name, val)
 
             return val
 
@@ -374,15 +518,24 @@ class IProperty(property):
         with instance.lock:
             cache = instance._cache
             name = self.name
-            if name in cache and value == cache[name]:
+            if name in cache:
+                same = self.same_value
+                if same(value, cache[name]) if same else value == cache[name]:
+                    return
+
+            proxies = instance._proxies
+            if proxies and name in proxies:
+                proxies[name].proxy_set(instance, value)
+                if instance._until_set_owners:
+                    instance.clear_until_set_caches()
                 return
 
-            if instance in self._proxies:
-                return self._proxies[instance].proxy_set(instance, value)
-
             set_chain(self, instance, value)
-            if name in instance._caching_permissions:
-                cache[name] = value
+            if instance._until_set_owners:
+                instance.clear_until_set_caches()
+            if not getattr(self, 'coerce', False):
+                copy = self.cached_copy
+                cache_value(instance, name, copy(value) if copy else value)
 
     def _del(self, instance):
         """Deleter clearing the cache of the instrument for this IProperty.
@@ -420,6 +573,7 @@ def set_chain(iprop, instance, value):
 
     """
     i_val = iprop.pre_set(instance, value)
+    instance.invalidate_dependents(iprop.name)
     i = -1
     while i < iprop._secur:
         try:
@@ -432,4 +586,181 @@ def set_chain(iprop, instance, value):
                 continue
             else:
                 raise
-    iprop.post_set(instance, value, i_val)
\ No newline at end of file
+    iprop.post_set(instance, value, i_val)
+
+
+def cached_value(instance, name):
+    """Retrieve a value from the cache of an object without taking its lock.
+
+    The caches are only altered through single dict operations or replaced at
+    once, which are atomic, so a reader sees either the previous or the new
+    value but never a partially updated cache.
+
+    Returns
+    -------
+    value :
+        Cached value, _MISSING if no valid value is cached.
+
+    """
+    val = instance._cache.get(name, _MISSING)
+    if val is _MISSING:
+        entry = instance._timed_cache.get(name)
+        if entry is not None and monotonic() < entry[1]:
+            return entry[0]
+    return val
+
+
+def cache_value(instance, name, value):
+    """Store a value in the cache of an object according to the caching
+    policy of the IProperty.
+
+    """
+    if name in instance._caching_permissions:
+        instance._cache[name] = value
+        instance._cache_stamps[name] = monotonic()
+    elif name in instance._cache_ttls:
+        now = monotonic()
+        instance._timed_cache[name] = (value, now + instance._cache_ttls[name])
+        instance._cache_stamps[name] = now
+
+
+def _is_default_hook(iprop, hook):
+    """Check whether a hook of an IProperty is the one defined on IProperty.
+
+    """
+    func = getattr(getattr(iprop, hook), '__func__', None)
+    return func is IProperty.__dict__[hook]
+
+
+def _secured_call(call, secure_comm):
+    """Lines performing a call to the instrument, retried after re-opening the
+    connection if secure_comm is non zero.
+
+    """
+    if not secure_comm:
+        return [call]
+
+    return ['i = 0',
+            'while True:',
+            '    try:',
+            '        ' + call,
+            '        break',
+            '    except instance.secure_com_exceptions:',
+            '        if i == {}:'.format(secure_comm),
+            '            raise',
+            '        i += 1',
+            '        instance.reopen_connection()']
+
+
+def _build_accessor(iprop, kind, signature, body, unlocked=()):
+    """Compile the source of an accessor and return the function.
+
+    The accessor is defined inside a factory so that the hooks are accessed as
+    closure variables. The body is executed while holding the lock of the
+    instance, the unlocked lines before acquiring it.
+
+    """
+    hooks = ('pre_get', 'get', 'post_get', 'pre_set', 'set', 'post_set')
+    lines = ['def factory(iprop, name, getter, setter, {}):'.format(
+             ', '.join(hooks)),
+             '    def {}({}):'.format(kind, signature)]
+    lines.extend('        ' + l for l in unlocked)
+    lines.append('        with instance.lock:')
+    lines.extend('            ' + l for l in body)
+    lines.append('    return ' + kind)
+
+    code = compile('\n'.join(lines) + '\n',
+                   '<{} {}>'.format(kind, iprop.name), 'exec')
+    namespace = {'monotonic': monotonic, 'cache_value': cache_value,
+                 'MISSING': _MISSING}
+    exec_(code, namespace)
+    return namespace['factory'](iprop, iprop.name, iprop._getter,
+                                iprop._setter,
+                                *[getattr(iprop, h) for h in hooks])
+
+
+def _compile_getter(iprop):
+    """Build a getter specialised for the given IProperty.
+
+    """
+    # Inlined version of cached_value. The check is performed without the
+    # lock and repeated once it is acquired.
+    lookup = ['val = instance._cache.get(name, MISSING)',
+              'if val is not MISSING:',
+              '    return val',
+              'timed = instance._timed_cache.get(name)',
+              'if timed is not None and monotonic() < timed[1]:',
+              '    return timed[0]']
+    body = list(lookup)
+    # The proxies are stored on the instances, and only looked for once an
+    # instance has patched this IProperty.
+    if iprop._patched:
+        body += ['proxies = instance._proxies',
+                 'if proxies and name in proxies:',
+                 '    return proxies[name].proxy_get(instance)']
+
+    if not _is_default_hook(iprop, 'pre_get'):
+        body.append('pre_get(instance)')
+
+    if _is_default_hook(iprop, 'get'):
+        call = 'val = instance.default_get_iproperty(iprop, getter)'
+    else:
+        call = 'val = get(instance)'
+    body += _secured_call(call, iprop._secur)
+
+    if not _is_default_hook(iprop, 'post_get'):
+        body.append('val = post_get(instance, val)')
+
+    body += ['cache_value(instance, name, val)',
+             'return val']
+
+    return _build_accessor(iprop, 'fget', 'instance', body, lookup)
+
+
+def _compile_setter(iprop):
+    """Build a setter specialised for the given IProperty.
+
+    """
+    if iprop.same_value is None:
+        body = ['cache = instance._cache',
+                'if name in cache and value == cache[name]:',
+                '    return']
+    else:
+        body = ['cache = instance._cache',
+                'if name in cache and iprop.same_value(value, cache[name]):',
+                '    return']
+    if iprop._patched:
+        body += ['proxies = instance._proxies',
+                 'if proxies and name in proxies:',
+                 '    proxies[name].proxy_set(instance, value)',
+                 '    if instance._until_set_owners:',
+                 '        instance.clear_until_set_caches()',
+                 '    return']
+
+    if _is_default_hook(iprop, 'pre_set'):
+        body.append('i_val = value')
+    else:
+        body.append('i_val = pre_set(instance, value)')
+
+    body += ['if name in instance.__dependents__:',
+             '    instance.invalidate_dependents(name)']
+
+    if _is_default_hook(iprop, 'set'):
+        call = 'instance.default_set_iproperty(iprop, setter, i_val)'
+    else:
+        call = 'set(instance, i_val)'
+    body += _secured_call(call, iprop._secur)
+
+    body += ['post_set(instance, value, i_val)',
+             'if instance._until_set_owners:',
+             '    instance.clear_until_set_caches()']
+    # The value sent by IProperties coercing the values can differ from the
+    # one passed by the user.
+    if getattr(iprop, 'coerce', False):
+        pass
+    elif iprop.cached_copy is None:
+        body.append('cache_value(instance, name, value)')
+    else:
+        body.append('cache_value(instance, name, iprop.cached_copy(value))')
+
+    return _build_accessor(iprop, 'fset', 'instance, value', body)
\ No newline at end of file
@@ -25,8 +25,9 @@ class Mapping(IProperty):
 
     """
     def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
-                 mapping={}):
-        super(Mapping, self).__init__(getter, setter, secure_comm)
+                 mapping={}, depends_on=()):
+        super(Mapping, self).__init__(getter, setter, secure_comm, checks,
+                                      depends_on=depends_on)
         self._map = mapping
         self._imap = {v: k for k, v in mapping.items()}
         self.creation_kwargs['mapping'] = mapping
@@ -53,9 +54,9 @@ class Bool(Mapping):
 
     """
     def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
-                 mapping={}, aliases={}):
+                 mapping={}, aliases={}, depends_on=()):
         super(Bool, self).__init__(getter, setter, secure_comm, checks,
-                                   mapping)
+                                   mapping, depends_on)
         self._aliases = {True: True, False: False}
         if aliases:
             for k in aliases:
@@ -14,7 +14,6 @@ from __future__ import (division, unicode_literals, print_function,
 from types import MethodType, FunctionType
 from weakref import WeakKeyDictionary
 
-
 from .i_property import get_chain, set_chain
 
 
@@ -28,6 +27,7 @@ class _ProxyManager(object):
     def __init__(self):
         super(_ProxyManager, self).__init__()
         self._proxy_cache = {}
+        self._iprop_cache = WeakKeyDictionary()
 
     def make_proxy(self, iprop, instance, kwargs):
         """Build a proxy for the given iprop.
@@ -36,6 +36,11 @@ class _ProxyManager(object):
         the IPropProxy class and the iprop class. This class is then cached and
         used to build to create the proxy instance.
 
+        For each IProperty a subclass of this mixin holding the instance
+        attributes of the IProperty as class attributes is created and
+        cached. The proxies are instances of this class and hence only need
+        to store the attributes they override.
+
         Parameters
         ----------
         iprop : IProperty
@@ -46,14 +51,28 @@ class _ProxyManager(object):
             Dict containing the attributes whose values should be overriden.
 
         """
-        iprop_class = type(iprop)
-        if iprop_class not in self._proxy_cache:
-            # Python 2 compatibility cast
-            proxy = type(str(iprop_class.__name__+'Proxy'),
-                         (IPropertyProxy, iprop_class), {})
-            self._proxy_cache[iprop_class] = proxy
-
-        return self._proxy_cache[iprop_class](iprop, instance, kwargs)
+        if not iprop._patched:
+            iprop._patched = True
+            # The accessors were built without looking for proxies.
+            iprop.compile_accessors()
+
+        if iprop not in self._iprop_cache:
+            iprop_class = type(iprop)
+            if iprop_class not in self._proxy_cache:
+                # Python 2 compatibility cast
+                proxy = type(str(iprop_class.__name__+'Proxy'),
+                             (IPropertyProxy, iprop_class), {})
+                self._proxy_cache[iprop_class] = proxy
+
+            # Instance methods are stored as functions so that they are bound
+            # to the proxy when accessed.
+            attrs = {k: v.__func__ if isinstance(v, MethodType) else v
+                     for k, v in iprop.__dict__.items()}
+            self._iprop_cache[iprop] = type(self._proxy_cache[iprop_class])(
+                str(iprop_class.__name__+'Proxy'),
+                (self._proxy_cache[iprop_class],), attrs)
+
+        return self._iprop_cache[iprop](iprop, instance, kwargs)
 
 
 make_proxy = _ProxyManager().make_proxy
@@ -69,6 +88,12 @@ class IPropertyProxy(object):
     """Generic proxy for IProperty, used to get per HasIProps instance
     behaviour.
 
+    The proxy is stored in the _proxies dict of the instance under the name
+    of the IProperty, so that looking for it does not involve the other
+    instances. The class of the proxy exposes the attributes of the IProperty
+    (as they were when the first proxy was created) so that the proxy only
+    stores the attributes it overrides.
+
     Parameters
     ----------
     iprop : IProperty
@@ -81,17 +106,9 @@ class IPropertyProxy(object):
     """
     def __init__(self, iprop, instance, attrs):
         self._iprop = iprop
-        # This is created now to avoid creating lots of those for nothing.
-        if not iprop._proxies:
-            iprop._proxies = WeakKeyDictionary()
-
-        # First get all the instance attr of the IProperty to preserve the
-        # special behaviours imparted by the HasIProps object.
-        aux = iprop.__dict__.copy()
-        aux.update(attrs)
-        self.patch(aux)
+        self.patch(attrs)
 
-        iprop._proxies[instance] = self
+        instance._proxies[iprop.name] = self
 
     def patch(self, attrs):
         """Update the proxy with new values.
@@ -102,7 +119,17 @@ class IPropertyProxy(object):
             New values to give to the proxy attributes.
 
         """
+        i_dict = self._iprop.__dict__
+        dct = self.__dict__
         for k, v in attrs.items():
+            # Values identical to the ones of the IProperty are not stored.
+            orig = i_dict.get(k, _MISSING)
+            if v is orig or (isinstance(v, MethodType) and
+                             isinstance(orig, MethodType) and
+                             v.__func__ is orig.__func__):
+                dct.pop(k, None)
+                continue
+
             # Make sure the instance method are correctly redirected to the
             # proxy and the functions are bound to the proxy.
             if isinstance(v, MethodType):
@@ -121,33 +148,23 @@ class IPropertyProxy(object):
             IProperty.
 
         """
-        i_dir = self._iprop.__dict__
+        dct = self.__dict__
         for attr in attrs:
-            if attr in i_dir:
-                v = i_dir[attr]
-                if isinstance(v, MethodType):
-                    v = MethodType(v.__func__, self)
-                setattr(self, attr, getattr(self._iprop, attr))
-            else:
-                delattr(self, attr)
+            if attr != '_iprop':
+                dct.pop(attr, None)
 
     @property
     def obsolete(self):
         """Boolean indicating whether the proxy differ from the original.
 
         """
-        ip_dict = self._iprop.__dict__
-        test_meth = MethodType(lambda: None, object())
-        for k, v in self.__dict__.items():
-            if isinstance(v, MethodType):
-                if v.__func__ != ip_dict.get(k, test_meth).__func__:
-                    return False
-            elif k not in ('_iprop', 'instance'):
-                if k not in ip_dict or v != ip_dict[k]:
-                    return False
-
-        return True
+        # Only the reference to the IProperty is left.
+        return len(self.__dict__) == 1
 
     proxy_get = get_chain
 
     proxy_set = set_chain
+
+
+#: Marker for the attributes the IProperty does not have.
+_MISSING = object()
@@ -6,72 +6,425 @@
 #
 # The full license is in the file LICENCE, distributed with this software.
 #------------------------------------------------------------------------------
-""" Module defining an IProperty used to deal with 8-bits binary register.
+""" Module defining an IProperty used to deal with binary registers.
+
+Registers can have any number of bits and contain multi-bit fields (BitField)
+whose values can be mapped to user friendly values. The masks associated to
+each bit and field are computed once per layout and shared by all the
+registers using it and all the values they return. Those values are compact
+RegisterFlags objects wrapping the integer read from the instrument.
 
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
 from collections import OrderedDict
+from numbers import Integral
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
 
 from .i_property import IProperty
 
 
+#: Tables shared by the registers using the same layout.
+_TABLES = {}
+
+
+class BitField(object):
+    """Field of a register made of several contiguous bits.
+
+    Parameters
+    ----------
+    offset : int
+        Index of the least significant bit of the field.
+    width : int, optional
+        Number of bits of the field.
+    mapping : dict, optional
+        Mapping between user values and the integer values of the field.
+        Values missing from the mapping are returned as integers.
+
+    Attributes
+    ----------
+    mask : int
+        Mask selecting the bits of the field in the register value.
+
+    """
+    __slots__ = ('offset', 'width', 'mapping', 'mask', '_imap')
+
+    def __init__(self, offset, width=1, mapping=None):
+        if offset < 0 or width < 1:
+            raise ValueError('Invalid bit field ({}, {})'.format(offset,
+                                                                 width))
+        self.offset = offset
+        self.width = width
+        self.mapping = mapping
+        self.mask = ((1 << width) - 1) << offset
+        self._imap = {v: k for k, v in mapping.items()} if mapping else {}
+
+    def __repr__(self):
+        return 'BitField({}, {}, {!r})'.format(self.offset, self.width,
+                                               self.mapping)
+
+    def decode(self, value):
+        """Extract the value of the field from the register value.
+
+        """
+        raw = (value & self.mask) >> self.offset
+        return self._imap.get(raw, raw)
+
+    def encode(self, value):
+        """Convert a value of the field into bits of the register value.
+
+        """
+        if self.mapping:
+            try:
+                value = self.mapping[value]
+            except KeyError:
+                raise ValueError('{!r} is not a valid value'.format(value))
+        if not 0 <= value < 1 << self.width:
+            mess = '{} does not fit in a field of {} bits'
+            raise ValueError(mess.format(value, self.width))
+        return value << self.offset
+
+    def _key(self):
+        mapping = self.mapping
+        return (self.offset, self.width,
+                tuple(sorted(mapping.items())) if mapping else None)
+
+
+class RegisterTable(object):
+    """Precomputed description of the bits and fields of a register.
+
+    Tables should be retrieved using get_table which shares them between the
+    registers using the same layout.
+
+    Parameters
+    ----------
+    layout : dict
+        Bit index (int) or BitField associated to each name. The bits not
+        covered are named after their index.
+    length : int
+        Number of bits of the register.
+
+    Attributes
+    ----------
+    names : tuple
+        Names of the bits and fields, in order of offset.
+    entries : tuple
+        Mask (single bits) or BitField (multi-bit fields) associated to each
+        name.
+    masks : dict
+        Mask of each single bit indexed by name and of each bit by index.
+    fields : dict
+        Multi-bit fields indexed by name.
+
+    """
+    __slots__ = ('names', 'length', 'entries', 'masks', 'fields')
+
+    def __init__(self, layout, length):
+        fields = {}
+        for n, f in layout.items():
+            if not isinstance(f, BitField):
+                f = BitField(f)
+            if f.offset + f.width > length:
+                mess = 'Field {} does not fit in a {} bits register.'
+                raise ValueError(mess.format(n, length))
+            fields[f.offset] = (n, f)
+
+        specs = []
+        used = 0
+        for i in range(length):
+            if i in fields:
+                n, f = fields[i]
+                if used & f.mask:
+                    raise ValueError('Overlapping fields in register.')
+                used |= f.mask
+                entry = f.mask if f.width == 1 and not f.mapping else f
+                specs.append((n, entry))
+            elif not used & (1 << i):
+                specs.append((i, 1 << i))
+                used |= 1 << i
+        if len(fields) != len(layout):
+            raise ValueError('Overlapping fields in register.')
+
+        self.names = tuple(n for n, _ in specs)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError('The names of the bits of a register must be '
+                             'unique.')
+        self.length = length
+        self.entries = tuple(e for _, e in specs)
+        self.masks = {i: 1 << i for i in range(length)}
+        self.masks.update((n, e) for n, e in specs
+                          if not isinstance(e, BitField))
+        self.fields = {n: e for n, e in specs if isinstance(e, BitField)}
+
+    def decode(self, value):
+        """Get the state of all the bits and the value of all the fields.
+
+        """
+        return [e.decode(value) if isinstance(e, BitField) else
+                bool(value & e) for e in self.entries]
+
+
+def get_table(layout, length):
+    """Get the table describing a register layout.
+
+    Tables are cached so that all the registers sharing the same layout (in
+    particular the clones created when customizing a Register) share the same
+    table.
+
+    Parameters
+    ----------
+    layout : dict
+        Bit index or BitField associated to each name.
+    length : int
+        Number of bits of the register.
+
+    """
+    try:
+        key = (length, tuple(sorted(
+            ((repr(n), f._key() if isinstance(f, BitField) else f)
+             for n, f in layout.items()))))
+        hash(key)
+    except TypeError:
+        return RegisterTable(layout, length)
+
+    try:
+        return _TABLES[key]
+    except KeyError:
+        table = _TABLES[key] = RegisterTable(layout, length)
+        return table
+
+
+class RegisterFlags(object):
+    """State of the bits of a register.
+
+    This read-only mapping associates the name of each bit to its state (a
+    bool) and the name of each multi-bit field to its value. Bits can also be
+    accessed by index. Only the integer value of the register and a reference
+    to the table describing the bits are stored.
+
+    Parameters
+    ----------
+    value : int
+        Value of the register.
+    table : RegisterTable
+        Description of the bits of the register.
+
+    """
+    __slots__ = ('value', 'table')
+
+    def __init__(self, value, table):
+        self.value = value
+        self.table = table
+
+    def __getitem__(self, key):
+        mask = self.table.masks.get(key)
+        if mask is None:
+            return self.table.fields[key].decode(self.value)
+        return bool(self.value & mask)
+
+    def __contains__(self, key):
+        return key in self.table.masks or key in self.table.fields
+
+    def __iter__(self):
+        return iter(self.table.names)
+
+    def __len__(self):
+        return len(self.table.names)
+
+    def __int__(self):
+        return self.value
+
+    __index__ = __int__
+
+    def __eq__(self, other):
+        if isinstance(other, RegisterFlags):
+            return (self.value == other.value and
+                    self.table.names == other.table.names)
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None
+
+    def __repr__(self):
+        active = ', '.join(repr(n) if v is True else '{!r}={!r}'.format(n, v)
+                           for n, v in self.items() if v is not False)
+        return 'RegisterFlags({:#x}: {})'.format(self.value, active)
+
+    def get(self, key, default=None):
+        """Get the state of a bit or default if the key is unknown.
+
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """Names of the bits and fields.
+
+        """
+        return list(self.table.names)
+
+    def values(self):
+        """State of the bits and value of the fields.
+
+        """
+        return self.table.decode(self.value)
+
+    def items(self):
+        """Name and state (or value) of each bit and field.
+
+        """
+        return list(zip(self.table.names, self.table.decode(self.value)))
+
+
+Mapping.register(RegisterFlags)
+
+
 class Register(IProperty):
     """Property handling a bit field as a mapping.
 
     Parameters
     ----------
     getter : unicode
-        Command to retrieve the byte state.
+        Command to retrieve the register state.
     setter : unicode
-        Command to set the byte state.
-    names : iterable or dict
-        Names to associate to each bit fields from 0 to 7. When using an
-        iterable None can be used to mark a useless bit. When using a dict
-        the values are used to specify the bits to consider.
+        Command to set the register state.
+    names : iterable or dict, optional
+        Names to associate to each bit fields from 0 to length - 1. When using
+        an iterable None can be used to mark a useless bit. When using a dict
+        the values are used to specify the bits to consider, a BitField can
+        be used instead of the index of a bit to declare a multi-bit field.
+        Bits without name are named after their index.
     secure_comm : int, optional
         Whether or not a failed communication should result in a new attempt
         to communicate after re-opening the communication. The value is used to
         determine how many times to retry.
+    length : int, optional
+        Number of bits of the register (8 by default, 16 for SCPI status
+        registers).
+
+    Attributes
+    ----------
+    names : tuple
+        Name of each bit or field.
+    table : RegisterTable
+        Precomputed masks shared by all the values returned by the IProperty.
 
     """
-    def __init__(self, getter=None, setter=None, names=(), checks=None,
-                 secure_comm=0):
-        super(Register, self).__init__(getter, setter, secure_comm, checks)
+    def __init__(self, getter=None, setter=None, names=None, checks=None,
+                 secure_comm=0, depends_on=(), length=8):
+        super(Register, self).__init__(getter, setter, secure_comm, checks,
+                                       depends_on)
+        if length < 1:
+            raise ValueError('Registers must have at least one bit.')
 
         if isinstance(names, dict):
-            aux = list(range(8))
-            for n, i in names.items():
-                aux[i] = n
-            names = aux
+            layout = names
 
-        else:
+        elif names is not None:
             names = list(names)
-            if len(names) != 8:
-                raise ValueError('Register necessitates 8 names')
+            if len(names) != length:
+                raise ValueError('Register necessitates {} names'.format(
+                    length))
+
+            # None marks a useless bit which will be named after its index.
+            layout = {n: i for i, n in enumerate(names) if n is not None}
+            if len(layout) != len(names) - names.count(None):
+                raise ValueError('The names of the bits of a register must '
+                                 'be unique.')
 
-            # Makes sure every key is unique by using the bit index if None is
-            # found
-            for i, n in enumerate(names[:]):
-                if n is None:
-                    names[i] = i
+        else:
+            layout = {}
 
-        self.names = tuple(names)
+        self.table = get_table(layout, length)
+        self.names = self.table.names
         self.creation_kwargs['names'] = names
+        if length != 8:
+            self.creation_kwargs['length'] = length
+
+        self._wrap_with_checker(self.to_instrument, 'pre_set')
 
     def post_get(self, instance, value):
-        """Convert the instrument into a dict.
+        """Convert the instrument answer into a RegisterFlags.
+
+        """
+        return RegisterFlags(int(value), self.table)
+
+    def to_instrument(self, instance, value):
+        """Convert a mapping (or an integer) into the register value.
+
+        Bits are set if the associated value is true, missing bits and fields
+        are left to 0. This method is meant to be used as a pre_set.
 
         """
-        val = int(value)
-        bit_conversion = lambda x, i: bool(x & (1 << i))
-        return OrderedDict((n, bit_conversion(val, i))
-                           for i, n in enumerate(self.names)
-                           if n is not None)
+        if isinstance(value, dict):
+            masks = self.table.masks
+            byte = 0
+            try:
+                for k, v in value.items():
+                    mask = masks.get(k)
+                    if mask is None:
+                        byte |= self.table.fields[k].encode(v)
+                    elif v:
+                        byte |= mask
+            except KeyError as e:
+                mess = '{} is not a bit of {}.'
+                raise ValueError(mess.format(e.args[0], self.name))
+            return byte
+        if isinstance(value, RegisterFlags):
+            return value.value
+        if isinstance(value, Mapping):
+            return self.to_instrument(instance, dict(value.items()))
+
+        if not isinstance(value, Integral) or\
+                not 0 <= value < 1 << self.table.length:
+            mess = '{} does not fit in the {} bits of {}.'
+            raise ValueError(mess.format(value, self.table.length, self.name))
+        return value
 
-    def pre_set(self, instance, value):
-        """Convert a dict into a byte value.
+    def decode_array(self, values):
+        """Decode at once an array of snapshots of the register.
+
+        NumPy is required.
+
+        Parameters
+        ----------
+        values : array-like
+            Integer values of the register.
+
+        Returns
+        -------
+        states : OrderedDict
+            Boolean array giving the state of each bit and array of the values
+            of each field, indexed by name.
 
         """
-        byte = sum((2**self.names.index(k) for k in value if value[k]))
-        return byte
+        import numpy as np
+        wide = self.table.length > 64
+        cast = int if wide else np.uint64
+        values = np.asarray(values).astype(object if wide else np.uint64)
+
+        states = OrderedDict()
+        for n, e in zip(self.table.names, self.table.entries):
+            if not isinstance(e, BitField):
+                states[n] = (values & cast(e)) != 0
+                continue
+
+            raw = (values & cast(e.mask)) >> cast(e.offset)
+            if e.mapping:
+                uniq, inverse = np.unique(raw, return_inverse=True)
+                decoded = [e.decode(int(u) << e.offset) for u in uniq]
+                mixed = len(set(type(d) for d in decoded)) > 1
+                raw = np.array(decoded, object if mixed else None)[inverse]
+            states[n] = raw
+
+        return states
@@ -19,7 +19,7 @@ from pint.quantity import _Quantity
 
 from .i_property import IProperty
 from ..range import AbstractRangeValidator
-from ..unit import get_unit_registry
+from ..unit import get_unit_registry, convert, to_quantity
 
 
 class Enumerable(IProperty):
@@ -46,8 +46,9 @@ class Enumerable(IProperty):
 
     """
     def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
-                 values=()):
-        super(Enumerable, self).__init__(getter, setter, secure_comm)
+                 values=(), depends_on=()):
+        super(Enumerable, self).__init__(getter, setter, secure_comm, checks,
+                                         depends_on=depends_on)
         self.values = set(values)
         if setter and values:
             self._wrap_with_checker(self.validate_in, 'pre_set')
@@ -112,11 +113,19 @@ class RangeValidated(IProperty):
     range : RangeValidator or str
         If a RangeValidator is provided it is used as is, if a string is
         provided it is used to retrieve the range from the driver at runtime.
+    coerce : bool, optional
+        Whether values out of the range should be replaced by the closest
+        valid value (see the coerce method of the range validators) instead
+        of raising an error. As the value sent to the instrument can then
+        differ from the one passed, the set value is not cached. A range is
+        required.
 
     """
-    def __init__(self, getter=None, setter=None, secure_comm=0, check=None,
-                 range=None):
-        super(RangeValidated, self).__init__(getter, setter, secure_comm)
+    def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
+                 range=None, depends_on=(), coerce=False):
+        super(RangeValidated, self).__init__(getter, setter, secure_comm,
+                                             checks, depends_on=depends_on)
+        self.coerce = coerce
         if range:
             wrap = self._wrap_with_checker
             if isinstance(range, AbstractRangeValidator):
@@ -131,14 +140,19 @@ class RangeValidated(IProperty):
                     get_range''')
                 raise TypeError(mess)
         self.creation_kwargs['range'] = range
+        if coerce:
+            self.creation_kwargs['coerce'] = coerce
 
     def validate_range(self, obj, value):
         """Make sure a value is in the given range.
 
-        This method is meant to be used as a pre-set.
+        This method is meant to be used as a pre-set. If coerce is True an
+        invalid value is replaced by the closest valid one.
 
         """
         if not self.range.validate(value):
+            if self.coerce:
+                return self.range.coerce(value)
             mess = 'The provided value {} is out of bound for {}.'
             mess = mess.format(value, self.name)
             ran = self.range
@@ -169,13 +183,29 @@ class Int(RangeValidated, Enumerable):
 
     """
     def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
-                 values=(), range=None):
+                 values=(), range=None, depends_on=(), coerce=False):
         if values and not range:
+            if coerce:
+                raise ValueError('Only values validated by a range can be '
+                                 'coerced.')
             Enumerable.__init__(self, getter, setter, secure_comm, checks,
-                                values)
+                                values, depends_on=depends_on)
+            self.coerce = False
         else:
             super(Int, self).__init__(getter, setter, secure_comm, checks,
-                                      range)
+                                      range, depends_on=depends_on,
+                                      coerce=coerce)
+
+    def validate_range(self, obj, value):
+        """Make sure a value is in the given range.
+
+        When coercing, the value is always passed to the coerce method of the
+        range so that non-integer values are rounded.
+
+        """
+        if self.coerce:
+            return self.range.coerce(value)
+        return super(Int, self).validate_range(obj, value)
 
     def post_get(self, instance, value):
         """Cast the value returned by the instrument to an int.
@@ -187,23 +217,40 @@ class Int(RangeValidated, Enumerable):
 class Float(RangeValidated, Enumerable):
     """ Property casting the instrument answer to a float or Quantity.
 
-    Support range validation and unit conversion.
+    Support range validation and unit conversion. The conversion factors
+    between units are cached (see eapii.core.unit.get_conversion).
+
+    Parameters
+    ----------
+    unit : unicode, optional
+        Unit in which the instrument expects and returns the values.
+    quantity : bool, optional
+        Whether to return the values as Quantities when a unit is declared.
+        Passing False returns floats expressed in unit which is cheaper in
+        tight loops. Quantities are accepted when setting in both cases.
 
     """
     def __init__(self, getter=None, setter=None, secure_comm=0, checks=None,
-                 values=(), range=None, unit=None):
+                 values=(), range=None, unit=None, depends_on=(),
+                 coerce=False, quantity=True):
         if values and not range:
+            if coerce:
+                raise ValueError('Only values validated by a range can be '
+                                 'coerced.')
             Enumerable.__init__(self, getter, setter, secure_comm, checks,
-                                values)
+                                values, depends_on=depends_on)
+            self.coerce = False
         else:
             super(Float, self).__init__(getter, setter, secure_comm, checks,
-                                        range)
+                                        range, depends_on=depends_on,
+                                        coerce=coerce)
 
         if unit:
             ureg = get_unit_registry()
             self.unit = ureg.parse_expression(unit)
         else:
             self.unit = None
+        self.quantity = quantity
 
         if range or values:
             self._validate = self.pre_set
@@ -212,20 +259,21 @@ class Float(RangeValidated, Enumerable):
                 self.pre_set = self.convert_and_validate
             else:
                 self.pre_set = self.validate
-        else:
-            if unit:
-                self.pre_set = self.convert
+        elif unit:
+            self._wrap_with_checker(self.convert, 'pre_set')
 
         self.creation_kwargs.update({'unit': unit, 'values': values,
                                      'range': range})
+        if not quantity:
+            self.creation_kwargs['quantity'] = quantity
 
     def post_get(self, instance, value):
         """Cast the value returned by the instrument to float or Quantity.
 
         """
         fval = float(value)
-        if self.unit:
-            return fval*self.unit
+        if self.unit and self.quantity:
+            return to_quantity(fval, self.unit)
 
         else:
             return fval
@@ -239,12 +287,11 @@ class Float(RangeValidated, Enumerable):
 
         """
         if isinstance(value, _Quantity):
-            value = value.to(self.unit)
-            self._validate(instance, value)
-            value = value.magnitude
+            value = convert(value, self.unit)
 
-        else:
-            self._validate(instance, value*self.unit)
+        checked = self._validate(instance, to_quantity(value, self.unit))
+        if self.coerce:
+            value = convert(checked, self.unit)
 
         return value
 
@@ -256,7 +303,7 @@ class Float(RangeValidated, Enumerable):
 
         """
         if isinstance(value, _Quantity):
-            value = value.to(self.unit).magnitude
+            value = convert(value, self.unit)
 
         return value
 
@@ -267,7 +314,7 @@ class Float(RangeValidated, Enumerable):
         overriding pre_set it should be used when only range is present.
 
         """
-        self._validate(instance, value)
+        value = self._validate(instance, value)
         if isinstance(value, _Quantity):
             value = value.magnitude
 
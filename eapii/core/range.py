@@ -12,11 +12,11 @@
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
 from types import MethodType
-from math import modf
+from math import modf, log10, ceil, floor
 from functools import update_wrapper
 from pint.quantity import _Quantity
 
-from .unit import get_unit_registry
+from .unit import get_unit_registry, convert
 
 
 class AbstractRangeValidator(object):
@@ -35,10 +35,132 @@ class AbstractRangeValidator(object):
     -------
     validate :
         Validate a given value against the range.
+    validate_array :
+        Validate all the values of an array at once.
+    coerce :
+        Get the closest valid value.
+    coerce_array :
+        Get the closest valid values for all the values of an array.
 
     """
     __slots__ = ('minimum', 'maximum', 'step', 'validate')
 
+    def validate_array(self, values, first_invalid=False):
+        """Validate an array of values against the range.
+
+        The validation is vectorised using NumPy which must be installed.
+
+        Parameters
+        ----------
+        values : array-like
+            Values to validate.
+        first_invalid : bool, optional
+            Return the index of the first invalid value instead of the mask.
+
+        Returns
+        -------
+        valid : numpy.ndarray or int or None
+            Boolean mask of the valid values or, if first_invalid is True,
+            index (in the flattened array) of the first invalid value and
+            None if all the values are valid.
+
+        """
+        import numpy as np
+
+        values = np.asarray(self._array_magnitude(values))
+        valid = np.ones(values.shape, dtype=bool)
+        if self.minimum is not None:
+            valid &= values >= self.minimum
+        if self.maximum is not None:
+            valid &= values <= self.maximum
+        if self.step:
+            valid &= self._array_on_step(np, values)
+
+        if first_invalid:
+            invalid = np.flatnonzero(~valid)
+            return int(invalid[0]) if len(invalid) else None
+        return valid
+
+    def coerce(self, value):
+        """Get the valid value closest to the given one.
+
+        The value is clamped to the bounds and then rounded to the closest
+        multiple of the step (counted from the minimum if it exists, from the
+        maximum otherwise) which is within the bounds. Ties are rounded
+        upwards.
+
+        """
+        value = self._clamp(value)
+        if self.step:
+            ref = self.minimum if self.minimum is not None else self.maximum
+            n = floor((value - ref)/self.step + 0.5)
+            value = self._snap(ref + n*self.step)
+            if self.maximum is not None and value > self.maximum:
+                value = self._snap(value - self.step)
+            elif self.minimum is not None and value < self.minimum:
+                value = self._snap(value + self.step)
+        return value
+
+    def coerce_array(self, values):
+        """Get the valid values closest to the values of an array.
+
+        This is the vectorised equivalent of coerce, it requires NumPy.
+
+        """
+        import numpy as np
+
+        values = np.asarray(self._array_magnitude(values))
+        if self.minimum is not None:
+            values = np.maximum(values, self.minimum)
+        if self.maximum is not None:
+            values = np.minimum(values, self.maximum)
+        if self.step:
+            ref = self.minimum if self.minimum is not None else self.maximum
+            n = np.floor((values - ref)/self.step + 0.5)
+            values = ref + n*self.step
+            if self.maximum is not None:
+                values = np.where(values > self.maximum, values - self.step,
+                                  values)
+            if self.minimum is not None:
+                values = np.where(values < self.minimum, values + self.step,
+                                  values)
+            values = self._snap_array(np, values)
+        return values
+
+    def _clamp(self, value):
+        """Clamp a value to the bounds.
+
+        """
+        if self.minimum is not None and value < self.minimum:
+            return self.minimum
+        if self.maximum is not None and value > self.maximum:
+            return self.maximum
+        return value
+
+    def _snap(self, value):
+        """Get rid of the rounding errors on a value computed from the step.
+
+        """
+        return value
+
+    def _snap_array(self, np, values):
+        """Vectorised version of _snap.
+
+        """
+        return values
+
+    def _array_magnitude(self, values):
+        """Get the values to validate from the array passed by the user.
+
+        """
+        return values
+
+    def _array_on_step(self, np, values):
+        """Check which values of an array respect the step.
+
+        """
+        raise NotImplementedError()
+
 
 class IntRangeValidator(AbstractRangeValidator):
     """Range used to validate a the value of an integer.
@@ -94,6 +216,41 @@ class IntRangeValidator(AbstractRangeValidator):
             else:
                 self.validate = self._validate_smaller
 
+    def coerce(self, value):
+        """Get the valid integer closest to the given value.
+
+        """
+        return self._snap(AbstractRangeValidator.coerce(self, value))
+
+    def coerce_array(self, values):
+        """Get the valid integers closest to the values of an array.
+
+        This is the vectorised equivalent of coerce, it requires NumPy.
+
+        """
+        import numpy as np
+        coerced = AbstractRangeValidator.coerce_array(self, values)
+        return self._snap_array(np, coerced)
+
+    def _snap(self, value):
+        """Round a value to the closest int (ties are rounded upwards).
+
+        """
+        return int(floor(value + 0.5))
+
+    def _snap_array(self, np, values):
+        """Vectorised version of _snap.
+
+        """
+        return np.floor(values + 0.5).astype(int)
+
+    def _array_on_step(self, np, values):
+        """Check which values of an array respect the step.
+
+        """
+        ref = self.minimum if self.minimum is not None else self.maximum
+        return (values - ref) % self.step == 0
+
     def _validate_smaller(self, value):
         """Check if the value is smaller than the maximum.
 
@@ -212,12 +369,72 @@ class FloatRangeValidator(AbstractRangeValidator):
                 return cmp_func(self, value)
 
             else:
-                return cmp_func(self, value.to(self.unit).magnitude)
+                return cmp_func(self, convert(value, self.unit))
 
         update_wrapper(wrapper, cmp_func)
         wrapper.__doc__ += '\nAutomatic handling of unit conversions'
         return MethodType(wrapper, self)
 
+    def coerce(self, value):
+        """Get the valid value closest to the given one.
+
+        If a unit is declared and a Quantity is passed, a Quantity expressed
+        in the unit of the validator is returned.
+
+        """
+        if isinstance(value, _Quantity) and hasattr(self, 'unit'):
+            mag = convert(value, self.unit)
+            return AbstractRangeValidator.coerce(self, mag)*self.unit
+        return AbstractRangeValidator.coerce(self, value)
+
+    def coerce_array(self, values):
+        """Get the valid values closest to the values of an array.
+
+        This is the vectorised equivalent of coerce, it requires NumPy. If a
+        unit is declared and a Quantity is passed, a Quantity is returned.
+
+        """
+        coerced = AbstractRangeValidator.coerce_array(self, values)
+        if isinstance(values, _Quantity) and hasattr(self, 'unit'):
+            return coerced*self.unit
+        return coerced
+
+    def _snap(self, value):
+        """Round a value computed from the step to the precision of the step.
+
+        """
+        return round(value, self._step_digits())
+
+    def _snap_array(self, np, values):
+        """Vectorised version of _snap.
+
+        """
+        return np.round(values, self._step_digits())
+
+    def _step_digits(self):
+        """Number of decimals to keep when rounding a value on the step grid.
+
+        """
+        return max(0, int(ceil(-log10(self.step)))) + 6
+
+    def _array_magnitude(self, values):
+        """Convert a Quantity array to the unit of the validator at once.
+
+        """
+        if isinstance(values, _Quantity) and hasattr(self, 'unit'):
+            return convert(values, self.unit)
+        return values
+
+    def _array_on_step(self, np, values):
+        """Check which values of an array respect the step.
+
+        The same tolerance as for scalar values is used.
+
+        """
+        ref = self.minimum if self.minimum is not None else self.maximum
+        ratio = np.round(np.abs((values - ref)/self.step), 9)
+        return np.abs(np.modf(ratio)[0]) < 1e-9
+
     def _validate_smaller(self, value):
         """Check if the value is smaller than the maximum.
 
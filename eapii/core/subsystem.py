@@ -11,11 +11,53 @@
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
+from weakref import WeakKeyDictionary
 from future.utils import with_metaclass
 
 from .has_i_props import HasIPropsMeta, HasIProps, AbstractSubSystem
 
 
+#: Methods through which subsystems forward the calls to their parent.
+_FORWARDED = ('reopen_connection', 'default_get_iproperty',
+              'default_get_iproperties', 'default_set_iproperty',
+              'default_get_array', 'default_set_array',
+              'default_check_instr_operation')
+
+#: Whether the instances of a subsystem class forward all calls unchanged.
+_TRANSPARENT = WeakKeyDictionary()
+
+
+def _is_transparent(cls):
+    """Check whether a subsystem class uses the stock forwarding methods.
+
+    """
+    try:
+        return _TRANSPARENT[cls]
+    except KeyError:
+        pass
+    stock = SubSystem.__dict__
+    transparent = all(getattr(getattr(cls, n), '__func__', getattr(cls, n))
+                      is getattr(stock[n], '__func__', stock[n])
+                      for n in _FORWARDED)
+    _TRANSPARENT[cls] = transparent
+    return transparent
+
+
+class _ParentLock(object):
+    """Descriptor giving access to the lock of the parent of a subsystem.
+
+    The lock is resolved on first access (the root driver generally creates
+    its lock after its subsystems) and then stored on the instance so that
+    later accesses are simple attribute lookups.
+
+    """
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        lock = obj.__dict__['lock'] = obj.parent.lock
+        return lock
+
+
 class DeclarationMeta(HasIPropsMeta):
     """Metaclass used to avoid creating an instance in classes declaration.
 
@@ -37,43 +79,97 @@ class SubSystem(with_metaclass(DeclarationMeta, HasIProps)):
     This mechanism allow to avoid crowding the instrument namespace with very
     long IProperty names, for example.
 
+    The calls to the driver are not piped through each level of the
+    hierarchy : when building a subsystem, the first ancestor customizing the
+    forwarding methods (generally the root driver) is looked up along with
+    the keyword arguments the intermediate channels add to the calls, and the
+    calls are then directly sent to this ancestor.
+
     Attributes
     ----------
     parent : HasIProps
         Parent object of the subsystem.
+    root : HasIProps
+        Driver to which the subsystem belongs.
 
     """
+    lock = _ParentLock()
+
     def __init__(self, parent, **kwargs):
-        super(SubSystem, self).__init__(**kwargs)
+        # The parent must be known when initializing the caches.
         self.parent = parent
+        self.root = parent.root if isinstance(parent, SubSystem) else parent
+
+        # The routing must be known before creating the nested subsystems.
+        route = self._own_route()
+        if isinstance(parent, SubSystem) and _is_transparent(type(parent)):
+            self._target = parent._target
+            route.update(parent._route)
+        else:
+            self._target = parent
+        self._route = route
 
-    @property
-    def lock(self):
-        """Access to parent lock."""
-        return self.parent.lock
+        super(SubSystem, self).__init__(**kwargs)
 
     def reopen_connection(self):
         """Subsystems simply pipes the call to their parent.
 
         """
-        self.parent.reopen_connection()
+        self._target.reopen_connection()
 
     def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
         """Subsystems simply pipes the call to their parent.
 
         """
-        return self.parent.default_get_iproperty(iprop, cmd, *args, **kwargs)
+        if self._route:
+            kwargs.update(self._route)
+        return self._target.default_get_iproperty(iprop, cmd, *args, **kwargs)
+
+    def default_get_iproperties(self, iprops, cmds, *args, **kwargs):
+        """Subsystems simply pipes the call to their parent.
+
+        """
+        if self._route:
+            kwargs.update(self._route)
+        return self._target.default_get_iproperties(iprops, cmds, *args,
+                                                    **kwargs)
 
     def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
         """Subsystems simply pipes the call to their parent.
 
         """
-        return self.parent.default_set_iproperty(iprop, cmd, *args, **kwargs)
+        if self._route:
+            kwargs.update(self._route)
+        return self._target.default_set_iproperty(iprop, cmd, *args, **kwargs)
+
+    def default_get_array(self, iprop, cmd, *args, **kwargs):
+        """Subsystems simply pipes the call to their parent.
+
+        """
+        if self._route:
+            kwargs.update(self._route)
+        return self._target.default_get_array(iprop, cmd, *args, **kwargs)
+
+    def default_set_array(self, iprop, cmd, values, *args, **kwargs):
+        """Subsystems simply pipes the call to their parent.
+
+        """
+        if self._route:
+            kwargs.update(self._route)
+        return self._target.default_set_array(iprop, cmd, values, *args,
+                                              **kwargs)
 
     def default_check_instr_operation(self, iprop, value, i_value):
         """Subsystems simply pipes the call to their parent.
 
         """
-        return self.parent.default_check_instr_operation(iprop, value, i_value)
+        return self._target.default_check_instr_operation(iprop, value,
+                                                          i_value)
+
+    def _own_route(self):
+        """Keyword arguments this object adds to the calls to its parent.
+
+        """
+        return {}
 
 AbstractSubSystem.register(SubSystem)
@@ -63,3 +63,66 @@ def get_unit_registry():
         UNIT_REGISTRY = UnitRegistry()
 
     return UNIT_REGISTRY
+
+
+#: Conversion factors and offsets indexed by source and target units.
+_CONVERSIONS = {}
+
+
+def get_conversion(from_units, to_units):
+    """Get the factor and offset converting values between two units.
+
+    Converting with pint is costly, as the factors only depend on the units
+    they are computed once and cached.
+
+    Parameters
+    ----------
+    from_units : Quantity or Unit
+        Units in which the values are expressed.
+    to_units : Quantity or Unit
+        Units to which the values should be converted. Only the units of
+        Quantities are considered not their magnitude.
+
+    Returns
+    -------
+    factor : float
+        Factor by which to multiply the magnitude.
+    offset : float
+        Offset to add to the result (non-zero only for units such as degC).
+
+    """
+    key = (from_units._units, to_units._units)
+    try:
+        return _CONVERSIONS[key]
+    except KeyError:
+        pass
+
+    q = from_units._REGISTRY.Quantity
+    offset = q(0.0, key[0]).to(key[1]).magnitude
+    factor = q(1.0, key[0]).to(key[1]).magnitude - offset
+    _CONVERSIONS[key] = (factor, offset)
+    return factor, offset
+
+
+def convert(quantity, units):
+    """Get the magnitude of a Quantity expressed in the given units.
+
+    This is equivalent to quantity.to(units).magnitude but uses the cached
+    conversion factors. Arrays are supported.
+
+    """
+    if quantity._units == units._units:
+        return quantity.magnitude
+    factor, offset = get_conversion(quantity, units)
+    if offset:
+        return quantity.magnitude*factor + offset
+    return quantity.magnitude*factor
+
+
+def to_quantity(magnitude, units):
+    """Build a Quantity from a magnitude expressed in the given units.
+
+    This is cheaper than multiplying the magnitude by the units.
+
+    """
+    return units._REGISTRY.Quantity(magnitude, units._units)
@@ -14,6 +14,11 @@ from __future__ import (division, unicode_literals, print_function,
 from functools import wraps
 import logging
 
+try:
+    from time import monotonic
+except ImportError:  # Python 2
+    from time import time as monotonic
+
 
 def secure_communication(max_iter=3):
     """Decorator making sure that a communication error cannot simply be
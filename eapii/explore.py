@@ -9,17 +9,28 @@
 """Utility functions to collect the defined driver types and driver.
 
 Drivers and driver types are looked for in all modules presents in clib and
-visa. Drivers should be declared in a module variable DRIVERS and driver types
-in one named DRIVER_TYPES. Both should be dictionary of name: class. Driver
-types are generic driver not meant to be instantiated but describing a
-communication protocole.
+visa, and in the modules registered by third party packages under the
+'eapii.drivers' entry point group. Drivers should be declared in a module
+variable DRIVERS and driver types in one named DRIVER_TYPES. Both should be
+dictionary of name: class. Driver types are generic driver not meant to be
+instantiated but describing a communication protocole.
+
+To avoid importing every module each time a driver is requested, the result
+of the exploration is stored in an on-disk index. A module is imported again
+to update the index only if its modification time changed, and getting a
+driver only imports the module in which it is defined.
 
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
 import os
+import io
+import sys
+import json
+import hashlib
 import logging
 from importlib import import_module
+from future.utils import raise_from
 
 
 def list_drivers(filters=None, force=False):
@@ -29,20 +40,29 @@ def list_drivers(filters=None, force=False):
     ----------
     filters : list(callable), optional
         Filter functions receiving the dict of all known drivers and which
-        should remove in place some entries.
+        should remove in place some entries. Using filters requires to import
+        all the drivers.
 
     force : bool, optional
         Flag indicating whether or not all packages should be explored again.
 
     """
-    if force or not _DRIVERS:
+    if force:
         _refresh_drivers()
 
-    d = _DRIVERS.copy()
-    if filters:
-        for f in filters:
-            f(d)
-    return d.keys()
+    names = list(_get_index()['drivers'])
+    if not filters:
+        return names
+
+    d = {}
+    for name in names:
+        try:
+            d[name] = get_driver(name)
+        except Exception:
+            continue
+    for f in filters:
+        f(d)
+    return list(d.keys())
 
 
 def list_driver_types(force=False):
@@ -54,16 +74,17 @@ def list_driver_types(force=False):
         Flag indicating whether or not all packages should be explored again.
 
     """
-    if force or not _DRIVER_TYPES:
+    if force:
         _refresh_drivers()
 
-    d = _DRIVER_TYPES.copy()
-    return d.keys()
+    return list(_get_index()['driver_types'])
 
 
 def get_driver(name):
     """Retrieve a driver using its name.
 
+    Only the module in which the driver is defined is imported.
+
     Parameters
     ----------
     name : unicode
@@ -79,8 +100,9 @@ def get_driver(name):
     KeyError : if the name is not present in the list of drivers.
 
     """
-    if not _DRIVERS:
-        _refresh_drivers()
+    if name not in _DRIVERS:
+        infos = _get_index()['drivers'][name]
+        _DRIVERS[name] = _load(infos['module'], 'DRIVERS', name)
 
     return _DRIVERS[name]
 
@@ -103,12 +125,40 @@ def get_driver_type(name):
     KeyError : if the name is not present in the list of driver types.
 
     """
-    if not _DRIVER_TYPES:
-        _refresh_drivers()
+    if name not in _DRIVER_TYPES:
+        infos = _get_index()['driver_types'][name]
+        _DRIVER_TYPES[name] = _load(infos['module'], 'DRIVER_TYPES', name)
 
     return _DRIVER_TYPES[name]
 
 
+def get_driver_infos(name):
+    """Access the informations stored in the index about a driver without
+    importing it.
+
+    Parameters
+    ----------
+    name : unicode
+        Name of the driver.
+
+    Returns
+    -------
+    infos : dict
+        Dictionary containing the following keys :
+            - module : name of the module in which the driver is defined.
+            - protocols : protocols supported by the driver (see the
+                          protocols attribute of the driver classes).
+            - driver_type : name of the driver type from which the driver
+                            derives or None.
+
+    Raises
+    ------
+    KeyError : if the name is not present in the list of drivers.
+
+    """
+    return _get_index()['drivers'][name].copy()
+
+
 def loading_errors():
     """Access the errors that occured when collecting the drivers.
 
@@ -140,69 +190,340 @@ _ISSUES = {}
 
 _TOPLEVELS = ('visa', 'clib')
 
+#: Entry point group under which third party packages can register the
+#: modules defining their drivers.
+ENTRY_POINT_GROUP = 'eapii.drivers'
+
+#: Version of the index format, an index with a different version is
+#: rebuilt from scratch.
+INDEX_VERSION = 1
+
+
+def _cache_directory():
+    """Directory of the user in which to store the index.
+
+    The EAPII_CACHE_DIR environment variable can be used to override the
+    default platform specific location.
+
+    """
+    path = os.environ.get('EAPII_CACHE_DIR')
+    if path:
+        return path
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'eapii', 'Cache')
+    if sys.platform == 'darwin':
+        return os.path.join(os.path.expanduser('~'), 'Library', 'Caches',
+                            'eapii')
+    base = (os.environ.get('XDG_CACHE_HOME') or
+            os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'eapii')
+
+
+#: Path of the on-disk index. The installation directory is usually read-only
+#: so the index lives in the cache directory of the user, under a name
+#: specific to this installation.
+_INDEX_PATH = os.path.join(
+    _cache_directory(), 'driver_index_{}.json'.format(
+        hashlib.md5(os.path.abspath(_PACKAGE_PATH).encode('utf-8'))
+        .hexdigest()[:12]))
+
+#: In memory version of the index (None if not yet loaded).
+_INDEX = None
+
+
+def _get_index():
+    """Access the index, loading and updating it if necessary.
+
+    """
+    if _INDEX is None:
+        _update_index()
+
+    return _INDEX
+
 
 def _refresh_drivers():
     """ Refresh the known driver types and drivers.
 
+    All modules are explored again and the index rebuilt.
+
+    """
+    _DRIVERS.clear()
+    _DRIVER_TYPES.clear()
+    _update_index(force=True)
+
+
+def _update_index(force=False):
+    """Update the index of the drivers.
+
+    The modules whose modification time did not change since the index was
+    generated are not imported.
+
+    Parameters
+    ----------
+    force : bool, optional
+        Whether to ignore the existing index and to explore all the modules.
+
     """
     failed = {}
-    driver_types = {}
+    modules = _list_modules(failed)
+
+    old = {} if force else _read_index()
+    entries = {}
+    for mod, path in modules.items():
+        mtime = _mtime(path)
+        entry = old.get(mod)
+        if entry is None or mtime is None or entry['mtime'] != mtime:
+            entry = _index_module(mod, failed)
+            if entry is None:
+                continue
+            entry['mtime'] = mtime
+        entries[mod] = entry
+
+    if entries != old:
+        _write_index(entries)
+
+    global _INDEX, _ISSUES
+    _INDEX = _build_lookup(entries)
+    _ISSUES = failed
+
+
+def _list_modules(failed):
+    """List the modules which can define drivers.
+
+    Parameters
+    ----------
+    failed : dict
+        A dict in which issues will be stored.
+
+    Returns
+    -------
+    modules : dict
+        Mapping between the absolute names of the modules and their path.
+
+    """
+    modules = {}
     driver_packages = list(_TOPLEVELS)
-    drivers = {}
 
     # Explore packages
     while driver_packages:
         pack = driver_packages.pop(0)
         pack_path = os.path.join(_PACKAGE_PATH, *pack.split('.'))
 
-        modules, packs = _explore_package(pack, pack_path, failed)
+        mods, packs = _explore_package(pack, pack_path, failed)
         driver_packages.extend(packs)
+        for mod in mods:
+            path = os.path.join(_PACKAGE_PATH, *mod.split('.')) + '.py'
+            modules[_MODULE_ANCHOR + '.' + mod] = path
 
-        _explore_modules_for_drivers(modules, driver_types,
-                                     drivers, failed, prefix=pack)
+    for mod in _entry_point_modules(failed):
+        modules[mod] = _module_path(mod)
 
-    global _DRIVERS, _DRIVER_TYPES, _ISSUES
-    _DRIVERS = drivers
-    _DRIVER_TYPES = driver_types
-    _ISSUES = failed
+    return modules
 
 
-def _explore_modules_for_drivers(modules, types, drivers, failed, prefix):
-    """ Explore a list of modules.
+def _entry_point_modules(failed):
+    """List the modules registered through the entry point mechanism.
 
     Parameters
     ----------
-    modules : list
-        The list of modules to explore
+    failed : dict
+        A dict in which issues will be stored.
+
+    """
+    modules = []
+    for name, module, attrs in _iter_entry_points(ENTRY_POINT_GROUP):
+        if attrs:
+            mess = 'Entry point {} should refer to a module, not to {}.'
+            failed[name] = mess.format(name, attrs)
+            logging.getLogger(__name__).error(failed[name])
+            continue
+        modules.append(module)
+
+    return modules
 
-    types : dict
-        A dict in which discovered types will be stored.
 
-    packages : list
-        A list in which discovered packages will be stored.
+def _iter_entry_points(group):
+    """Iterate over the entry points registered under a group.
 
-    drivers : dict
-        A dict in which discovered drivers will be stored.
+    importlib.metadata is used when available as importing pkg_resources is
+    slow.
 
-    failed : list
-        A list in which failed imports will be stored.
+    Returns
+    -------
+    entry_points : iterator
+        Name, module and attributes (as a dotted string, empty when the entry
+        point refers to a module) of each entry point.
 
     """
-    for mod in modules:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
         try:
-            m = import_module('.' + mod, _MODULE_ANCHOR)
-        except Exception as e:
-            log = logging.getLogger(__name__)
-            mess = 'Failed to import mod {} : {}'.format(mod, e)
-            log.error(mess)
-            failed[mod] = mess
-            continue
+            from pkg_resources import iter_entry_points
+        except ImportError:
+            return
+        for ep in iter_entry_points(group):
+            yield ep.name, ep.module_name, '.'.join(ep.attrs)
+        return
+
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        eps = eps.select(group=group)
+    else:
+        eps = eps.get(group, [])
+    for ep in eps:
+        # Values have the form module:attrs [extras].
+        module, _, attrs = ep.value.split('[')[0].partition(':')
+        yield ep.name, module.strip(), attrs.strip()
+
+
+def _module_path(mod):
+    """Find the file of a module without importing it if possible.
+
+    """
+    try:
+        from pkgutil import get_loader
+        loader = get_loader(mod)
+        return loader.get_filename(mod)
+    except Exception:
+        return None
+
+
+def _mtime(path):
+    """Get the modification time of a file or None if it cannot be accessed.
+
+    """
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None
+
+
+def _index_module(mod, failed):
+    """Import a module and collect the informations about its drivers.
+
+    Parameters
+    ----------
+    mod : unicode
+        Absolute name of the module.
+    failed : dict
+        A dict in which failed imports will be stored.
+
+    Returns
+    -------
+    entry : dict or None
+        Informations about the drivers and driver types declared in the
+        module. None if the module cannot be imported.
+
+    """
+    try:
+        m = import_module(mod)
+    except Exception as e:
+        log = logging.getLogger(__name__)
+        mess = 'Failed to import mod {} : {}'.format(mod, e)
+        log.error(mess)
+        failed[mod] = mess
+        return None
+
+    entry = {'drivers': {}, 'driver_types': {}}
+    for name, cls in getattr(m, 'DRIVER_TYPES', {}).items():
+        _DRIVER_TYPES[name] = cls
+        entry['driver_types'][name] = _qualified_name(cls)
+
+    for name, cls in getattr(m, 'DRIVERS', {}).items():
+        _DRIVERS[name] = cls
+        protocols = getattr(cls, 'protocols', {})
+        entry['drivers'][name] = {'protocols': dict(protocols),
+                                  'mro': [_qualified_name(c)
+                                          for c in cls.__mro__[1:]]}
+
+    return entry
+
 
-        if hasattr(m, 'DRIVER_TYPES'):
-            types.update(m.DRIVER_TYPES)
+def _qualified_name(cls):
+    """Name of a class including the module.
 
-        if hasattr(m, 'DRIVERS'):
-            drivers.update(m.DRIVERS)
+    """
+    return cls.__module__ + '.' + cls.__name__
+
+
+def _build_lookup(entries):
+    """Build the name based lookup tables from the index entries.
+
+    """
+    types = {}
+    qualified_types = {}
+    for mod, entry in entries.items():
+        for name, qualname in entry['driver_types'].items():
+            types[name] = {'module': mod}
+            qualified_types[qualname] = name
+
+    drivers = {}
+    for mod, entry in entries.items():
+        for name, infos in entry['drivers'].items():
+            d_type = next((qualified_types[c] for c in infos['mro']
+                           if c in qualified_types), None)
+            drivers[name] = {'module': mod, 'protocols': infos['protocols'],
+                             'driver_type': d_type}
+
+    return {'drivers': drivers, 'driver_types': types}
+
+
+def _read_index():
+    """Read the index from the disk.
+
+    Returns
+    -------
+    entries : dict
+        Informations about the modules, empty if the index does not exist or
+        is outdated.
+
+    """
+    try:
+        with io.open(_INDEX_PATH, encoding='utf-8') as f:
+            index = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+
+    if index.get('version') != INDEX_VERSION:
+        return {}
+
+    return index['modules']
+
+
+def _write_index(entries):
+    """Write the index to the disk.
+
+    Failing to write the index is not an error as it is only meant to speed
+    up the next explorations.
+
+    """
+    index = {'version': INDEX_VERSION, 'modules': entries}
+    try:
+        content = json.dumps(index, indent=1, sort_keys=True)
+        directory = os.path.dirname(_INDEX_PATH)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with io.open(_INDEX_PATH, 'w', encoding='utf-8') as f:
+            f.write(type('')(content))
+    except (IOError, OSError, TypeError, ValueError) as e:
+        log = logging.getLogger(__name__)
+        log.warning('Failed to write the drivers index {} : {}'.format(
+            _INDEX_PATH, e))
+
+
+def _load(mod, attr, name):
+    """Import a module and access a driver (type) in it.
+
+    """
+    try:
+        return getattr(import_module(mod), attr)[name]
+    except Exception as e:
+        mess = 'Failed to import mod {} : {}'.format(mod, e)
+        _ISSUES[mod] = mess
+        logging.getLogger(__name__).exception(mess)
+        raise_from(KeyError(name), e)
 
 
 def _explore_package(pack, pack_path, failed):
@@ -224,6 +545,9 @@ def _explore_package(pack, pack_path, failed):
     modules : list
         List of string indicating modules which can be imported
 
+    packs : list
+        List of string indicating sub-packages to explore
+
     """
     if not os.path.isdir(pack_path):
         log = logging.getLogger(__name__)
@@ -231,7 +555,7 @@ def _explore_package(pack, pack_path, failed):
                                                          pack_path)
         log.error(mess)
         failed[pack] = mess
-        return []
+        return [], []
 
     i = len('.py')
     modules = sorted(pack + '.' + m[:-i] for m in os.listdir(pack_path)
@@ -239,7 +563,8 @@ def _explore_package(pack, pack_path, failed):
                          and m.endswith('.py')))
 
     packs = sorted(pack + '.' + p for p in os.listdir(pack_path)
-                   if os.path.isdir(os.path.join(pack_path, p)))
+                   if os.path.isdir(os.path.join(pack_path, p))
+                   and p != '__pycache__')
 
     try:
         modules.remove(pack + '.__init__')
@@ -248,6 +573,6 @@ def _explore_package(pack, pack_path, failed):
         mess = '{} is not a valid Python package (miss __init__.py).'
         log.error(mess.format(pack))
         failed[pack] = mess
-        return []
+        return [], []
 
     return modules, packs
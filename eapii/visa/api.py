@@ -12,7 +12,8 @@
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
 
-from .visa import get_visa_resource_manager, set_visa_resource_manager
+from .visa import (get_visa_resource_manager, set_visa_resource_manager,
+                   get_backend_resource_manager, SIMULATION_BACKEND)
 from .visa_instrs import (BaseVisaInstrument, VisaMessageInstrument,
                           VisaRegisterInstrument)
 from .standards import IEC60488
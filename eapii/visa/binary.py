@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Helpers for IEEE 488.2 definite length arbitrary blocks.
+
+A block is made of a '#' followed by a digit giving the number of digits of
+the length, the length in bytes and finally the data (ex: #210<10 bytes>).
+The indefinite form (#0<data> terminated by a newline) is also supported when
+reading.
+
+Large blocks can be streamed using a BufferPool holding a bounded number of
+reusable buffers.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from threading import Lock
+from future.moves.queue import Queue, Empty
+
+from ..core.errors import InstrIOError
+
+
+def parse_block_header(data):
+    """Locate the data of a binary block.
+
+    Parameters
+    ----------
+    data : bytes or bytearray or memoryview
+        Beginning of the instrument answer. Any character preceding the '#'
+        is skipped.
+
+    Returns
+    -------
+    offset : int
+        Index of the first byte of data.
+    length : int or None
+        Number of bytes of data, None for indefinite length blocks.
+
+    Raises
+    ------
+    InstrIOError :
+        Raised if the data do not start with a valid block header.
+
+    """
+    data = bytes(bytearray(data[:64]))
+    start = data.find(b'#')
+    if start < 0 or len(data) < start + 2:
+        raise InstrIOError('No binary block header in {!r}'.format(data))
+
+    digits = data[start+1:start+2]
+    if not digits.isdigit():
+        raise InstrIOError('Invalid binary block header {!r}'.format(data))
+    n = int(digits)
+    if n == 0:
+        return start + 2, None
+
+    length = data[start+2:start+2+n]
+    if len(length) != n or not length.isdigit():
+        raise InstrIOError('Invalid binary block header {!r}'.format(data))
+    return start + 2 + n, int(length)
+
+
+def block_header(length):
+    """Build the header of a definite length block.
+
+    Parameters
+    ----------
+    length : int
+        Number of bytes of data in the block.
+
+    Returns
+    -------
+    header : bytes
+        Header to prepend to the data.
+
+    """
+    size = str(length)
+    return '#{}{}'.format(len(size), size).encode('ascii')
+
+
+class BufferPool(object):
+    """Bounded pool of reusable buffers used to stream binary blocks.
+
+    Acquiring a buffer blocks while all the buffers are in use. When the
+    consumer of a stream does not release the chunks it received fast enough
+    the reading of the instrument is hence suspended, which bounds the memory
+    used whatever the size of the block.
+
+    Parameters
+    ----------
+    count : int
+        Number of buffers in the pool.
+    size : int
+        Size in bytes of each buffer.
+
+    """
+    def __init__(self, count, size):
+        if count < 1 or size < 1:
+            raise ValueError('A pool needs at least one non-empty buffer.')
+        self.count = count
+        self.size = size
+        self._buffers = [bytearray(size) for _ in range(count)]
+        self._free = Queue()
+        for buf in self._buffers:
+            self._free.put(buf)
+        self._views = {}
+        self._in_use = set()
+        self._lock = Lock()
+
+    def acquire(self, timeout=None):
+        """Get a free buffer, waiting for one to be released if necessary.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait in seconds. By default wait forever.
+
+        Raises
+        ------
+        RuntimeError :
+            Raised if no buffer was released before the timeout expired.
+
+        """
+        try:
+            buf = self._free.get(timeout=timeout)
+        except Empty:
+            raise RuntimeError('No buffer was released in time.')
+        with self._lock:
+            self._in_use.add(id(buf))
+        return buf
+
+    def release(self, buffer):
+        """Give a buffer back to the pool.
+
+        Parameters
+        ----------
+        buffer : bytearray or view
+            Buffer returned by acquire or view created by the view method.
+
+        Raises
+        ------
+        ValueError :
+            Raised if the buffer does not belong to the pool or was already
+            released.
+
+        """
+        with self._lock:
+            entry = self._views.pop(id(buffer), None)
+            if entry is not None:
+                buffer = entry[1]
+            if not any(buffer is b for b in self._buffers):
+                raise ValueError('The buffer does not belong to this pool.')
+            if id(buffer) not in self._in_use:
+                raise ValueError('The buffer was already released.')
+            self._in_use.remove(id(buffer))
+        self._free.put(buffer)
+
+    def view(self, buffer, size, dtype=None):
+        """Create a view on the beginning of a buffer of the pool.
+
+        The view can be passed to release in place of the buffer.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            Buffer of the pool.
+        size : int
+            Number of bytes to include in the view.
+        dtype : numpy.dtype, optional
+            Type of the values stored in the buffer. If specified a NumPy array
+            is returned, otherwise a memoryview.
+
+        """
+        if dtype is None:
+            view = memoryview(buffer)[:size]
+        else:
+            from numpy import frombuffer
+            view = frombuffer(buffer, dtype, size//dtype.itemsize)
+        with self._lock:
+            self._views[id(view)] = (view, buffer)
+        return view
@@ -0,0 +1,728 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Simulated VISA backend allowing to use the drivers without hardware.
+
+The SimulatedResourceManager can be used in place of a pyvisa ResourceManager
+either by passing it to set_visa_resource_manager, or by specifying the
+simulation backend in the connection infos of a driver::
+
+    >>> rm = get_backend_resource_manager(SIMULATION_BACKEND)
+    >>> rm.add_instrument('GPIB::2::INSTR', SimulatedGS200(latency=1e-3))
+    >>> YokogawaGS200({'type': 'GPIB', 'address': '2',
+    ...                'backend': SIMULATION_BACKEND})
+
+Simulated instruments model the link to the instrument (latency, throughput,
+random or scripted communication errors) and implement a state machine
+answering the commands. They record the number of messages exchanged which
+can be used to measure the number of round trips performed by a driver.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+import re
+from collections import deque
+from random import Random
+from threading import RLock
+from time import sleep
+
+from .visa import constants, VisaIOError
+
+
+def _normalize(resource_name):
+    """Normalize a resource name to use the explicit board number.
+
+    """
+    name = resource_name.upper()
+    return re.sub(r'^(GPIB|TCPIP|USB|VXI|PXI)::', r'\g<1>0::', name)
+
+
+class SimulatedResourceManager(object):
+    """Resource manager giving access to simulated instruments.
+
+    """
+    def __init__(self):
+        self._instruments = {}
+
+    def add_instrument(self, resource_name, instrument):
+        """Make a simulated instrument available under a resource name.
+
+        Parameters
+        ----------
+        resource_name : unicode
+            VISA resource name of the instrument (ex: GPIB::2::INSTR).
+        instrument : SimulatedInstrument
+            State machine simulating the instrument.
+
+        """
+        self._instruments[_normalize(resource_name)] = instrument
+
+    def remove_instrument(self, resource_name):
+        """Remove a simulated instrument.
+
+        """
+        del self._instruments[_normalize(resource_name)]
+
+    def get_instrument(self, resource_name):
+        """Access the simulated instrument used for a resource.
+
+        """
+        return self._instruments[_normalize(resource_name)]
+
+    def list_resources(self, query='?*::INSTR'):
+        """List the names of the simulated resources.
+
+        The query is ignored.
+
+        """
+        return tuple(self._instruments)
+
+    def open_resource(self, resource_name, **kwargs):
+        """Open a connection to a simulated instrument.
+
+        Parameters
+        ----------
+        resource_name : unicode
+            VISA resource name of the instrument.
+        **kwargs :
+            Attributes of the resource to set (timeout, read_termination, ...)
+
+        Returns
+        -------
+        resource : SimulatedResource
+
+        """
+        try:
+            instrument = self.get_instrument(resource_name)
+        except KeyError:
+            raise VisaIOError(constants.StatusCode.error_resource_not_found)
+
+        resource = SimulatedResource(resource_name, instrument)
+        for key, value in kwargs.items():
+            setattr(resource, key, value)
+        return resource
+
+    def close(self):
+        """Nothing to release for simulated instruments.
+
+        """
+        pass
+
+
+class SimulatedResource(object):
+    """Message based resource connected to a simulated instrument.
+
+    This mimics the subset of the pyvisa MessageBasedResource API used by the
+    drivers.
+
+    """
+    def __init__(self, resource_name, instrument):
+        self.resource_name = resource_name
+        self.instrument = instrument
+        self.timeout = 2000
+        self._read_termination = None
+        self._write_termination = '\n'
+        self._encoding = 'ascii'
+        self._closed = False
+        self._pending = b''
+
+    @property
+    def read_termination(self):
+        return self._read_termination
+
+    @read_termination.setter
+    def read_termination(self, value):
+        self._read_termination = value
+
+    @property
+    def write_termination(self):
+        return self._write_termination
+
+    @write_termination.setter
+    def write_termination(self, value):
+        self._write_termination = value
+
+    @property
+    def encoding(self):
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, value):
+        self._encoding = value
+
+    def write(self, message, termination=None, encoding=None):
+        """Send a message to the instrument.
+
+        """
+        self._check_open()
+        self.instrument.write(message)
+        return len(message), constants.StatusCode.success
+
+    def write_raw(self, message):
+        """Send raw bytes to the instrument.
+
+        """
+        return self.write(message.decode(self._encoding))
+
+    def read(self, termination=None, encoding=None):
+        """Read an answer of the instrument.
+
+        """
+        self._check_open()
+        return self.instrument.read()
+
+    def read_raw(self, size=None):
+        """Read raw bytes from the instrument.
+
+        """
+        termination = self._read_termination or '\n'
+        if self._pending:
+            data, self._pending = self._pending, b''
+            return data
+        return (self.read() + termination).encode(self._encoding)
+
+    def read_bytes(self, count, chunk_size=None, break_on_termchar=False):
+        """Read exactly count bytes from the instrument.
+
+        Bytes of an answer which are not consumed are kept for the next read.
+
+        """
+        self._check_open()
+        while len(self._pending) < count:
+            termination = self._read_termination or '\n'
+            answer = (self.read() + termination).encode(self._encoding)
+            self._pending += answer
+        data, self._pending = self._pending[:count], self._pending[count:]
+        return data
+
+    def query(self, message, delay=None):
+        """Write a message and read the answer.
+
+        """
+        self.write(message)
+        if delay:
+            sleep(delay)
+        return self.read()
+
+    def read_stb(self):
+        """Read the status byte of the instrument.
+
+        """
+        self._check_open()
+        return self.instrument.read_stb()
+
+    def clear(self):
+        """Clear the instrument communication buffers.
+
+        """
+        self._check_open()
+        self.instrument.clear()
+
+    def assert_trigger(self):
+        """Software trigger, ignored by simulated instruments.
+
+        """
+        self._check_open()
+
+    def close(self):
+        """Close the resource.
+
+        """
+        self._closed = True
+
+    def _check_open(self):
+        if self._closed:
+            raise VisaIOError(constants.StatusCode.error_connection_lost)
+
+
+class SimulatedInstrument(object):
+    """Base class for simulated instruments.
+
+    Subclasses should implement the process method which updates the state
+    according to a message and return the answers.
+
+    Parameters
+    ----------
+    latency : float, optional
+        Time in seconds needed to transfer any message, in either direction.
+    throughput : float, optional
+        Transfer speed in bytes per second, None means infinite.
+    error_rate : float, optional
+        Probability for each transfer to fail with a timeout error.
+    seed : int, optional
+        Seed of the random generator used for error injection.
+
+    Attributes
+    ----------
+    writes : int
+        Number of messages received by the instrument.
+    reads : int
+        Number of answers read from the instrument (ie number of round trips
+        when the instrument is only queried).
+    polls : int
+        Number of serial polls (status byte reads).
+    errors : int
+        Number of injected communication errors.
+    log : deque
+        Last messages received by the instrument.
+
+    """
+    def __init__(self, latency=0., throughput=None, error_rate=0.,
+                 seed=None):
+        self.latency = latency
+        self.throughput = throughput
+        self.error_rate = error_rate
+        self.lock = RLock()
+        self.log = deque(maxlen=100)
+        self._random = Random(seed)
+        self._pending_failures = 0
+        self._output = deque()
+        self.reset_counters()
+        self.reset()
+
+    def reset(self):
+        """Reset the instrument state to its power on value.
+
+        """
+        pass
+
+    def reset_counters(self):
+        """Reset the communication counters.
+
+        """
+        self.writes = 0
+        self.reads = 0
+        self.polls = 0
+        self.errors = 0
+        self.log.clear()
+
+    def fail_next(self, count=1):
+        """Make the next transfers fail with a timeout error.
+
+        """
+        self._pending_failures += count
+
+    def process(self, message):
+        """Process a message received by the instrument.
+
+        Parameters
+        ----------
+        message : unicode
+            Message stripped of its termination.
+
+        Returns
+        -------
+        answers : list(unicode)
+            Lines to append to the output buffer of the instrument.
+
+        """
+        raise NotImplementedError()
+
+    def status_byte(self):
+        """Compute the instrument status byte.
+
+        """
+        return 0
+
+    def write(self, message):
+        """Transfer a message to the instrument.
+
+        """
+        with self.lock:
+            self._transfer(message)
+            self.writes += 1
+            self.log.append(message)
+            self._output.extend(self.process(message.strip()))
+
+    def read(self):
+        """Read the next answer line of the instrument.
+
+        """
+        with self.lock:
+            if not self._output:
+                raise VisaIOError(constants.StatusCode.error_timeout)
+            answer = self._output.popleft()
+            self._transfer(answer)
+            self.reads += 1
+            return answer
+
+    def read_stb(self):
+        """Read the status byte (serial poll).
+
+        """
+        with self.lock:
+            self._transfer('')
+            self.polls += 1
+            return self.status_byte()
+
+    def clear(self):
+        """Clear the output buffer.
+
+        """
+        with self.lock:
+            self._output.clear()
+
+    def _transfer(self, message):
+        """Simulate the transfer of a message, possibly failing.
+
+        """
+        delay = self.latency
+        if self.throughput:
+            delay += len(message)/self.throughput
+        if delay:
+            sleep(delay)
+
+        if self._pending_failures or (self.error_rate and
+                                      self._random.random() < self.error_rate):
+            if self._pending_failures:
+                self._pending_failures -= 1
+            self.errors += 1
+            raise VisaIOError(constants.StatusCode.error_timeout)
+
+
+def scpi_pattern(mnemonic):
+    """Build a regular expression matching the short and long forms of a
+    SCPI header.
+
+    Uppercase letters are mandatory, lowercase letters optional and nodes
+    between brackets can be omitted (ex: [SOURce]:LEVel). The pattern should
+    be matched against headers stripped of the leading colon and of the
+    question mark.
+
+    """
+    nodes = []
+    for node in mnemonic.strip(':').split(':'):
+        optional = node.startswith('[')
+        node = node.strip('[]')
+        short = ''.join(c for c in node if not c.islower())
+        pattern = re.escape(short)
+        if len(short) < len(node):
+            pattern += '(?:{})?'.format(re.escape(node[len(short):].upper()))
+        nodes.append((pattern, optional))
+
+    regex = ''
+    last = len(nodes) - 1
+    for i, (pattern, optional) in enumerate(nodes):
+        if optional:
+            node = '(?::{})?' if i == last else '(?:{}:)?'
+        else:
+            node = '{}' if i == last else '{}:'
+        regex += node.format(pattern)
+    return re.compile(regex + '$', re.IGNORECASE)
+
+
+class ScpiInstrument(SimulatedInstrument):
+    """Simulated instrument understanding SCPI messages and the IEEE 488.2
+    common commands.
+
+    The commands are declared in the commands class attribute mapping SCPI
+    headers (queries ending with '?') to the name of the method handling them.
+    Query handlers are called without arguments and return the answer, other
+    handlers receive the argument of the command as a string.
+
+    """
+    #: Mapping between SCPI headers and the name of the handler method.
+    commands = {}
+
+    #: Common commands supported by all instruments.
+    common_commands = {'*IDN?': '_query_idn', '*RST': '_reset',
+                       '*CLS': '_clear_status', '*ESR?': '_query_esr',
+                       '*ESE?': '_query_ese', '*ESE': '_set_ese',
+                       '*SRE?': '_query_sre', '*SRE': '_set_sre',
+                       '*STB?': '_query_stb', '*OPC?': '_query_opc',
+                       '*OPC': '_set_opc', '*WAI': '_wait',
+                       '*TST?': '_query_tst'}
+
+    #: Answer to the identification query.
+    identity = 'EAPII,SIMULATED,0,0'
+
+    _TABLES = {}
+
+    def reset(self):
+        self.error_queue = deque(maxlen=20)
+        self.event_status = 0
+        self.event_status_enable = 0
+        self.service_request_enable = 0
+
+    def process(self, message):
+        table = self._table()
+        answers = []
+        path = ''
+        for unit in message.split(';'):
+            unit = unit.strip()
+            if not unit:
+                continue
+            header, _, arg = unit.partition(' ')
+            if header.startswith('*'):
+                handler = self.common_commands.get(header.upper())
+            else:
+                if not header.startswith(':'):
+                    header = path + header
+                path = header.rpartition(':')[0] + ':'
+                handler = next((h for p, q, h in table
+                                if q == header.endswith('?')
+                                and p.match(header.strip(':?'))), None)
+
+            if handler is None:
+                self.push_error(-113, 'Undefined header')
+                continue
+
+            try:
+                if header.endswith('?'):
+                    answers.append(getattr(self, handler)())
+                else:
+                    getattr(self, handler)(arg.strip())
+            except ValueError:
+                self.push_error(-224, 'Illegal parameter value')
+
+        return [';'.join(answers)] if answers else []
+
+    def push_error(self, code, message):
+        """Add an error to the error queue and set the matching bit of the
+        event status register.
+
+        """
+        self.error_queue.append('{},"{}"'.format(code, message))
+        if -200 < code <= -100:
+            self.event_status |= 1 << 5
+        elif -300 < code <= -200:
+            self.event_status |= 1 << 4
+        else:
+            self.event_status |= 1 << 3
+
+    def status_byte(self):
+        stb = 0
+        if self.error_queue:
+            stb |= 1 << 2
+        if self._output:
+            stb |= 1 << 4
+        if self.event_status & self.event_status_enable:
+            stb |= 1 << 5
+        return stb
+
+    def _table(self):
+        """Compiled dispatch table for the class.
+
+        """
+        cls = type(self)
+        if cls not in self._TABLES:
+            self._TABLES[cls] = [(scpi_pattern(h.rstrip('?')),
+                                  h.endswith('?'), m)
+                                 for h, m in cls.commands.items()]
+        return self._TABLES[cls]
+
+    def _query_error(self):
+        if self.error_queue:
+            return self.error_queue.popleft()
+        return '0,"No error"'
+
+    def _query_idn(self):
+        return self.identity
+
+    def _reset(self, arg):
+        self.reset()
+
+    def _clear_status(self, arg):
+        self.error_queue.clear()
+        self.event_status = 0
+
+    def _query_esr(self):
+        esr, self.event_status = self.event_status, 0
+        return str(esr)
+
+    def _query_ese(self):
+        return str(self.event_status_enable)
+
+    def _set_ese(self, arg):
+        self.event_status_enable = int(arg)
+
+    def _query_sre(self):
+        return str(self.service_request_enable)
+
+    def _set_sre(self, arg):
+        self.service_request_enable = int(arg)
+
+    def _query_stb(self):
+        return str(self.status_byte())
+
+    def _query_opc(self):
+        return '1'
+
+    def _set_opc(self, arg):
+        self.event_status |= 1
+
+    def _wait(self, arg):
+        pass
+
+    def _query_tst(self):
+        return '0'
+
+
+def _parse_bool(arg):
+    """Parse a SCPI boolean argument.
+
+    """
+    arg = arg.upper()
+    if arg in ('1', 'ON'):
+        return True
+    if arg in ('0', 'OFF'):
+        return False
+    raise ValueError(arg)
+
+
+class SimulatedGS200(ScpiInstrument):
+    """Simulated Yokogawa GS200 DC voltage/current source.
+
+    Values are expressed in the units used by the driver (V and mA).
+
+    """
+    identity = 'YOKOGAWA,GS210,SIMULATED,1.00'
+
+    commands = {'[SOURce]:FUNCtion?': '_query_function',
+                '[SOURce]:FUNCtion': '_set_function',
+                '[SOURce]:RANGe?': '_query_range',
+                '[SOURce]:RANGe': '_set_range',
+                '[SOURce]:LEVel?': '_query_level',
+                '[SOURce]:LEVel': '_set_level',
+                'OUTPut?': '_query_output',
+                'OUTPut': '_set_output',
+                'STATus:ERRor?': '_query_error',
+                'SYSTem:ERRor?': '_query_error'}
+
+    #: Available ranges and maximal output for each function.
+    ranges = {'VOLT': {0.01: 0.012, 0.1: 0.12, 1.0: 1.2, 10.0: 12.0,
+                       30.0: 32.0},
+              'CURR': {1.0: 1.2, 10.0: 12.0, 100.0: 120.0, 200.0: 200.0}}
+
+    def reset(self):
+        super(SimulatedGS200, self).reset()
+        self.function = 'VOLT'
+        self.output = False
+        self.range = {'VOLT': 10.0, 'CURR': 100.0}
+        self.level = {'VOLT': 0.0, 'CURR': 0.0}
+
+    def _query_function(self):
+        return self.function
+
+    def _set_function(self, arg):
+        function = arg.upper()[:4]
+        if function not in self.ranges:
+            raise ValueError(arg)
+        if function != self.function:
+            self.output = False
+            self.function = function
+
+    def _query_range(self):
+        return '{:E}'.format(self.range[self.function])
+
+    def _set_range(self, arg):
+        value = float(arg)
+        if value not in self.ranges[self.function]:
+            self.push_error(-222, 'Data out of range')
+            return
+        self.range[self.function] = value
+        if abs(self.level[self.function]) > self._limit():
+            self.level[self.function] = 0.0
+
+    def _query_level(self):
+        return '{:+E}'.format(self.level[self.function])
+
+    def _set_level(self, arg):
+        value = float(arg)
+        if abs(value) > self._limit():
+            self.push_error(-222, 'Data out of range')
+            return
+        self.level[self.function] = value
+
+    def _query_output(self):
+        return '1' if self.output else '0'
+
+    def _set_output(self, arg):
+        self.output = _parse_bool(arg)
+
+    def _limit(self):
+        return self.ranges[self.function][self.range[self.function]]
+
+
+class Simulated7651(SimulatedInstrument):
+    """Simulated Yokogawa 7651 DC voltage/current source.
+
+    The 7651 does not understand SCPI, commands are made of a letter followed
+    by a parameter and several commands can be sent in a single message.
+    Values are expressed in the units used by the driver (V and mA).
+
+    """
+    #: Range codes and maximal output for each function.
+    ranges = {1: {2: 0.012, 3: 0.12, 4: 1.2, 5: 12.0, 6: 32.0},
+              5: {4: 1.2, 5: 12.0, 6: 120.0}}
+
+    _TOKENS = re.compile(r'\s*(OD|OS|OC|F\d|O\d|R\d|E|'
+                         r'S[+-]?\d+(?:\.\d*)?(?:E[+-]?\d+)?)', re.IGNORECASE)
+
+    def reset(self):
+        self.function = 1
+        self.output = False
+        self.range = {1: 5, 5: 6}
+        self.level = {1: 0.0, 5: 0.0}
+        self.stb_errors = 0
+
+    def process(self, message):
+        answers = []
+        pos = 0
+        while pos < len(message):
+            match = self._TOKENS.match(message, pos)
+            if not match:
+                self.stb_errors |= 1 << 2
+                break
+            pos = match.end()
+            token = match.group(1).upper()
+            command, arg = token[0], token[1:]
+            if token == 'OD':
+                unit = 'V' if self.function == 1 else 'A'
+                level = self.level[self.function]
+                answers.append('NDC{}{:+.4E}'.format(unit, level))
+            elif token == 'OS':
+                answers.extend(['MDL7651REV1.05',
+                                'F{}R{}S{:+.4E}'.format(
+                                    self.function, self.range[self.function],
+                                    self.level[self.function]),
+                                'M0,D0,T0', 'LV32LA120', 'END'])
+            elif token == 'OC':
+                answers.append(str((1 << 3) | (self.output << 4)))
+            elif command == 'F':
+                if int(arg) not in self.ranges:
+                    self.stb_errors |= 1 << 2
+                    continue
+                self.function = int(arg)
+            elif command == 'O':
+                self.output = arg == '1'
+            elif command == 'R':
+                if int(arg) not in self.ranges[self.function]:
+                    self.stb_errors |= 1 << 2
+                    continue
+                self.range[self.function] = int(arg)
+                if abs(self.level[self.function]) > self._limit():
+                    self.level[self.function] = 0.0
+            elif command == 'S':
+                value = float(arg)
+                if abs(value) > self._limit():
+                    self.stb_errors |= 1 << 3
+                    continue
+                self.level[self.function] = value
+
+        return answers
+
+    def status_byte(self):
+        stb = 1 | self.stb_errors
+        if self.stb_errors:
+            stb |= 1 << 5
+        self.stb_errors = 0
+        return stb
+
+    def _limit(self):
+        return self.ranges[self.function][self.range[self.function]]
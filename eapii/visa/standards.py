@@ -54,6 +54,9 @@ class IEC60488(VisaMessageInstrument):
         - `*WAI` - Wait to continue.
 
     """
+    #: Multiple queries can be sent in a single message.
+    query_separator = ';'
+
     # =========================================================================
     # --- IProperties
     # =========================================================================
@@ -19,9 +19,16 @@ from pyvisa.errors import VisaIOError, VisaTypeError
 from pyvisa import constants
 
 
-# XXXX consider supporting multiple rm with different backends
 RESOURCE_MANAGER = None
 
+#: Resource managers used by the drivers specifying a backend in their
+#: connection infos.
+BACKEND_MANAGERS = {}
+
+#: Name of the backend to use to select the simulated resource manager (see
+#: eapii.visa.simulation).
+SIMULATION_BACKEND = '@simulated'
+
 
 def get_visa_resource_manager(backend='@ni'):
     """Access the VISA ressource manager in use by Eapii.
@@ -32,11 +39,24 @@ def get_visa_resource_manager(backend='@ni'):
         mess = cleandoc('''Creating default Visa resource manager for Eapii
             with backend {}.'''.format(backend))
         logging.debug(mess)
-        RESOURCE_MANAGER = ResourceManager(backend)
+        RESOURCE_MANAGER = _create_resource_manager(backend)
 
     return RESOURCE_MANAGER
 
 
+def get_backend_resource_manager(backend):
+    """Access the VISA resource manager used for a specific backend.
+
+    Those managers are used by the drivers whose connection infos specify a
+    backend and are independent of the default resource manager.
+
+    """
+    if backend not in BACKEND_MANAGERS:
+        BACKEND_MANAGERS[backend] = _create_resource_manager(backend)
+
+    return BACKEND_MANAGERS[backend]
+
+
 def set_visa_resource_manager(rm):
     """Set the VISA ressource manager in use by Eapii.
 
@@ -55,3 +75,14 @@ def set_visa_resource_manager(rm):
         raise ValueError(mess)
 
     RESOURCE_MANAGER = rm
+
+
+def _create_resource_manager(backend):
+    """Create a resource manager for the given backend.
+
+    """
+    if backend == SIMULATION_BACKEND:
+        from .simulation import SimulatedResourceManager
+        return SimulatedResourceManager()
+
+    return ResourceManager(backend)
@@ -12,12 +12,18 @@ the VISA protocol.
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
+import re
 from time import sleep
 
 from ..core.iprops.register import Register
 from ..core.base_instrument import BaseInstrument
 from ..core.errors import InstrIOError
-from .visa import get_visa_resource_manager, VisaIOError
+from .visa import (get_visa_resource_manager, get_backend_resource_manager,
+                   VisaIOError)
+from .binary import parse_block_header, block_header, BufferPool
+
+#: Regular expression extracting the board number of a GPIB resource.
+GPIB_BOARD = re.compile(r'GPIB(\d*)::', re.IGNORECASE)
 
 
 class BaseVisaInstrument(BaseInstrument):
@@ -40,6 +46,9 @@ class BaseVisaInstrument(BaseInstrument):
             - mode : Mode of connection (INSTR, RAW, SOCKET). If absent INSTR
                      will be assumed.
             - para : a dict to alter the driver attributes.
+            - backend : VISA backend to use instead of the default resource
+                        manager (for example SIMULATION_BACKEND to use
+                        simulated instruments).
 
         Those information will be concatenated using ::.
 
@@ -47,7 +56,9 @@ class BaseVisaInstrument(BaseInstrument):
         Boolean use to determine if instrument properties can be cached
     caching_permissions : dict(str : bool), optionnal
         Dict specifying which instrument properties can be cached, override the
-        default parameters specified in the class attribute.
+        default parameters specified in the class attribute. Instead of a bool
+        the value can be a number of seconds after which the cached value
+        expires, or UNTIL_SET to keep the value only until the next set.
     auto_open : bool, optional
         Whether to automatically open the connection to the instrument when the
         driver is instantiated.
@@ -60,7 +71,7 @@ class BaseVisaInstrument(BaseInstrument):
         the mode (INSTR, port::SOCKET, ...)
 
     """
-    secure_com_except = (InstrIOError, VisaIOError)
+    secure_com_exceptions = (InstrIOError, VisaIOError)
 
     protocols = {}
 
@@ -76,6 +87,7 @@ class BaseVisaInstrument(BaseInstrument):
                                   + '::' + connection_infos['mode'])
         self._driver = None
         self._para = connection_infos.get('para', {})
+        self._backend = connection_infos.get('backend')
         if auto_open:
             self.open_connection()
 
@@ -88,13 +100,28 @@ class BaseVisaInstrument(BaseInstrument):
         if not connection_infos.get('mode'):
             connection_infos['mode'] = 'INSTR'
 
-        super(BaseVisaInstrument, cls).compute_id(connection_infos)
+        infos = {k: v for k, v in connection_infos.items() if k != 'para'}
+        return super(BaseVisaInstrument, cls).compute_id(infos)
+
+    @property
+    def bus_id(self):
+        """GPIB instruments connected to the same board share the bus, the
+        other interfaces are considered independent.
+
+        """
+        match = GPIB_BOARD.match(self.connection_str)
+        if match:
+            return 'GPIB' + (match.group(1) or '0')
+        return None
 
     def open_connection(self):
         """Open the VISA session.
 
         """
-        rm = get_visa_resource_manager()
+        if self._backend:
+            rm = get_backend_resource_manager(self._backend)
+        else:
+            rm = get_visa_resource_manager()
         self._driver = rm.open_resource(self.connection_str, **self._para)
 
     def close_connection(self):
@@ -181,6 +208,12 @@ class VisaMessageInstrument(BaseVisaInstrument):
     #: Status byte of the instrument.
     status_byte = Register(getter=True, names=[None]*8)
 
+    #: Separator used to join multiple queries in a single message (and to
+    #: split the answer). The commands are made absolute (SCPI root path) so
+    #: this should only be set for instruments understanding SCPI. By default
+    #: the queries are sent one by one.
+    query_separator = None
+
     def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
         """Query the value using the provided command.
 
@@ -190,6 +223,32 @@ class VisaMessageInstrument(BaseVisaInstrument):
         """
         return self._driver.query(cmd.format(*args, **kwargs))
 
+    def default_get_iproperties(self, iprops, cmds, *args, **kwargs):
+        """Query the values using a single message.
+
+        The commands are formatted using the provided args and kwargs and
+        joined using the query_separator. Commands which are not common
+        commands (starting with '*') are made absolute by prefixing them with
+        a ':' so that the header path of a previous command does not affect
+        them. If the answer cannot be split into the expected number of
+        values (for example because a string contains the separator) the
+        values are queried one by one.
+
+        """
+        sep = self.query_separator
+        sup = super(VisaMessageInstrument, self)
+        if not sep or len(cmds) < 2:
+            return sup.default_get_iproperties(iprops, cmds, *args, **kwargs)
+
+        formatted = [cmd.format(*args, **kwargs) for cmd in cmds]
+        message = sep.join(c if c.startswith((':', '*')) else ':' + c
+                           for c in formatted)
+        answers = self._driver.query(message).split(sep)
+        if len(answers) != len(cmds):
+            return sup.default_get_iproperties(iprops, cmds, *args, **kwargs)
+
+        return [a.strip() for a in answers]
+
     def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
         """Set the iproperty value of the instrument.
 
@@ -199,6 +258,46 @@ class VisaMessageInstrument(BaseVisaInstrument):
         """
         self._driver.write(cmd.format(*args, **kwargs))
 
+    def default_get_array(self, iprop, cmd, *args, **kwargs):
+        """Query an array transferred as an IEEE 488.2 binary block.
+
+        The array is allocated once the size of the block is known and the
+        data are read directly into it.
+
+        """
+        import numpy as np
+
+        driver = self._driver
+        driver.write(cmd.format(*args, **kwargs))
+        length = self._read_block_header()
+        if length is None:
+            # Indefinite length block terminated by a newline.
+            raw = driver.read_raw()
+            raw = raw[:-1] if raw.endswith(b'\n') else raw
+            return np.frombuffer(raw, iprop.dtype).copy()
+
+        count, rest = divmod(length, iprop.dtype.itemsize)
+        if rest:
+            mess = 'Block of {} bytes cannot contain {} values'
+            raise InstrIOError(mess.format(length, iprop.dtype))
+        out = np.empty(count, iprop.dtype)
+        self._read_block_data(out, length, None, True)
+        return out
+
+    def default_set_array(self, iprop, cmd, values, *args, **kwargs):
+        """Send an array as an IEEE 488.2 binary block.
+
+        The block is appended to the formatted command.
+
+        """
+        data = values.tobytes()
+        encoding = self.encoding
+        message = (cmd.format(*args, **kwargs).encode(encoding) +
+                   block_header(len(data)) + data)
+        if self.write_termination:
+            message += self.write_termination.encode(encoding)
+        self._driver.write_raw(message)
+
     # --- Pyvisa wrappers -----------------------------------------------------
     @property
     def encoding(self):
@@ -318,6 +417,116 @@ class VisaMessageInstrument(BaseVisaInstrument):
                                                 is_big_endian, container,
                                                 delay, header_fmt)
 
+    def read_binary_into(self, buffer, chunk_size=None,
+                         expect_termination=True):
+        """Read an IEEE 488.2 binary block into a pre-allocated buffer.
+
+        The data are copied chunk by chunk into the buffer as they are read,
+        no container holding the whole block is created.
+
+        Parameters
+        ----------
+        buffer : bytearray, memoryview or numpy.ndarray
+            Writable buffer in which to store the data. NumPy arrays must be
+            contiguous and can be memory-mapped (numpy.memmap) to stream the
+            data to a file.
+        chunk_size : int, optional
+            Number of bytes to read at once, by default the chunk size of the
+            resource.
+        expect_termination : bool, optional
+            Whether the block is followed by the read termination which
+            should be read as well.
+
+        Returns
+        -------
+        size : int
+            Number of bytes written into the buffer.
+
+        Raises
+        ------
+        ValueError :
+            Raised if the buffer is too small to hold the block. The data of
+            the block are then left unread.
+
+        """
+        length = self._read_block_header()
+        if length is None:
+            raise InstrIOError('Indefinite length blocks are not supported.')
+        self._read_block_data(buffer, length, chunk_size, expect_termination)
+        return length
+
+    def query_binary_into(self, message, out, delay=None, chunk_size=None,
+                          expect_termination=True):
+        """Send a query and read the answer (a binary block) into a buffer.
+
+        See read_binary_into for the description of the parameters.
+
+        """
+        self._driver.write(message)
+        if delay:
+            sleep(delay)
+        return self.read_binary_into(out, chunk_size, expect_termination)
+
+    def stream_binary(self, message=None, chunk_size=None, dtype=None,
+                      pool=None, delay=None, expect_termination=True,
+                      timeout=None):
+        """Read an IEEE 488.2 binary block chunk by chunk.
+
+        The chunks are yielded as soon as they are read so that they can be
+        processed or written to disk while the transfer goes on, using a
+        constant amount of memory. Nothing is read from the instrument until
+        the consumer asks for the next chunk.
+
+        Parameters
+        ----------
+        message : unicode, optional
+            Query to send before reading the block. The message is sent when
+            the first chunk is requested.
+        chunk_size : int, optional
+            Maximal size in bytes of the chunks, by default the size of the
+            buffers of the pool or the chunk size of the resource. When a
+            dtype is specified it is rounded down to a multiple of the item
+            size.
+        dtype : numpy.dtype or unicode, optional
+            Type of the values in the block. If specified the chunks are NumPy
+            arrays, otherwise memoryviews.
+        pool : BufferPool, optional
+            Pool from which to take the buffers holding the chunks. The
+            consumer then owns the chunks and must release them into the pool,
+            possibly from another thread. When the pool is exhausted the
+            stream waits for a chunk to be released. If no pool is provided
+            each chunk is only valid until the next one is requested.
+        delay : float, optional
+            Time to wait after sending the message.
+        expect_termination : bool, optional
+            Whether the block is followed by the read termination which
+            should be read as well.
+        timeout : float, optional
+            Maximum time to wait for a chunk to be released into the pool.
+
+        Returns
+        -------
+        chunks : generator
+            Generator yielding the chunks. If it is closed before the end of
+            the block the communication buffers are cleared.
+
+        """
+        if dtype is not None:
+            from numpy import dtype as np_dtype
+            dtype = np_dtype(dtype)
+        owned = pool is None
+        if pool is None:
+            size = chunk_size or getattr(self._driver, 'chunk_size', 20*1024)
+            pool = BufferPool(1, size)
+        chunk_size = min(chunk_size or pool.size, pool.size)
+        if dtype is not None:
+            chunk_size -= chunk_size % dtype.itemsize
+            if not chunk_size:
+                raise ValueError('Chunks smaller than an item of the block.')
+
+        return self._stream_block(message, delay, chunk_size, dtype, pool,
+                                  owned, expect_termination, timeout)
+
     def assert_trigger(self):
         """Sends a software trigger to the device.
 
@@ -327,6 +536,130 @@ class VisaMessageInstrument(BaseVisaInstrument):
     def _get_status_byte(self, iprop):
         return self._driver.read_stb()
 
+    def _read_block_header(self):
+        """Read the header of a binary block and return its length.
+
+        None is returned for indefinite length blocks.
+
+        """
+        read = self._driver.read_bytes
+        char = read(1)
+        while char != b'#':
+            if not char:
+                raise InstrIOError('No binary block in the answer.')
+            char = read(1)
+        # Read exactly the header so that the data are left in the driver.
+        header = b'#' + read(1)
+        digits = header[1:]
+        if digits.isdigit() and digits != b'0':
+            header += read(int(digits))
+        return parse_block_header(header)[1]
+
+    def _read_block_data(self, buffer, length, chunk_size,
+                         expect_termination):
+        """Read the data of a binary block into a buffer.
+
+        """
+        view, assign = _byte_view(buffer)
+        if len(view) < length:
+            mess = 'Buffer of {} bytes too small for a block of {} bytes.'
+            raise ValueError(mess.format(len(view), length))
+
+        driver = self._driver
+        chunk_size = chunk_size or getattr(driver, 'chunk_size', 20*1024)
+        received = 0
+        while received < length:
+            chunk = driver.read_bytes(min(chunk_size, length - received))
+            if not chunk:
+                raise InstrIOError('Binary block ended prematurely.')
+            assign(view, received, chunk)
+            received += len(chunk)
+
+        termination = self.read_termination
+        if expect_termination and termination:
+            driver.read_bytes(len(termination))
+
+    def _stream_block(self, message, delay, chunk_size, dtype, pool, owned,
+                      expect_termination, timeout):
+        """Generator doing the actual work of stream_binary.
+
+        """
+        driver = self._driver
+        if message is not None:
+            driver.write(message)
+            if delay:
+                sleep(delay)
+        length = self._read_block_header()
+        if length is None:
+            raise InstrIOError('Indefinite length blocks are not supported.')
+        if dtype is not None and length % dtype.itemsize:
+            mess = 'Block of {} bytes cannot hold values of type {}.'
+            raise InstrIOError(mess.format(length, dtype))
+
+        termination = self.read_termination
+        received = 0
+        chunk = None
+        try:
+            while received < length:
+                if owned and chunk is not None:
+                    pool.release(chunk)
+                    chunk = None
+                buf = pool.acquire(timeout)
+                try:
+                    size = min(chunk_size, length - received)
+                    data = driver.read_bytes(size)
+                    if len(data) != size:
+                        raise InstrIOError('Binary block ended prematurely.')
+                    buf[:size] = data
+                    received += size
+                    if (received == length and expect_termination and
+                            termination):
+                        driver.read_bytes(len(termination))
+                    chunk = pool.view(buf, size, dtype)
+                except Exception:
+                    # The buffer never reached the consumer.
+                    pool.release(buf)
+                    raise
+                yield chunk
+        finally:
+            if owned and chunk is not None:
+                pool.release(chunk)
+            if received < length:
+                self.clear()
+
+
+def _assign_bytes(view, start, chunk):
+    view[start:start+len(chunk)] = chunk
+
+
+def _assign_array(view, start, chunk):
+    from numpy import frombuffer
+    view[start:start+len(chunk)] = frombuffer(chunk, view.dtype)
+
+
+def _byte_view(buffer):
+    """Get a writable view of the bytes of a buffer.
+
+    Returns
+    -------
+    view :
+        View of the buffer with one byte items.
+    assign : callable
+        Function copying a chunk of bytes into the view at a given index.
+
+    """
+    if hasattr(buffer, 'dtype'):
+        if not (buffer.flags.c_contiguous and buffer.flags.writeable):
+            raise ValueError('Arrays must be contiguous and writeable.')
+        return buffer.reshape(-1).view('u1'), _assign_array
+
+    view = memoryview(buffer)
+    if view.readonly:
+        raise ValueError('The buffer is read-only.')
+    if view.itemsize != 1 or view.ndim != 1:
+        view = view.cast('B')
+    return view, _assign_bytes
+
 
 class VisaRegisterInstrument(BaseVisaInstrument):
     """Base class for driver based on VISA and a binary registry.
@@ -43,7 +43,7 @@ class Yokogawa7651(VisaMessageInstrument):
     """Driver for the Yokogawa 7651.
 
     """
-    protocoles = {'GPIB': 'INSTR', 'ASRL': 'INSTR'}
+    protocols = {'GPIB': 'INSTR', 'ASRL': 'INSTR'}
 
     caching_permissions = {'function': True, 'output': True,
                            'voltage': True, 'voltage_range': True,
@@ -62,31 +62,31 @@ class Yokogawa7651(VisaMessageInstrument):
     output = Bool(True, 'O{}',
                   mapping={True: 1, False: 0},
                   aliases={True: ['ON'], False: ['OFF']},
-                  secure_comm=2)
+                  secure_comm=2, depends_on=('function',))
 
     #: Currently applied voltage in V. Apply only if function is 'Voltage'.
     voltage = Float(True, 'S{:+E}E', unit='V',
                     checks='{function} == "Voltage"',
                     range='voltage_range',
-                    secure_comm=2)
+                    secure_comm=2, depends_on=('function', 'voltage_range'))
 
     #: Current voltage range in V. Apply only if function is 'Voltage'.
     voltage_range = Float(True, True, unit='V',
                           checks='{function} == "Voltage"',
                           values=(0.01, 0.1, 1.0, 10.0, 30.0),
-                          secure_comm=2)
+                          secure_comm=2, depends_on=('function',))
 
     #: Currently delivered current in mA. Apply only if function is 'Current'.
     current = Float(True, 'S{:+E}E', unit='mA',
                     checks='{function} == "Current"',
                     range='current_range',
-                    secure_comm=2)
+                    secure_comm=2, depends_on=('function', 'current_range'))
 
     #: Current current range in mA. Apply only if function is 'Voltage'.
     current_range = Float(True, True, unit='mA',
                           checks='{function} == "Current"',
                           values=(1.0, 10.0, 100.0),
-                          secure_comm=2)
+                          secure_comm=2, depends_on=('function',))
 
     #: Status code of the instrument.
     status_code = Register('OC', names=('Program setting',
@@ -121,18 +121,6 @@ class Yokogawa7651(VisaMessageInstrument):
     def _get_function(self, iprop):
         return 1 if self.query('OD')[3] == 'V' else 5
 
-    def _post_set_function(self, iprop, value, i_value):
-        """Clear the cache of affected property.
-
-        """
-        del self.current
-        del self.current_range
-        self.discard_range('current_range')
-        del self.voltage
-        del self.voltage_range
-        self.discard_range('voltage_range')
-        self.default_check_instr_operation(self, iprop, value, i_value)
-
     def _get_output(self, iprop):
         return self.status_code['Output']
 
@@ -150,10 +138,6 @@ class Yokogawa7651(VisaMessageInstrument):
     def _set_voltage_range(self, iprop, value):
         self.write('R{}'.format(VOLT_RANGE[value]))
 
-    def _post_set_voltage_range(self, iprop, value, i_value):
-        self.discard_range('voltage_range')
-        self.default_check_instr_operation(self, iprop, value, i_value)
-
     def _range_voltage_range(self):
         val = self.voltage_range.magnitude
         if val == 30.0:
@@ -175,10 +159,6 @@ class Yokogawa7651(VisaMessageInstrument):
     def _set_current_range(self, iprop, value):
         self.write('R{}'.format(CURR_RANGE[value]))
 
-    def _post_set_current_range(self, iprop, value, i_value):
-        self.discard_range('current_range')
-        self.default_check_instr_operation(self, iprop, value, i_value)
-
     def _range_current_range(self):
         val = self.current_range.magnitude
         if val == 200.0:
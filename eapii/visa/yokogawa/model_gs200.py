@@ -34,9 +34,9 @@ class YokogawaGS200(IEC60488):
     """Driver for the Yokogawa GS200.
 
     """
-    protocoles = {'GPIB': 'INSTR', 'USB': 'INSTR', 'TCPIP': 'INSTR'}
+    protocols = {'GPIB': 'INSTR', 'USB': 'INSTR', 'TCPIP': 'INSTR'}
 
-    caching_permissions = {'function': True, 'outout': True,
+    caching_permissions = {'function': True, 'output': True,
                            'voltage': True, 'voltage_range': True,
                            'current': True, 'current_range': True}
 
@@ -53,31 +53,31 @@ class YokogawaGS200(IEC60488):
     output = Bool(':OUTPUT?', ':OUTPUT {}',
                   mapping={True: '1', False: '0'},
                   aliases={True: ['ON'], False: ['OFF']},
-                  secure_comm=2)
+                  secure_comm=2, depends_on=('function',))
 
     #: Currently applied voltage in V. Apply only if function is 'Voltage'.
     voltage = Float(':SOURce:LEVel?', ':SOURce:LEVel {}', unit='V',
                     checks='{function} == "Voltage"',
                     range='voltage_range',
-                    secure_comm=2)
+                    secure_comm=2, depends_on=('function', 'voltage_range'))
 
     #: Current voltage range in V. Apply only if function is 'Voltage'.
     voltage_range = Float(':SOURce:RANGe?', ':SOURce:RANGe {}', unit='V',
                           checks='{function} == "Voltage"',
                           values=(0.01, 0.1, 1.0, 10.0, 30.0),
-                          secure_comm=2)
+                          secure_comm=2, depends_on=('function',))
 
     #: Currently delivered current in mA. Apply only if function is 'Current'.
     current = Float(':SOURce:LEVel?', ':SOURce:LEVel {}', unit='mA',
                     checks='{function} == "Current"',
                     range='current_range',
-                    secure_comm=2)
+                    secure_comm=2, depends_on=('function', 'current_range'))
 
     #: Current current range in mA. Apply only if function is 'Voltage'.
     current_range = Float(':SOURce:RANGe?', ':SOURce:RANGe {}', unit='mA',
                           checks='{function} == "Current"',
                           values=(1.0, 10.0, 100.0, 200.0),
-                          secure_comm=2)
+                          secure_comm=2, depends_on=('function',))
 
     status_byte = set_iprop_paras(names={'Extended event summary': 1,
                                          'Error available': 2,
@@ -112,28 +112,12 @@ class YokogawaGS200(IEC60488):
         while self.status_byte['Error available']:
             errors.append(self.query(':STAT:ERR?'))
 
-        return bool(errors), '\n'.join(errors)
+        return not errors, '\n'.join(errors)
 
     # =========================================================================
     # --- IProperty customisation
     # =========================================================================
 
-    def _post_set_function(self, iprop, value, i_value):
-        """Clear the cache of affected property.
-
-        """
-        del self.current
-        del self.current_range
-        self.discard_range('current_range')
-        del self.voltage
-        del self.voltage_range
-        self.discard_range('voltage_range')
-        self.default_check_instr_operation(self, iprop, value, i_value)
-
-    def _post_set_voltage_range(self, iprop, value, i_value):
-        self.discard_range('voltage_range')
-        self.default_check_instr_operation(self, iprop, value, i_value)
-
     def _range_voltage_range(self):
         val = self.voltage_range.magnitude
         if val == 30.0:
@@ -141,10 +125,6 @@ class YokogawaGS200(IEC60488):
         else:
             return FloatRangeValidator(-1.2*val, 1.2*val, VOLT_STEP[val], 'V')
 
-    def _post_set_current_range(self, iprop, value, i_value):
-        self.discard_range('current_range')
-        self.default_check_instr_operation(self, iprop, value, i_value)
-
     def _range_current_range(self):
         val = self.current_range.magnitude
         if val == 200.0:
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Module dedicated to testing the Array iproperty.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from pytest import raises, importorskip
+
+from eapii.core.range import FloatRangeValidator
+from eapii.core.unit import get_unit_registry
+from ..testing_tools import Parent
+
+np = importorskip('numpy')
+from eapii.core.iprops.arrays import Array
+
+
+class ArrayDriver(Parent):
+
+    caching_permissions = ('trace',)
+
+    trace = Array('TRAC?', 'TRAC ', dtype='i2', scale=0.5, offset=1.0,
+                  unit='V', range=FloatRangeValidator(-5.0, 5.0, unit='V'))
+
+    raw = Array('RAW?', dtype='f8', is_big_endian=True)
+
+    def __init__(self):
+        super(ArrayDriver, self).__init__()
+        self.arrays = {'TRAC?': np.array([0, 2, 4], dtype='<i2'),
+                       'RAW?': np.array([1.5], dtype='>f8')}
+        self.sent = []
+
+    def default_get_array(self, iprop, cmd, *args, **kwargs):
+        self.d_get_called += 1
+        return self.arrays[cmd]
+
+    def default_set_array(self, iprop, cmd, values, *args, **kwargs):
+        self.sent.append((cmd, values))
+
+
+def test_get():
+    driver = ArrayDriver()
+    trace = driver.trace
+    assert list(trace.to('V').magnitude) == [1.0, 2.0, 3.0]
+    assert driver.trace is trace
+    assert driver.raw.dtype == np.dtype('>f8')
+
+    driver.patch_iprop('trace', quantity=False)
+    driver.clear_cache()
+    assert list(driver.trace) == [1.0, 2.0, 3.0]
+
+
+def test_set():
+    driver = ArrayDriver()
+    u = get_unit_registry()
+    driver.trace = np.array([1000, 1600])*u.parse_expression('mV')
+    cmd, values = driver.sent[0]
+    assert cmd == 'TRAC '
+    assert values.dtype == np.dtype('<i2')
+    assert list(values) == [0, 1]
+
+    # Setting the cached value is skipped.
+    driver.trace = np.array([1000, 1600])*u.parse_expression('mV')
+    assert len(driver.sent) == 1
+    driver.trace = [1.0, 3.0]
+    assert list(driver.sent[1][1]) == [0, 4]
+
+
+def test_set_buffer_changed_in_place():
+    driver = ArrayDriver()
+    buf = np.array([1.0, 3.0])
+    driver.trace = buf
+    buf[:] = [3.0, 5.0]
+    driver.trace = buf
+    assert len(driver.sent) == 2
+    assert list(driver.sent[1][1]) == [4, 8]
+    assert driver.trace is not buf
+    buf[:] = [1.0, 1.0]
+    assert list(driver.trace) == [3.0, 5.0]
+
+
+def test_set_out_of_range():
+    driver = ArrayDriver()
+    with raises(ValueError) as e:
+        driver.trace = np.array([1.0, 6.0, 7.0])
+    assert 'index 1' in e.value.args[0]
+    assert not driver.sent
+
+
+def test_checks_are_kept():
+    p = Array(setter=True, checks=(None, 'len(value) > 1'))
+    p.name = 'test'
+    with raises(AssertionError):
+        p.pre_set(None, np.zeros(1))
+    assert p.pre_set(None, [1, 2]).dtype == np.dtype('<f4')
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Module dedicated to testing the compilation of the checks.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from pytest import raises
+
+from eapii.core.iprops.i_property import IProperty
+from eapii.core.iprops.checks import compile_check
+from eapii.core.has_i_props import set_iprop_paras
+
+
+class Obj(object):
+    pass
+
+
+def test_compile_check_is_cached():
+    c = compile_check('{a} == 1; {b.c} > {a}')
+    assert compile_check('{a} == 1; {b.c} > {a}') is c
+    assert compile_check('{a} == 1; {b.c} > {a}', True) is not c
+    assert c.refs == ('a', 'b.c')
+    assert [a[:2] for a in c.assertions] == [('a == 1', (0,)),
+                                             ('b.c > a', (1, 0))]
+
+
+def test_checks_shared_by_clones_and_customized():
+    p = IProperty(True, True, checks='{t} is True')
+    assert p.clone().get_check.__func__ is p.get_check.__func__
+    p2 = set_iprop_paras(secure_comm=1).customize(p)
+    assert p2.get_check.__func__ is p.get_check.__func__
+    assert p2.set_check.__func__ is p.set_check.__func__
+
+
+def test_dotted_references():
+    p = IProperty(True, checks='{parent.function} == "Voltage"')
+    p.name = 'test'
+    obj = Obj()
+    obj.parent = Obj()
+    obj.parent.function = 'Voltage'
+    assert p.get_check_refs == ('parent.function',)
+    p.get_check(obj)
+
+    obj.parent.function = 'Current'
+    with raises(AssertionError) as e:
+        p.get_check(obj)
+    m = ('Getting test assertion parent.function == "Voltage" failed, '
+         'values are : parent.function=Current')
+    assert e.value.args[0] == m
+
+
+def test_set_checks():
+    p = IProperty(True, True, checks=(None, 'value > 0; {a} < value'))
+    p.name = 'test'
+    obj = Obj()
+    obj.a = 1
+    p.set_check(obj, 2)
+
+    with raises(AssertionError) as e:
+        p.set_check(obj, 0)
+    assert e.value.args[0] == ('Setting test assertion value > 0 failed, '
+                               'values are : ')
+    with raises(AssertionError) as e:
+        p.set_check(obj, 0.5)
+    assert e.value.args[0] == ('Setting test assertion a < value failed, '
+                               'values are : a=1')
+
+
+def test_strings_are_not_parsed():
+    c = compile_check('{a} != "{b}; c"')
+    assert c.refs == ('a',)
+    assert len(c.assertions) == 1
+    assert c.test('{b}; c') is False
+
+
+def test_invalid_checks():
+    with raises(ValueError):
+        compile_check('{a} ==')
+    with raises(ValueError):
+        compile_check('{a} == value')
+    with raises(ValueError):
+        compile_check('{a} == os')
+    with raises(ValueError):
+        compile_check('{a}.__class__ is int')
+    with raises(ValueError):
+        compile_check('(lambda: 1)()')
+
+
+class Recorder(object):
+    """Object recording the attributes accessed by the checks.
+
+    """
+    def __init__(self, **values):
+        self.values = values
+        self.accessed = []
+
+    def __getattr__(self, name):
+        self.accessed.append(name)
+        return self.values[name]
+
+
+def test_references_are_retrieved_lazily():
+    p = IProperty(True, checks='{a} and {b}; {c} == 1; {a} or {d}')
+    p.name = 'test'
+    obj = Recorder(a=False, b=True, c=1, d=True)
+    with raises(AssertionError) as e:
+        p.get_check(obj)
+    assert obj.accessed == ['a']
+    assert e.value.args[0] == ('Getting test assertion a and b failed, '
+                               'values are : a=False')
+
+    obj = Recorder(a=True, b=True, c=2, d=True)
+    with raises(AssertionError):
+        p.get_check(obj)
+    assert obj.accessed == ['a', 'b', 'c']
+
+    # Checks always needing all their values retrieve them at once.
+    assert compile_check('{a} == {b}').lazy_test is None
+    assert compile_check('{a} < {b} < 1').lazy_test is not None
+
+    obj = Recorder(a=True, b=True, c=1, d=True)
+    p.get_check(obj)
+    assert obj.accessed == ['a', 'b', 'c']
+
+    # Checks always needing all their values retrieve them at once.
+    assert compile_check('{a} == {b}').lazy_test is None
+    assert compile_check('{a} < {b} < 1').lazy_test is not None
+
+
+def test_byte_string_check():
+    c = compile_check(str('{a} == 1'))
+    assert c.refs == ('a',)
+    assert c.test(1) is True
@@ -22,17 +22,27 @@ class FalseDriver(object):
 
     secure_com_exceptions = ()
 
+    __dependents__ = {}
+
     def __init__(self):
         self._cache = {}
+        self._timed_cache = {}
+        self._cache_stamps = {}
         self.lock = RLock()
         self._caching_permissions = set()
+        self._cache_ttls = {}
+        self._until_set_owners = []
+        self._proxies = {}
 
     def reopen_connection(self):
         pass
 
-    def default_check_instr_operation(self, iprop):
+    def default_check_instr_operation(self, iprop, value, i_value):
         return True, None
 
+    def invalidate_dependents(self, name):
+        pass
+
     def clear_cache(self, properties):
         for p in properties:
             del self._cache[p]
@@ -381,6 +391,27 @@ def test_set_check():
         assert e.message == m
 
 
+def test_checks_fetch_each_value_once():
+
+    class Tester(FalseDriver):
+        fetched = 0
+
+        @property
+        def t(self):
+            self.fetched += 1
+            return 1
+
+    p = IProperty(True, checks=('{t} > 0; {t} < 2; "a" != "{t}"', None))
+    p.name = 'test'
+    p.get = MethodType(lambda s, o: None, p)
+    t = Tester()
+
+    assert p.get_check_refs == ('t',)
+    assert p.set_check_refs == ()
+    p._get(t)
+    assert t.fetched == 1
+
+
 class TestWrapWithChecker():
 
     def setup(self):
@@ -454,3 +485,94 @@ class TestWrapWithChecker():
         f = lambda s, o, v: 'test'
         with raises(ValueError):
             p._wrap_with_checker(f, None)
+
+
+class TestCompiledAccessors(object):
+
+    def setup(self):
+        p = IProperty(True, True)
+        p.name = 'test'
+
+        def getter(self, obj):
+            obj.i += 1
+            return obj.i
+
+        def setter(self, obj, value):
+            obj.val = value
+
+        p.get = MethodType(getter, p)
+        p.set = MethodType(setter, p)
+        p.compile_accessors()
+        self.p = p
+
+        d = FalseDriver()
+        d.i = 0
+        self.d = d
+
+    def test_accessors_replaced(self):
+        assert self.p.fget != self.p._get
+        assert self.p.fset != self.p._set
+
+    def test_read_only(self):
+        p = IProperty(True)
+        p.compile_accessors()
+        assert p.fset is None
+
+    def test_get(self):
+        def post_getter(self, obj, val):
+            return 2*val
+
+        self.p.post_get = MethodType(post_getter, self.p)
+        self.p.compile_accessors()
+        assert self.p.fget(self.d) == 2
+        assert self.p.fget(self.d) == 4
+        self.d._caching_permissions = set(['test'])
+        assert self.p.fget(self.d) == 6
+        assert self.p.fget(self.d) == 6
+
+    def test_set(self):
+        def pre_setter(self, obj, value):
+            return value/2
+
+        self.p.pre_set = MethodType(pre_setter, self.p)
+        self.p.compile_accessors()
+        self.p.fset(self.d, 1)
+        assert self.d.val == 0.5
+        self.d._caching_permissions = set(['test'])
+        self.p.fset(self.d, 2)
+        self.d.val = None
+        self.p.fset(self.d, 2)
+        assert self.d.val is None
+
+    def test_secur_comm(self):
+        def getter(self, obj):
+            obj.i += 1
+            if obj.i < 3:
+                raise ValueError()
+            return obj.i
+
+        self.p.get = MethodType(getter, self.p)
+        self.p._secur = 2
+        self.p.compile_accessors()
+        self.d.secure_com_exceptions = (ValueError)
+        assert self.p.fget(self.d) == 3
+
+        self.d.i = -5
+        with raises(ValueError):
+            self.p.fget(self.d)
+        assert self.d.i == -2
+
+    def test_checks_are_kept(self):
+        class Tester(FalseDriver):
+            t = False
+
+        p = IProperty(True, True, checks='{t} is True')
+        p.name = 'test'
+        p.get = MethodType(lambda s, o: None, p)
+        p.set = MethodType(lambda s, o, v: v, p)
+        p.compile_accessors()
+
+        with raises(AssertionError):
+            p.fget(Tester())
+        with raises(AssertionError):
+            p.fset(Tester(), 1)
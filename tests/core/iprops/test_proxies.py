@@ -17,8 +17,10 @@ from eapii.core.iprops.i_property import IProperty
 from eapii.core.iprops.proxies import _ProxyManager
 
 
-class WeakRef(object):
-    pass
+class Instance(object):
+
+    def __init__(self):
+        self._proxies = {}
 
 
 def test_make_proxy():
@@ -26,9 +28,12 @@ def test_make_proxy():
     ip.get = MethodType(lambda s, o: False, ip)
 
     pm = _ProxyManager()
-    ip_p = pm.make_proxy(ip, WeakRef(),
+    instance = Instance()
+    ip_p = pm.make_proxy(ip, instance,
                          {'get': lambda s, o: True, 'toto': 'test'})
 
+    assert instance._proxies == {ip.name: ip_p}
+    assert ip._patched
     assert not ip.get(None)
     assert ip_p.get(None)
     assert ip_p.toto == 'test'
@@ -39,8 +44,8 @@ def test_make_proxy_cache():
     ip2 = IProperty(setter=True)
 
     pm = _ProxyManager()
-    pm.make_proxy(ip, WeakRef(), {'get': lambda s, o: True, 'toto': 'test'})
-    pm.make_proxy(ip2, WeakRef(), {'set': lambda s, o, v: None})
+    pm.make_proxy(ip, Instance(), {'get': lambda s, o: True, 'toto': 'test'})
+    pm.make_proxy(ip2, Instance(), {'set': lambda s, o, v: None})
 
     assert len(pm._proxy_cache) == 1
 
@@ -50,7 +55,7 @@ def test_unpatch():
     ip.get = MethodType(lambda s, o: False, ip)
 
     pm = _ProxyManager()
-    ip_p = pm.make_proxy(ip, WeakRef(),
+    ip_p = pm.make_proxy(ip, Instance(),
                          {'get': lambda s, o: True, 'toto': 'test'})
 
     ip_p.unpatch(['get'])
@@ -63,7 +68,7 @@ def test_obsolete():
     ip.get = MethodType(lambda s, o: False, ip)
 
     pm = _ProxyManager()
-    ip_p = pm.make_proxy(ip, WeakRef(),
+    ip_p = pm.make_proxy(ip, Instance(),
                          {'get': lambda s, o: True, 'toto': 'test'})
     assert not ip_p.obsolete
 
@@ -72,3 +77,20 @@ def test_obsolete():
 
     ip_p.unpatch(['toto'])
     assert ip_p.obsolete
+
+
+def test_proxies_store_only_overridden_attributes():
+    ip = IProperty(getter=True, checks='{a} == 1')
+    ip.dec = '<br>'
+    pm = _ProxyManager()
+    ip_p = pm.make_proxy(ip, Instance(), {'dec': '<it>', 'name': ip.name,
+                                          'get_check': ip.get_check})
+    assert set(ip_p.__dict__) == {'_iprop', 'dec'}
+    assert ip_p.get_check.__self__ is ip_p
+    assert ip_p._secur == ip._secur
+
+    ip_p2 = pm.make_proxy(ip, Instance(), {})
+    assert type(ip_p2) is type(ip_p)
+    assert ip_p2.obsolete
+    ip_p.patch({'dec': ip.dec})
+    assert ip_p.obsolete
@@ -11,9 +11,9 @@
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
-from pytest import raises
+from pytest import raises, importorskip
 
-from eapii.core.iprops.register import Register
+from eapii.core.iprops.register import Register, BitField
 
 
 class TestRegister(object):
@@ -33,3 +33,104 @@ class TestRegister(object):
     def test_pre_set(self):
         r = Register('a', names={'a': 0, 'b': 1, 'r': 3})
         assert r.pre_set(None, {'a': True, 'b': False}) == 1
+
+    def test_flags(self):
+        r = Register('a', names=('a', 'b', None, 'r', None, None, None, None))
+        flags = r.post_get(None, '10')
+        assert not hasattr(flags, '__dict__')
+        assert flags.table is r.table
+        assert int(flags) == 10
+        assert flags[1] and flags[3] and not flags[0]
+        assert 'r' in flags and 'c' not in flags
+        assert flags.get('c', 1) == 1
+        assert list(flags) == ['a', 'b', 2, 'r', 4, 5, 6, 7]
+        assert flags == {'a': False, 'b': True, 2: False, 'r': True, 4: False,
+                         5: False, 6: False, 7: False}
+        assert flags == r.post_get(None, 10)
+        assert flags != r.post_get(None, 11)
+        with raises(KeyError):
+            flags['c']
+
+    def test_set_flags_and_int(self):
+        r = Register('a', 'b', names=('a', 'b', None, 'r', None, None, None,
+                                      None))
+        assert r.pre_set(None, r.post_get(None, 9)) == 9
+        assert r.pre_set(None, 9) == 9
+        with raises(ValueError):
+            r.pre_set(None, 256)
+        with raises(ValueError):
+            r.pre_set(None, {'c': True})
+
+    def test_set_with_checks(self):
+        r = Register('a', 'b', names={'a': 0}, checks=(None, 'value'))
+        assert r.pre_set(None, {'a': True}) == 1
+
+    def test_length(self):
+        r = Register('a', names={'overflow': 15}, length=16)
+        flags = r.post_get(None, 2**15 + 1)
+        assert flags['overflow'] and flags[0] and len(flags) == 16
+        assert r.clone().post_get(None, 1)[0]
+        with raises(ValueError):
+            Register('a', length=0)
+        with raises(ValueError):
+            Register('a', names=('a',)*8)
+
+    def test_decode_array(self):
+        np = importorskip('numpy')
+        r = Register('a', names={'a': 0, 'b': 31}, length=32)
+        states = r.decode_array(np.array([1, 2**31, 2**31 + 1], dtype='u4'))
+        assert list(states['a']) == [True, False, True]
+        assert list(states['b']) == [False, True, True]
+        assert list(states[1]) == [False]*3
+
+    def test_fields(self):
+        r = Register('a', names={'error': 0,
+                                 'range': BitField(4, 3, {'1V': 1, '10V': 2}),
+                                 'count': BitField(8, 4)}, length=16)
+        assert r.names == ('error', 1, 2, 3, 'range', 7, 'count', 12, 13, 14,
+                           15)
+        flags = r.post_get(None, 0x521)
+        assert flags['error'] and flags['range'] == '10V'
+        assert flags['count'] == 5 and flags[5] and not flags[4]
+        assert flags.get('range') == '10V'
+        assert r.post_get(None, 0x70)['range'] == 7
+        assert r.pre_set(None, {'error': True, 'range': '1V', 'count': 3})\
+            == 0x311
+        with raises(ValueError):
+            r.pre_set(None, {'range': '100V'})
+        with raises(ValueError):
+            r.pre_set(None, {'count': 16})
+
+    def test_wide_register(self):
+        r = Register('a', names={'last': 63, 'word': BitField(16, 32)},
+                     length=64)
+        value = 2**63 + 2**20
+        flags = r.post_get(None, str(value))
+        assert flags['last'] and flags['word'] == 16
+        assert r.pre_set(None, dict(flags.items())) == value
+
+    def test_shared_tables(self):
+        layout = {'a': 0, 'f': BitField(2, 2, {'x': 1})}
+        r1 = Register('a', names=layout)
+        r2 = Register('b', names=dict(layout))
+        assert r1.table is r2.table
+        assert Register('a', names={'a': 0}).table is not r1.table
+
+    def test_invalid_layouts(self):
+        with raises(ValueError):
+            Register('a', names={'a': BitField(6, 4)})
+        with raises(ValueError):
+            Register('a', names={'a': BitField(0, 4), 'b': 2})
+        with raises(ValueError):
+            Register('a', names={'a': BitField(0, 4), 'b': 0})
+        with raises(ValueError):
+            BitField(0, 0)
+
+    def test_decode_array_fields(self):
+        np = importorskip('numpy')
+        r = Register('a', names={'range': BitField(4, 3, {'1V': 1}),
+                                 'count': BitField(8, 4)}, length=16)
+        states = r.decode_array([0x010, 0x520, 0x010])
+        assert list(states['range']) == ['1V', 2, '1V']
+        assert list(states['count']) == [0, 5, 0]
+        assert list(states[0]) == [False]*3
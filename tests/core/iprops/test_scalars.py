@@ -11,7 +11,7 @@
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
-from pytest import raises
+from pytest import raises, approx
 
 from eapii.core.iprops.scalars import Unicode, Int, Float
 from eapii.core.range import IntRangeValidator, FloatRangeValidator
@@ -67,6 +67,23 @@ class TestInt(object):
         with raises(ValueError):
             i.pre_set(o, 1)
 
+    def test_coerce(self):
+        i = Int(setter=True, range=IntRangeValidator(2, 8, step=2),
+                coerce=True)
+        assert i.pre_set(None, 3) == 4
+        assert i.pre_set(None, 11) == 8
+        assert i.creation_kwargs['coerce']
+
+        i = Int(setter=True, range=IntRangeValidator(0, 10), coerce=True)
+        assert i.pre_set(None, 3.7) == 4
+        assert i.pre_set(None, 11.2) == 10
+
+    def test_coerce_without_range(self):
+        with raises(ValueError):
+            Int(setter=True, values=(1, 2), coerce=True)
+        with raises(ValueError):
+            Float(setter=True, values=(1.0, 2.0), coerce=True)
+
 
 class TestFloat(object):
 
@@ -104,6 +121,11 @@ class TestFloat(object):
         with raises(ValueError):
             f.pre_set(o, 0.2)
 
+    def test_post_get_without_quantity(self):
+        f = Float(unit='V', quantity=False)
+        assert f.post_get(None, '0.1') == 0.1
+        assert f.creation_kwargs['quantity'] is False
+
     def test_set_with_unit(self):
         f = Float(setter=True, unit='mV')
         u = get_unit_registry()
@@ -144,3 +166,25 @@ class TestFloat(object):
         assert f.pre_set(o, u.parse_expression('200 mV')) == 0.2
         with raises(ValueError):
             f.pre_set(o, u.parse_expression('100 mV'))
+
+    def test_coerce_with_units(self):
+        f = Float(setter=True, unit='V', coerce=True,
+                  range=FloatRangeValidator(-1.0, 1.0, 0.01, unit='mV'))
+        u = get_unit_registry()
+        assert f.pre_set(None, 0.0005) == 0.0005
+        assert f.pre_set(None, 2.0) == approx(0.001)
+        value = u.parse_expression('0.123456 mV')
+        assert f.pre_set(None, value) == approx(0.00012)
+
+    def test_coerced_values_are_not_cached(self):
+
+        class Coercer(Parent):
+            caching_permissions = ('test',)
+
+            test = Float('Test', 'Test', coerce=True,
+                         range=FloatRangeValidator(0.0, 1.0, 0.1))
+
+        o = Coercer()
+        o.test = 0.55
+        assert o.d_set_args == (0.6,)
+        assert 'test' not in o._cache
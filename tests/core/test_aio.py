@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Module dedicated to testing the asynchronous access to IProperties.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from threading import Event
+
+import pytest
+
+asyncio = pytest.importorskip('asyncio')
+
+from eapii.core.aio import get_executor, shutdown_executor
+from eapii.core.iprops.i_property import IProperty
+from eapii.core.subsystem import SubSystem
+from .testing_tools import Parent
+
+
+class AsyncDriver(Parent):
+
+    caching_permissions = ('cached',)
+
+    value = IProperty(getter='VAL?', setter='VAL {}')
+
+    cached = IProperty(getter='CACHED?')
+
+    checked = IProperty(getter='CHECK?', checks="{cached} == 'OK'")
+
+    ss = SubSystem()
+    ss.sub = IProperty(getter='SUB?')
+
+    def __init__(self, wait_for=None, release=None):
+        super(AsyncDriver, self).__init__()
+        self.log = []
+        self.wait_for = wait_for
+        self.release = release
+
+    def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+        if self.release is not None:
+            self.release.set()
+        if self.wait_for is not None:
+            assert self.wait_for.wait(1)
+        self.log.append(cmd)
+        return super(AsyncDriver, self).default_get_iproperty(iprop, cmd)
+
+    def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
+        self.log.append(cmd.format(*args))
+        super(AsyncDriver, self).default_set_iproperty(iprop, cmd)
+
+
+def run(*calls):
+    """Run the operations returned by the calls in a new event loop.
+
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(asyncio.gather(*[c() for c in calls]))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def test_aget_aset():
+    driver = AsyncDriver()
+    assert run(lambda: driver.aget('value')) == ['VAL?']
+    run(lambda: driver.aset('value', 2))
+    assert driver.log == ['VAL?', 'VAL 2']
+
+
+def test_aget_uses_cache():
+    driver = AsyncDriver()
+    get = lambda: driver.aget('cached')
+    assert run(get, get) == ['CACHED?', 'CACHED?']
+    assert driver.log == ['CACHED?']
+
+
+def test_aget_checks():
+    driver = AsyncDriver()
+    with pytest.raises(AssertionError):
+        run(lambda: driver.aget('checked'))
+
+
+def test_ordering():
+    driver = AsyncDriver()
+    run(lambda: driver.aset('value', 1), lambda: driver.ss.aget('sub'),
+        lambda: driver.aget('value'), lambda: driver.aset('value', 2))
+    assert driver.log == ['VAL 1', 'SUB?', 'VAL?', 'VAL 2']
+
+
+def test_many():
+    driver = AsyncDriver()
+    run(lambda: driver.aset_many([('value', 1)]))
+    values = run(lambda: driver.aget_many(['value', 'cached']))[0]
+    assert list(values.values()) == ['VAL?', 'CACHED?']
+
+
+def test_concurrent_instruments():
+    """The first driver can only answer once the second one was accessed.
+
+    """
+    event = Event()
+    driver1 = AsyncDriver(wait_for=event)
+    driver2 = AsyncDriver(release=event)
+    run(lambda: driver1.aget('value'), lambda: driver2.aget('value'))
+    assert driver1.log == driver2.log == ['VAL?']
+
+
+def test_executor_shared():
+    driver = AsyncDriver()
+    assert get_executor(driver.ss) is get_executor(driver)
+    executor = get_executor(driver)
+    shutdown_executor(driver.ss)
+    assert get_executor(driver) is not executor
@@ -12,8 +12,11 @@
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
 from nose.tools import assert_equal, assert_is
+from pytest import raises
 
-from eapii.core.channel import Channel
+from eapii.core.channel import Channel, ChannelCollection
+from eapii.core.iprops.api import Float, Unicode
+from eapii.core.subsystem import SubSystem
 from .testing_tools import Parent
 
 
@@ -33,6 +36,17 @@ def test_ch_d_get():
     assert_equal(a.d_get_kwargs, {'ch_id': 1, 'a': 2})
 
 
+def test_ch_d_get_many():
+
+    a = ChParent()
+    ch = a.get_ch(1)
+    res = ch.default_get_iproperties([None, None], ['T1', 'T2'], 1, a=2)
+    assert_equal(res, ['T1', 'T2'])
+    assert_equal(a.d_get_called, 2)
+    assert_equal(a.d_get_args, (1,))
+    assert_equal(a.d_get_kwargs, {'ch_id': 1, 'a': 2})
+
+
 def test_ch_d_set():
 
     a = ChParent()
@@ -63,3 +77,155 @@ def test_ch_reop():
     ch = a.get_ch(1)
     ch.reopen_connection()
     assert_equal(a.ropen_called, 1)
+
+
+class InnerSS(SubSystem):
+
+    inner = Channel()
+
+
+class MiddleCh(Channel):
+
+    sub = InnerSS()
+
+
+class OuterSS(SubSystem):
+
+    ch = MiddleCh()
+
+
+class NestedParent(Parent):
+
+    ss = OuterSS()
+
+
+def test_ch_nested_route():
+    a = NestedParent()
+    inner = a.ss.get_ch(1).sub.get_inner(2)
+    assert_is(inner.root, a)
+    assert_is(inner.lock, a.lock)
+    inner.default_set_iproperty(None, 'Test', 1)
+    assert_equal(a.d_set_kwargs, {'ch_id': 1})
+
+
+class Overriding(SubSystem):
+
+    inner = Channel()
+
+    def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+        kwargs['overridden'] = True
+        return self.parent.default_get_iproperty(iprop, cmd, *args, **kwargs)
+
+
+class OverridingCh(Channel):
+
+    ss = Overriding()
+
+
+class OverridingParent(Parent):
+
+    ch = OverridingCh()
+
+
+def test_ch_intermediate_override():
+    a = OverridingParent()
+    a.get_ch(1).ss.get_inner(2).default_get_iproperty(None, 'Test')
+    assert_equal(a.d_get_kwargs, {'ch_id': 1, 'overridden': True})
+
+
+class ValueChannel(Channel):
+
+    value = Float('1.5', 'V {}')
+
+    mode = Unicode('M?', 'M {}')
+
+    def _get_mode(self, iprop):
+        return 'Mode{}'.format(self.id)
+
+
+class CollectionParent(Parent):
+
+    caching_permissions = {'ch': {'value': True}}
+
+    ch = ValueChannel()
+
+    def list_chs(self):
+        return [1, 2, 3]
+
+
+class BulkParent(Parent):
+
+    caching_permissions = {'ch': {'value': True}}
+
+    ch = ValueChannel()
+
+    def __init__(self):
+        super(BulkParent, self).__init__()
+        self.bulk_calls = []
+
+    def default_get_channels(self, iprop, cmd, ch_ids, *args, **kwargs):
+        self.bulk_calls.append((cmd, ch_ids))
+        return ['{}.5'.format(i) for i in ch_ids]
+
+    def default_set_channels(self, iprop, cmd, values, ch_ids, *args,
+                             **kwargs):
+        self.bulk_calls.append((cmd, values, ch_ids))
+
+
+def test_get_channels():
+    a = CollectionParent()
+    chs = a.get_channels([2, 1])
+    assert_equal(chs.ids, (2, 1))
+    assert_is(chs[1], a.get_ch(1))
+    assert_equal(len(a.get_channels()), 3)
+    with raises(ValueError):
+        a.get_channels([1], 'dummy')
+    with raises(ValueError):
+        ChannelCollection([])
+
+
+def test_collection_fallback():
+    a = CollectionParent()
+    chs = a.get_channels()
+    assert_equal(list(chs.value), [1.5]*3)
+    assert_equal(a.d_get_called, 3)
+    assert_equal(a.d_get_kwargs, {'ch_id': 3})
+    chs.value
+    assert_equal(a.d_get_called, 3)
+
+    chs.value = [1.0, 2.0, 3.0]
+    assert_equal(a.d_set_called, 3)
+    assert_equal(a.d_set_args, (3.0,))
+    assert_equal(a.d_set_kwargs, {'ch_id': 3})
+    chs.value = 2.0
+    assert_equal(a.d_set_called, 5)
+    assert_equal(a.get_ch(2).value, 2.0)
+
+    with raises(ValueError):
+        chs.value = [1.0, 2.0]
+    with raises(AttributeError):
+        chs.dummy = 1
+
+
+def test_collection_bulk():
+    a = BulkParent()
+    chs = a.get_channels([1, 2])
+    a.get_ch(1).value
+    assert_equal(list(chs.value), [1.5, 2.5])
+    assert_equal(a.bulk_calls, [('1.5', [2])])
+
+    chs.value = [1.0, 2.0]
+    assert_equal(a.bulk_calls[-1], ('V {}', [1.0, 2.0], [1, 2]))
+    assert_equal(list(chs.value), [1.0, 2.0])
+
+    # IProperties with a custom get are retrieved channel by channel.
+    assert_equal(chs.mode, ['Mode1', 'Mode2'])
+    assert_equal(len(a.bulk_calls), 2)
+
+
+def test_collection_patched_channel():
+    a = BulkParent()
+    chs = a.get_channels([1, 2])
+    a.get_ch(2).patch_iprop('value', post_get=lambda p, o, v: 0.0)
+    assert_equal(list(chs.value), [1.5, 0.0])
+    assert_equal(a.bulk_calls, [])
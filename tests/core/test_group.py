@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Module dedicated to testing the InstrumentGroup.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from threading import Event, Lock
+
+from pytest import raises
+
+from eapii.core.errors import InstrIOError
+from eapii.core.group import InstrumentGroup, GroupError
+from eapii.core.iprops.i_property import IProperty
+from .testing_tools import Parent
+
+
+class BusUsage(object):
+    """Record the maximal number of simultaneous communications on a bus.
+
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.current = 0
+        self.max = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.max = max(self.max, self.current)
+
+    def __exit__(self, *args):
+        with self.lock:
+            self.current -= 1
+
+
+class GroupDriver(Parent):
+
+    value = IProperty(getter='VAL?', setter='VAL {}')
+
+    def __init__(self, index, bus_id=None, usage=None, wait_for=None,
+                 release=None):
+        super(GroupDriver, self).__init__()
+        self.index = index
+        self.bus_id = bus_id
+        self.usage = usage or BusUsage()
+        self.wait_for = wait_for
+        self.release = release
+        self.values = []
+
+    def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+        with self.usage:
+            if self.release is not None:
+                self.release.set()
+            if self.wait_for is not None:
+                assert self.wait_for.wait(1)
+            if self.index < 0:
+                raise InstrIOError()
+            return self.index
+
+    def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
+        if self.index < 0:
+            raise InstrIOError()
+        self.values.append(args[0])
+
+
+def test_get_ordered():
+    instrs = [GroupDriver(i) for i in range(5)]
+    with InstrumentGroup(instrs, max_workers=2) as group:
+        assert group.get('value') == list(range(5))
+
+
+def test_set():
+    instrs = [GroupDriver(i) for i in range(3)]
+    group = InstrumentGroup(instrs)
+    group.set('value', [1, 2, 3])
+    group.set_all('value', 4)
+    assert [i.values for i in instrs] == [[1, 4], [2, 4], [3, 4]]
+    with raises(ValueError):
+        group.set('value', [1])
+    group.close()
+
+
+def test_many():
+    instrs = [GroupDriver(i) for i in range(3)]
+    group = InstrumentGroup(instrs)
+    group.set_many([{'value': i} for i in range(3)])
+    assert [list(v.values()) for v in group.get_many(['value'])] == \
+        [[0], [1], [2]]
+
+
+def test_error_aggregation():
+    instrs = [GroupDriver(i) for i in (0, -1, 2, -1)]
+    group = InstrumentGroup(instrs)
+    with raises(GroupError) as e:
+        group.get('value')
+    assert list(e.value.errors) == [1, 3]
+    assert e.value.results == [0, None, 2, None]
+
+
+def test_bus_serialization():
+    usage = BusUsage()
+    instrs = [GroupDriver(i, 'GPIB0', usage) for i in range(4)]
+    group = InstrumentGroup(instrs)
+    assert group.get('value') == list(range(4))
+    assert usage.max == 1
+
+
+def test_buses_in_parallel():
+    """The first instrument can only answer once the second one was accessed.
+
+    """
+    event = Event()
+    instrs = [GroupDriver(0, 'GPIB0', wait_for=event),
+              GroupDriver(1, 'GPIB1', release=event)]
+    with InstrumentGroup(instrs) as group:
+        assert group.get('value') == [0, 1]
+
+
+def test_empty_group():
+    with raises(ValueError):
+        InstrumentGroup([])
@@ -11,10 +11,11 @@
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
-from threading import RLock
+from threading import RLock, Thread, Event
 from pytest import raises
 
-from eapii.core.has_i_props import HasIProps, set_iprop_paras
+from eapii.core.has_i_props import (HasIProps, set_iprop_paras, depends_on,
+                                    UNTIL_SET)
 from eapii.core.subsystem import SubSystem
 from eapii.core.channel import Channel
 from eapii.core.iprops.i_property import IProperty
@@ -31,7 +32,7 @@ class HasIPropsTester(HasIProps):
     def reopen_connection(self):
         pass
 
-    def default_check_instr_operation(self, iprop):
+    def default_check_instr_operation(self, iprop, value, i_value):
         return True, None
 
 
@@ -47,6 +48,49 @@ def test_documenting_i_prop():
         'This is the docstring for the IProperty test.'
 
 
+def test_lazy_documenting_i_prop():
+
+    class LazyDocTester(HasIPropsTester):
+
+        #: Docstring.
+        test = IProperty()
+
+        test2 = IProperty()
+
+    assert '_doc_source' in LazyDocTester.test.__dict__
+
+    class LazyDocChild(LazyDocTester):
+
+        test = set_iprop_paras(secure_comm=1)
+
+        def _get_test2(self, iprop):
+            pass
+
+    assert LazyDocChild.test.__doc__ == 'Docstring.'
+    assert LazyDocChild.test2.__doc__ == ''
+    assert '_doc_source' not in LazyDocChild.test.__dict__
+    assert '_doc_source' in LazyDocTester.test.__dict__
+    assert LazyDocTester.test.__doc__ == 'Docstring.'
+    assert IProperty.__doc__.startswith('Descriptor')
+
+
+def test_documenting_i_prop_no_source(monkeypatch):
+
+    from eapii.core.iprops import i_property
+
+    def false_getsourcelines(obj):
+        raise IOError()
+
+    monkeypatch.setattr(i_property, 'getsourcelines', false_getsourcelines)
+
+    class NoSourceDocTester(HasIPropsTester):
+
+        #: Docstring.
+        test = IProperty()
+
+    assert NoSourceDocTester.test.__doc__ is None
+
+
 def test_overriding_get():
 
     class NoOverrideGet(HasIPropsTester):
@@ -326,6 +370,235 @@ class TestHasIPropsCache(object):
                        'ch': {1: {'aux': 1}, 2: {'aux': 2}}}
 
 
+class TestCachePolicies(object):
+
+    def setup(self):
+
+        class PolicySS(SubSystem):
+            caching_permissions = {'state': UNTIL_SET}
+            state = IProperty(getter=True)
+
+            def _get_state(self, iprop):
+                self.parent.reads += 1
+                return self.parent.reads
+
+        class PolicyTest(HasIPropsTester):
+            caching_permissions = {'forever': True, 'long': 100,
+                                   'short': 0, 'until': UNTIL_SET, 'ss': True}
+            forever = IProperty(getter=True, setter=True)
+            long = IProperty(getter=True)
+            short = IProperty(getter=True)
+            until = IProperty(getter=True)
+
+            ss = PolicySS()
+
+            def __init__(self, **kwargs):
+                super(PolicyTest, self).__init__(**kwargs)
+                self.reads = 0
+
+            def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+                self.reads += 1
+                return self.reads
+
+            def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
+                pass
+
+            def _get_forever(self, iprop):
+                return self.default_get_iproperty(iprop, None)
+
+            _get_long = _get_short = _get_until = _get_forever
+
+            def _set_forever(self, iprop, value):
+                pass
+
+        self.cls = PolicyTest
+        self.a = PolicyTest()
+
+    def test_policies_parsing(self):
+        a = self.a
+        assert a._caching_permissions == set(['forever', 'until', 'ss'])
+        assert a._cache_ttls == {'long': 100, 'short': 0}
+        assert a._until_set == set(['until'])
+        assert a._until_set_owners == [a, a.ss]
+
+        b = self.cls(caching_permissions={'long': False, 'short': UNTIL_SET})
+        assert b._caching_permissions == set(['forever', 'until', 'short',
+                                              'ss'])
+        assert b._cache_ttls == {}
+
+    def test_ttl(self):
+        a = self.a
+        assert a.long == a.long == 1
+        assert a.short == 2
+        assert a.short == 3
+        assert a.check_cache(channels=False) == {'long': 1, 'ss': {}}
+
+    def test_until_set(self):
+        a = self.a
+        assert a.until == a.until == 1
+        assert a.ss.state == a.ss.state == 2
+        a.forever = 5
+        assert 'until' not in a._cache
+        assert a.forever == 5
+        assert a.until == 3
+        assert a.ss.state == 4
+
+    def test_until_set_through_proxy(self):
+        a = self.a
+        a.patch_iprop('forever', post_set=lambda iprop, obj, v, i_v: None)
+        assert a.until == 1
+        a.forever = 5
+        assert 'until' not in a._cache
+        assert a.until == 2
+        # Generic setter used when the accessors are not compiled.
+        type(a).forever._set(a, 6)
+        assert 'until' not in a._cache
+
+    def test_max_age(self):
+        a = self.a
+        assert a.forever == 1
+        assert a.long == 2
+        assert a.get_many(['forever', 'long']) == {'forever': 1, 'long': 2}
+        assert a.get_many(['forever', 'long'], max_age=0) == {'forever': 3,
+                                                              'long': 4}
+        assert a.get_many(['forever', 'long'], max_age=100) == {'forever': 3,
+                                                                'long': 4}
+
+    def test_max_age_only_affects_requested_names(self):
+        a = self.a
+        assert a.forever == 1
+        assert a.until == 2
+        assert a.long == 3
+        assert a.get_many(['forever'], max_age=0) == {'forever': 4}
+        assert a.until == 2
+        assert a.long == 3
+
+    def test_clearing_timed_cache(self):
+        a = self.a
+        assert a.long == 1
+        del a.long
+        assert a.long == 2
+        a.clear_cache()
+        assert a.long == 3
+        assert a.check_cache(properties=['long']) == {'long': 3}
+
+    def test_cached_reads_do_not_take_the_lock(self):
+        a = self.a
+        assert a.forever == 1
+        assert a.long == 2
+        held, release = Event(), Event()
+
+        def hold_lock():
+            with a.lock:
+                held.set()
+                release.wait(5)
+
+        holder = Thread(target=hold_lock)
+        holder.start()
+        held.wait(5)
+        results = []
+        reader = Thread(target=lambda: results.append(a.short))
+        try:
+            assert a.forever == 1
+            assert type(a).forever._get(a) == 1
+            assert a.long == 2
+            reader.start()
+            reader.join(0.05)
+            assert reader.is_alive()
+        finally:
+            release.set()
+            holder.join()
+        reader.join(5)
+        assert results == [3]
+
+
+class TestDependencies(object):
+
+    def setup(self):
+
+        class DependenciesTester(HasIPropsTester):
+            caching_permissions = ('mode', 'range', 'value', 'other')
+            mode = IProperty(getter=True, setter=True)
+            range = IProperty(getter=True, setter=True, depends_on=('mode',))
+            value = IProperty(getter=True, setter=True,
+                              depends_on=('range',))
+            other = IProperty(getter=True, setter=True)
+
+            def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+                return 1
+
+            def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
+                pass
+
+            _get_mode = _get_range = _get_value = _get_other = \
+                lambda self, iprop: 1
+
+            _set_mode = _set_range = _set_value = _set_other = \
+                lambda self, iprop, value: None
+
+            def _range_range(self):
+                return None
+
+            @depends_on('other')
+            def _range_custom(self):
+                return None
+
+        self.cls = DependenciesTester
+        self.obj = DependenciesTester()
+
+    def test_graph(self):
+        deps = self.cls.__dependents__
+        assert set(deps) == set(['mode', 'range', 'other'])
+        assert set(deps['mode'][0]) == set(['range', 'value'])
+        assert deps['mode'][1] == ('range',)
+        assert deps['range'] == (('value',), ('range',))
+        assert deps['other'] == ((), ('custom',))
+
+    def test_inherited_graph(self):
+
+        class Child(self.cls):
+            dependent = IProperty(getter=True, depends_on=('value',))
+
+        assert set(Child.__dependents__['mode'][0]) == set(['range', 'value',
+                                                            'dependent'])
+        assert 'dependent' not in self.cls.__dependents__['mode'][0]
+
+    def test_invalid_dependency(self):
+        with raises(AttributeError):
+            class Invalid(HasIPropsTester):
+                test = IProperty(getter=True, depends_on=('dummy',))
+
+        with raises(AttributeError):
+            class InvalidRange(HasIPropsTester):
+                @depends_on('dummy')
+                def _range_test(self):
+                    pass
+
+    def test_invalidation(self):
+        obj = self.obj
+        obj.get_many(['mode', 'range', 'value', 'other'])
+        obj.get_range('range')
+        obj.get_range('custom')
+        obj.mode = 2
+        assert obj._cache == {'mode': 2, 'other': 1}
+        assert obj._range_cache == {'custom': None}
+
+        obj.other = 2
+        assert obj._range_cache == {}
+
+    def test_invalidation_generic_accessor(self):
+        obj = self.obj
+        obj.get_many(['mode', 'range', 'value'])
+        type(obj).mode._set(obj, 2)
+        assert obj._cache == {'mode': 2}
+
+    def test_no_invalidation_if_unchanged(self):
+        obj = self.obj
+        obj.get_many(['mode', 'range', 'value'])
+        obj.mode = 1
+        assert obj._cache == {'mode': 1, 'range': 1, 'value': 1}
+
+
 def test_customizing():
 
     class DecorateIP(IProperty):
@@ -355,6 +628,130 @@ def test_customizing():
     assert aux2.test.startswith('<it>')
 
 
+def test_customized_iprop_name():
+
+    class ParentTester(HasIPropsTester):
+        test = IProperty(getter=True)
+
+    class CustomizationTester(ParentTester):
+
+        test = set_iprop_paras(secure_comm=1)
+
+        def _get_test(self, iprop):
+            return iprop.name
+
+    assert CustomizationTester.test.name == 'test'
+    assert CustomizationTester.__iprops__['test'] is CustomizationTester.test
+    assert CustomizationTester().test == 'test'
+
+
+def test_compiled_accessors():
+
+    class CompiledTester(HasIPropsTester):
+        test = IProperty(getter=True, setter=True)
+
+        def _get_test(self, iprop):
+            return 'this is a test'
+
+        def _set_test(self, iprop, value):
+            self.val = value
+
+    iprop = CompiledTester.test
+    assert iprop.fget != iprop._get
+    assert iprop.fset != iprop._set
+
+    o = CompiledTester()
+    assert o.test == 'this is a test'
+    o.test = 1
+    assert o.val == 1
+
+
+class TestGetSetMany(object):
+
+    def setup(self):
+
+        class ManyTester(HasIPropsTester):
+            caching_permissions = ('cached',)
+
+            test1 = IProperty(getter='t1')
+            test2 = IProperty(getter='t2', setter='t2')
+            cached = IProperty(getter='c')
+            custom = IProperty(getter=True)
+            checked = IProperty(getter='ch', checks='{cached} == "c!"')
+
+            def __init__(self):
+                super(ManyTester, self).__init__()
+                self.batches = []
+                self.setted = []
+
+            def default_get_iproperty(self, iprop, cmd, *args, **kwargs):
+                return cmd
+
+            def default_get_iproperties(self, iprops, cmds, *args, **kwargs):
+                self.batches.append(cmds)
+                return [cmd + '!' for cmd in cmds]
+
+            def default_set_iproperty(self, iprop, cmd, *args, **kwargs):
+                self.setted.append((cmd, args))
+
+            def _get_custom(self, iprop):
+                return 'custom'
+
+        self.obj = ManyTester()
+
+    def test_get_many(self):
+        obj = self.obj
+        values = obj.get_many(['custom', 'test1', 'cached', 'test2'])
+        assert list(values) == ['custom', 'test1', 'cached', 'test2']
+        assert list(values.values()) == ['custom', 't1!', 'c!', 't2!']
+        assert obj.batches == [['t1', 'c', 't2']]
+        assert obj._cache == {'cached': 'c!'}
+
+    def test_get_many_uses_cache(self):
+        obj = self.obj
+        assert obj.cached == 'c'
+        values = obj.get_many(['cached', 'test1'])
+        assert values == {'cached': 'c', 'test1': 't1!'}
+        assert obj.batches == [['t1']]
+
+    def test_get_many_hooks(self):
+        obj = self.obj
+        obj.patch_iprop('test1', post_get=lambda p, o, v: v*2)
+        values = obj.get_many(['test1', 'test2'])
+        assert values == {'test1': 't1t1', 'test2': 't2!'}
+
+    def test_get_many_prefetches_check_refs(self):
+        obj = self.obj
+        values = obj.get_many(['checked', 'test2'])
+        assert values == {'checked': 'ch!', 'test2': 't2!'}
+        assert obj.batches == [['c'], ['ch', 't2']]
+
+    def test_get_many_secure_comm(self):
+        obj = self.obj
+        obj.secure_com_exceptions = (RuntimeError,)
+        ropen = []
+        obj.reopen_connection = lambda: ropen.append(True)
+
+        def failing(iprops, cmds):
+            if not ropen:
+                raise RuntimeError()
+            return cmds
+
+        obj.default_get_iproperties = failing
+        with raises(RuntimeError):
+            obj.get_many(['test1'])
+
+        type(obj).test1._secur = 1
+        assert obj.get_many(['test1']) == {'test1': 't1'}
+        assert ropen == [True]
+
+    def test_set_many(self):
+        obj = self.obj
+        obj.set_many([('test2', 1), ('test2', 2)])
+        obj.set_many({'test2': 3})
+        assert obj.setted == [('t2', (1,)), ('t2', (2,)), ('t2', (3,))]
+
+
 class TestPatching(object):
 
     def setup(self):
@@ -388,9 +785,10 @@ class TestPatching(object):
 
         self.obj.patch_iprop('test', dec='<it>')
         p = type(self.obj).test
-        assert p in self.obj._proxied
-        assert self.obj in p._proxies
+        assert self.obj._proxies['test']._iprop is p
+        assert 'test' not in self.obj2._proxies
         assert self.obj.test == '<it>this is a test<it>'
+        assert self.obj2.test == '<br>this is a test<br>'
 
     def test_patching_method(self):
 
@@ -398,17 +796,14 @@ class TestPatching(object):
                              set=lambda p, o, v: setattr(o, 'val', 2*v))
         p = type(self.obj).test2
         self.obj.test2 = 1
-        assert p in self.obj._proxied
-        assert self.obj in p._proxies
+        assert self.obj._proxies['test2']._iprop is p
         # This means that pre_set was correctly preserved.
         assert self.obj.val == 1
 
     def test_patching_already_patched_iprop(self):
         self.obj.patch_iprop('test', dec='<it>')
         self.obj.patch_iprop('test', post_get=lambda p, o, v: '<tt>'+v)
-        p = type(self.obj).test
-        assert len(self.obj._proxied) == 1
-        assert len(p._proxies) == 1
+        assert len(self.obj._proxies) == 1
         assert self.obj.test == '<tt>this is a test'
 
     def test_unpatching_attr_proxy_kept(self):
@@ -420,9 +815,7 @@ class TestPatching(object):
     def test_unpatching_attr_proxy_discarded(self):
         self.obj.patch_iprop('test', dec='<it>')
         self.obj.unpatch_iprop('test', 'dec')
-        p = type(self.obj).test
-        assert p not in self.obj._proxied
-        assert self.obj not in p._proxies
+        assert 'test' not in self.obj._proxies
         assert self.obj.test == '<br>this is a test<br>'
 
     def test_unpatching_method_proxy_kept(self):
@@ -434,9 +827,7 @@ class TestPatching(object):
     def test_unpatching_method_proxy_discarded(self):
         self.obj.patch_iprop('test', post_get=lambda p, o, v: '<tt>'+v+p.dec)
         self.obj.unpatch_iprop('test', 'post_get')
-        p = type(self.obj).test
-        assert p not in self.obj._proxied
-        assert self.obj not in p._proxies
+        assert 'test' not in self.obj._proxies
         assert self.obj.test == '<br>this is a test<br>'
 
     def test_raising_error(self):
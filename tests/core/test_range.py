@@ -11,7 +11,7 @@
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
-from pytest import raises
+from pytest import raises, importorskip
 
 from eapii.core.range import IntRangeValidator, FloatRangeValidator
 from eapii.core.unit import get_unit_registry
@@ -165,3 +165,86 @@ class TestFloatRangeValidator(object):
         assert fv.validate(0.1)
         assert fv.validate(100*u.parse_expression('mV'))
         assert not fv.validate(0.1*u.parse_expression('kV'))
+
+
+class TestValidateArray(object):
+
+    def setup(self):
+        self.np = importorskip('numpy')
+
+    def test_int_array(self):
+        np = self.np
+        iv = IntRangeValidator(1, 9, 2)
+        values = np.array([1, 3, 4, 9, 11, -1])
+        mask = iv.validate_array(values)
+        assert list(mask) == [iv.validate(v) for v in values]
+        assert iv.validate_array(values, first_invalid=True) == 2
+        assert iv.validate_array(values[:2], first_invalid=True) is None
+
+    def test_float_array(self):
+        np = self.np
+        for fv in (FloatRangeValidator(1.1, 4.2, 0.02),
+                   FloatRangeValidator(1.0, step=0.1),
+                   FloatRangeValidator(max=5.1, step=0.0001),
+                   FloatRangeValidator(1.5, 4.2)):
+            values = np.array([1.1, 1.12, 4.01, 4.2, 5.00001, 0.0, 1.5,
+                               10000000.9])
+            mask = fv.validate_array(values)
+            assert list(mask) == [fv.validate(v) for v in values]
+
+    def test_quantity_array(self):
+        np = self.np
+        fv = FloatRangeValidator(-1.0, 1.0, 0.1, unit='V')
+        u = get_unit_registry()
+        values = np.array([100., 250., 2000.])*u.parse_expression('mV')
+        assert list(fv.validate_array(values)) == [True, False, False]
+        assert fv.validate_array(values, first_invalid=True) == 1
+        assert list(fv.validate_array([0.1, 2.0])) == [True, False]
+
+
+class TestCoerce(object):
+
+    def test_int_coerce(self):
+        iv = IntRangeValidator(1, 10, 2)
+        assert [iv.coerce(v) for v in (-3, 1, 4, 6, 10, 12)] ==\
+            [1, 1, 5, 7, 9, 9]
+        assert IntRangeValidator(max=5).coerce(7) == 5
+        assert IntRangeValidator(max=5, step=2).coerce(2) == 3
+        coerced = IntRangeValidator(0, 10).coerce(3.7)
+        assert coerced == 4 and isinstance(coerced, int)
+        assert IntRangeValidator(0, 10).coerce(12.2) == 10
+
+    def test_float_coerce(self):
+        fv = FloatRangeValidator(-1.2, 1.2, 1e-3)
+        assert fv.coerce(0.12345) == 0.123
+        assert fv.coerce(-5.0) == -1.2
+        assert fv.coerce(0.3) == 0.3
+        fv = FloatRangeValidator(0.0, 1.05, 0.1)
+        assert fv.coerce(1.04) == 1.0
+        assert fv.validate(FloatRangeValidator(0.0, step=0.1).coerce(0.3))
+
+    def test_float_coerce_unit(self):
+        u = get_unit_registry()
+        fv = FloatRangeValidator(-1.0, 1.0, 0.1, unit='V')
+        assert fv.coerce(1234*u.parse_expression('mV')) == 1.0*u.V
+        assert fv.coerce(0.33) == 0.3
+
+    def test_coerce_array(self):
+        np = importorskip('numpy')
+        iv = IntRangeValidator(1, 10, 2)
+        values = np.array([-3, 1, 4, 6, 10, 12])
+        assert list(iv.coerce_array(values)) == [iv.coerce(v) for v in values]
+        coerced = IntRangeValidator(0, 10).coerce_array([3.7, 12.2, -0.4])
+        assert list(coerced) == [4, 10, 0]
+        assert coerced.dtype.kind == 'i'
+
+        fv = FloatRangeValidator(0.0, 1.05, 0.1)
+        values = np.array([-1, 0.12, 0.36, 1.04, 2.0])
+        assert list(fv.coerce_array(values)) == [fv.coerce(v) for v in values]
+        assert fv.validate_array(fv.coerce_array(values)).all()
+
+        u = get_unit_registry()
+        fv = FloatRangeValidator(-1.0, 1.0, 0.1, unit='V')
+        values = np.array([120., 1234.])*u.parse_expression('mV')
+        coerced = fv.coerce_array(values)
+        assert list(coerced.to('V').magnitude) == [0.1, 1.0]
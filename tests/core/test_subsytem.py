@@ -32,6 +32,16 @@ def test_ss_d_get():
     assert_equal(a.d_get_kwargs, {'a': 2})
 
 
+def test_ss_d_get_many():
+
+    a = SSParent()
+    res = a.ss.default_get_iproperties([None, None], ['T1', 'T2'], 1, a=2)
+    assert_equal(res, ['T1', 'T2'])
+    assert_equal(a.d_get_called, 2)
+    assert_equal(a.d_get_args, (1,))
+    assert_equal(a.d_get_kwargs, {'a': 2})
+
+
 def test_ss_d_set():
     a = SSParent()
     a.ss.default_set_iproperty(None, 'Test', 1, a=2)
@@ -37,3 +37,22 @@ def test_reset_unit_registry(teardown):
     set_unit_registry(ureg)
     with raises(ValueError):
         set_unit_registry(ureg)
+
+
+def test_get_conversion():
+    ureg = get_unit_registry()
+    mv, v = ureg.parse_expression('mV'), ureg.parse_expression('V')
+    assert unit.get_conversion(mv, v) == (0.001, 0.0)
+    assert unit.get_conversion(mv, v) is unit.get_conversion(mv, v)
+    factor, offset = unit.get_conversion(ureg.degC, ureg.kelvin)
+    assert (factor, offset) == (1.0, 273.15)
+
+
+def test_convert():
+    ureg = get_unit_registry()
+    v = ureg.parse_expression('V')
+    assert unit.convert(1500*ureg.parse_expression('mV'), v) == 1.5
+    assert unit.convert(2.0*v, v) == 2.0
+    assert unit.convert(unit.to_quantity(10.0, ureg.degC), ureg.kelvin) ==\
+        283.15
+    assert unit.to_quantity(2.0, v) == 2.0*v
@@ -11,13 +11,165 @@
 """
 from __future__ import (division, unicode_literals, print_function,
                         absolute_import)
+import io
+import os
+import json
+from importlib import import_module as _import_module
 
-from eapii.explore import list_drivers, list_driver_types
+import pytest
 
+from eapii import explore
+from eapii.explore import (list_drivers, list_driver_types, get_driver,
+                           get_driver_type, get_driver_infos)
 
-def test_list_drivers():
+
+@pytest.fixture
+def index(tmpdir, monkeypatch):
+    path = str(tmpdir.join('driver_index.json'))
+    monkeypatch.setattr(explore, '_INDEX_PATH', path)
+    monkeypatch.setattr(explore, '_INDEX', None)
+    monkeypatch.setattr(explore, '_DRIVERS', {})
+    monkeypatch.setattr(explore, '_DRIVER_TYPES', {})
+    return path
+
+
+def test_list_drivers(index):
     assert 'YokogawaGS200' in list_drivers()
 
 
-def test_list_driver_types():
+def test_list_driver_types(index):
     assert 'VisaMessage' in list_driver_types()
+
+
+def test_index_in_user_cache(monkeypatch):
+    monkeypatch.setenv(str('EAPII_CACHE_DIR'), str('/tmp/eapii_cache'))
+    assert explore._cache_directory() == '/tmp/eapii_cache'
+    assert not explore._INDEX_PATH.startswith(explore._PACKAGE_PATH)
+
+
+def test_entry_point_modules(monkeypatch):
+    eps = [('good', 'my_pack.drivers', ''), ('bad', 'my_pack.drivers', 'Drv')]
+    monkeypatch.setattr(explore, '_iter_entry_points', lambda group: eps)
+    failed = {}
+    assert explore._entry_point_modules(failed) == ['my_pack.drivers']
+    assert 'bad' in failed
+
+
+def spy_imports(monkeypatch):
+    imported = []
+
+    def import_module(name):
+        imported.append(name)
+        return _import_module(name)
+
+    monkeypatch.setattr(explore, 'import_module', import_module)
+    return imported
+
+
+def test_index_generation(index):
+    assert 'YokogawaGS200' in list_drivers()
+    with io.open(index, encoding='utf-8') as f:
+        content = json.load(f)
+    assert content['version'] == explore.INDEX_VERSION
+    entry = content['modules']['eapii.visa.yokogawa.model_gs200']
+    assert 'YokogawaGS200' in entry['drivers']
+
+
+def test_index_reuse_and_regeneration(index, monkeypatch):
+    list_drivers()
+    module = 'eapii.visa.yokogawa.model_gs200'
+
+    monkeypatch.setattr(explore, '_INDEX', None)
+    imported = spy_imports(monkeypatch)
+    assert 'YokogawaGS200' in list_drivers()
+    assert not imported
+
+    with io.open(index, encoding='utf-8') as f:
+        content = json.load(f)
+    content['modules'][module]['mtime'] -= 1
+    with io.open(index, 'w', encoding='utf-8') as f:
+        f.write(type('')(json.dumps(content)))
+
+    monkeypatch.setattr(explore, '_INDEX', None)
+    assert 'YokogawaGS200' in list_drivers()
+    assert imported == [module]
+
+
+def test_index_version_mismatch(index, monkeypatch):
+    list_drivers()
+    with io.open(index, 'w', encoding='utf-8') as f:
+        f.write(type('')(json.dumps({'version': -1, 'modules': {}})))
+
+    monkeypatch.setattr(explore, '_INDEX', None)
+    imported = spy_imports(monkeypatch)
+    list_drivers()
+    assert 'eapii.visa.yokogawa.model_gs200' in imported
+
+
+def test_get_driver_single_import(index, monkeypatch):
+    list_drivers()
+    monkeypatch.setattr(explore, '_DRIVERS', {})
+    imported = spy_imports(monkeypatch)
+    driver = get_driver('YokogawaGS200')
+    assert driver.__name__ == 'YokogawaGS200'
+    assert imported == ['eapii.visa.yokogawa.model_gs200']
+
+
+def test_get_driver_unknown(index):
+    with pytest.raises(KeyError):
+        get_driver('__unknown__')
+
+
+def test_get_driver_type(index):
+    assert get_driver_type('VisaMessage').__name__ == 'VisaMessageInstrument'
+
+
+def test_get_driver_infos(index):
+    infos = get_driver_infos('YokogawaGS200')
+    assert infos['module'] == 'eapii.visa.yokogawa.model_gs200'
+    assert infos['driver_type'] == 'VisaMessage'
+    assert 'GPIB' in infos['protocols']
+
+
+def test_list_drivers_filters(index):
+    def filter_gs200(drivers):
+        del drivers['YokogawaGS200']
+
+    drivers = list_drivers([filter_gs200])
+    assert drivers
+    assert 'YokogawaGS200' not in drivers
+
+
+def test_index_directory_creation(index, monkeypatch):
+    path = os.path.join(os.path.dirname(index), 'missing', 'index.json')
+    monkeypatch.setattr(explore, '_INDEX_PATH', path)
+    list_drivers()
+    assert os.path.isfile(path)
+
+
+def test_unwritable_index(index, monkeypatch, caplog):
+    with io.open(index, 'w', encoding='utf-8') as f:
+        f.write('')
+    monkeypatch.setattr(explore, '_INDEX_PATH',
+                        os.path.join(index, 'missing', 'index.json'))
+    assert 'YokogawaGS200' in list_drivers()
+    assert any(r.levelname == 'WARNING' for r in caplog.records)
+
+
+def test_get_driver_import_failure(index, monkeypatch):
+    list_drivers()
+    monkeypatch.setattr(explore, '_DRIVERS', {})
+
+    def import_module(name):
+        raise ImportError('Broken dependency')
+
+    monkeypatch.setattr(explore, 'import_module', import_module)
+    with pytest.raises(KeyError) as e:
+        get_driver('YokogawaGS200')
+    assert isinstance(e.value.__cause__, ImportError)
+
+
+def test_explore_missing_package():
+    failed = {}
+    assert explore._explore_package('dummy', '__dummy__', failed) == ([], [])
+    assert 'dummy' in failed
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Module dedicated to testing the binary block helpers.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from pytest import raises
+
+from eapii.core.errors import InstrIOError
+from eapii.visa.binary import (parse_block_header, block_header,
+                                BufferPool)
+
+
+def test_parse_block_header():
+    assert parse_block_header(b'#210abcdefghij') == (4, 10)
+    assert parse_block_header(bytearray(b' #14abcd')) == (4, 4)
+    assert parse_block_header(memoryview(b'#0abc\n')) == (2, None)
+
+
+def test_parse_invalid_header():
+    for data in (b'abc', b'#', b'#a12', b'#31', b'#2a0'):
+        with raises(InstrIOError):
+            parse_block_header(data)
+
+
+def test_block_header():
+    assert block_header(10) == b'#210'
+    assert block_header(0) == b'#10'
+
+
+def test_buffer_pool():
+    pool = BufferPool(2, 8)
+    a = pool.acquire()
+    b = pool.acquire()
+    with raises(RuntimeError):
+        pool.acquire(timeout=0.01)
+
+    view = pool.view(a, 3)
+    assert len(view) == 3
+    pool.release(view)
+    assert pool.acquire(timeout=0.01) is a
+    pool.release(b)
+    with raises(ValueError):
+        pool.release(bytearray(8))
+    with raises(ValueError):
+        pool.release(b)
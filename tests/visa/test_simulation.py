@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Module dedicated to testing the simulated VISA backend.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from pytest import raises, yield_fixture
+
+from eapii.core.unit import get_unit_registry
+from eapii.visa import visa
+from eapii.visa.visa import (VisaIOError, SIMULATION_BACKEND,
+                             get_backend_resource_manager)
+from eapii.visa.simulation import (SimulatedResourceManager, ScpiInstrument,
+                                   SimulatedGS200, Simulated7651,
+                                   scpi_pattern)
+from eapii.visa.yokogawa.model_gs200 import YokogawaGS200
+from eapii.visa.yokogawa.model_7651 import Yokogawa7651
+
+
+@yield_fixture
+def rm():
+    visa.BACKEND_MANAGERS.clear()
+    yield get_backend_resource_manager(SIMULATION_BACKEND)
+    visa.BACKEND_MANAGERS.clear()
+
+
+def connect(rm, driver_cls, instrument, address):
+    rm.add_instrument('GPIB::{}::INSTR'.format(address), instrument)
+    return driver_cls({'type': 'GPIB', 'address': address,
+                       'backend': SIMULATION_BACKEND})
+
+
+def test_scpi_pattern():
+    pattern = scpi_pattern('[SOURce]:LEVel')
+    for header in ('SOUR:LEV', 'source:level', 'LEV', 'SOURCE:LEV'):
+        assert pattern.match(header)
+    for header in ('SOU:LEV', 'SOUR:LEVE:X', 'SOUR'):
+        assert not pattern.match(header)
+
+
+def test_scpi_processing():
+    instr = SimulatedGS200()
+    instr.write('SOUR:FUNC CURR;RANG 10;:SOUR:LEV 2;*IDN?;LEV?')
+    assert instr.read() == SimulatedGS200.identity + ';+2.000000E+00'
+    assert instr.range['CURR'] == 10.0
+    with raises(VisaIOError):
+        instr.read()
+
+    instr.write(':SOUR:LEV 100')
+    assert instr.read_stb() & 4
+    instr.write(':STAT:ERR?')
+    assert instr.read() == '-222,"Data out of range"'
+
+    instr.write('FOO?')
+    instr.write('*ESR?')
+    assert instr.read() == str((1 << 4) | (1 << 5))
+    assert isinstance(instr, ScpiInstrument)
+
+
+def test_read_bytes(rm):
+    rm.add_instrument('GPIB::4::INSTR', SimulatedGS200())
+    res = rm.open_resource('GPIB::4::INSTR')
+    res.write('*IDN?')
+    answer = res.read_raw()
+    res.write('*IDN?')
+    assert res.read_bytes(3) == answer[:3]
+    assert res.read_bytes(len(answer) - 3) == answer[3:]
+    with raises(VisaIOError):
+        res.read_bytes(1)
+
+
+def test_unknown_resource(rm):
+    with raises(VisaIOError):
+        rm.open_resource('GPIB::30::INSTR')
+
+
+def test_set_resource_manager():
+    visa.RESOURCE_MANAGER = None
+    try:
+        rm = SimulatedResourceManager()
+        visa.set_visa_resource_manager(rm)
+        instr = SimulatedGS200()
+        rm.add_instrument('TCPIP::192.168.0.2::INSTR', instr)
+        driver = YokogawaGS200({'type': 'TCPIP', 'address': '192.168.0.2'})
+        assert driver.function == 'Voltage'
+    finally:
+        visa.RESOURCE_MANAGER = None
+
+
+def test_gs200_driver(rm):
+    instr = SimulatedGS200()
+    driver = connect(rm, YokogawaGS200, instr, '1')
+    ureg = get_unit_registry()
+    driver.function = 'Current'
+    driver.current_range = 10*ureg.mA
+    driver.current = 5*ureg.mA
+    driver.output = True
+    assert instr.function == 'CURR'
+    assert instr.level['CURR'] == 5.0
+    assert instr.output
+
+    driver.clear_cache()
+    instr.reset_counters()
+    values = driver.get_many(['function', 'current_range', 'output'])
+    assert list(values.values()) == ['Current', 10*ureg.mA, True]
+    # The function is retrieved first as it is needed by the checks.
+    assert instr.reads == 2
+
+
+def test_7651_driver(rm):
+    instr = Simulated7651()
+    driver = connect(rm, Yokogawa7651, instr, '2')
+    assert driver.function == 'Voltage'
+    assert driver.voltage_range.magnitude == 10.0
+    ureg = get_unit_registry()
+    driver.voltage_range = 1*ureg.V
+    driver.voltage = 0.5*ureg.V
+    driver.output = True
+    assert instr.level[1] == 0.5
+    driver.clear_cache()
+    assert driver.voltage.magnitude == 0.5
+    assert driver.output
+
+
+def test_error_injection(rm):
+    instr = SimulatedGS200(seed=0)
+    driver = connect(rm, YokogawaGS200, instr, '3')
+    instr.fail_next()
+    # The function is secured by a new attempt.
+    assert driver.function == 'Voltage'
+    assert instr.errors == 1
+
+    instr.error_rate = 1.0
+    with raises(VisaIOError):
+        driver.query('*IDN?')
+
+
+def test_latency_and_throughput():
+    instr = SimulatedGS200(latency=0.01, throughput=1000)
+    instr._transfer('')
+    from timeit import default_timer
+    start = default_timer()
+    instr.write('*IDN?')
+    instr.read()
+    elapsed = default_timer() - start
+    assert elapsed > 0.02 + (5 + len(instr.identity))/1000
+    assert (instr.writes, instr.reads) == (1, 1)
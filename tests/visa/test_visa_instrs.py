@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+#------------------------------------------------------------------------------
+# Copyright 2014 by Eapii Authors, see AUTHORS for more details.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENCE, distributed with this software.
+#------------------------------------------------------------------------------
+"""Module dedicated to testing the VISA base drivers.
+
+"""
+from __future__ import (division, unicode_literals, print_function,
+                        absolute_import)
+from pytest import raises, importorskip
+
+from eapii.core.errors import InstrIOError
+from eapii.core.channel import Channel
+from eapii.core.iprops.i_property import IProperty
+from eapii.core.iprops.arrays import Array
+from eapii.visa.visa_instrs import VisaMessageInstrument
+from eapii.visa.standards import IEC60488
+from eapii.visa.binary import BufferPool
+
+
+class FakeResource(object):
+    """Fake VISA resource recording the queries.
+
+    """
+    def __init__(self, answers):
+        self.answers = answers
+        self.queries = []
+        self.reads = []
+        self.chunk_size = 4
+
+    def query(self, message):
+        self.queries.append(message)
+        return self.answers[message]
+
+    def write(self, message):
+        self.queries.append(message)
+        self.pending = self.answers.get(message, b'')
+
+    def read_raw(self, size=None):
+        data, self.pending = self.pending, b''
+        return data
+
+    def read_bytes(self, count):
+        self.reads.append(count)
+        data, self.pending = self.pending[:count], self.pending[count:]
+        return data
+
+    def write_raw(self, message):
+        self.queries.append(message)
+
+    def clear(self):
+        self.pending = b''
+
+
+class MessageDriver(VisaMessageInstrument):
+
+    voltage = IProperty(getter='SOUR:VOLT?')
+
+    current = IProperty(getter='SOUR:CURR?')
+
+    idn = IProperty(getter='*IDN?')
+
+    trace = Array(setter='TRAC ', dtype='i2')
+
+    ch = Channel()
+    ch.trace = Array(getter='TRAC? {ch_id}', dtype='i2')
+
+    def default_check_instr_operation(self, iprop, value, i_value):
+        return True, None
+
+
+def create_driver(answers):
+    driver = MessageDriver({'type': 'GPIB', 'address': '1', 'mode': 'INSTR'},
+                           auto_open=False)
+    driver._driver = FakeResource(answers)
+    driver._driver._encoding = 'ascii'
+    driver._driver._write_termination = '\n'
+    driver._driver._read_termination = '\n'
+    return driver
+
+
+def test_get_many_single_message():
+    message = ':SOUR:VOLT?;:SOUR:CURR?;*IDN?'
+    driver = create_driver({message: '1.0;2.0; Fake'})
+    driver.query_separator = ';'
+    values = driver.get_many(['voltage', 'current', 'idn'])
+    assert list(values.values()) == ['1.0', '2.0', 'Fake']
+    assert driver._driver.queries == [message]
+
+
+def test_get_many_no_separator():
+    driver = create_driver({'SOUR:VOLT?': '1.0', 'SOUR:CURR?': '2.0'})
+    values = driver.get_many(['voltage', 'current'])
+    assert list(values.values()) == ['1.0', '2.0']
+    assert driver._driver.queries == ['SOUR:VOLT?', 'SOUR:CURR?']
+
+
+def test_get_many_wrong_answers_number():
+    message = ':SOUR:VOLT?;*IDN?'
+    driver = create_driver({message: '1.0;"Fake;1"', 'SOUR:VOLT?': '1.0',
+                            '*IDN?': '"Fake;1"'})
+    driver.query_separator = ';'
+    values = driver.get_many(['voltage', 'idn'])
+    assert list(values.values()) == ['1.0', '"Fake;1"']
+    assert driver._driver.queries == [message, 'SOUR:VOLT?', '*IDN?']
+
+
+def test_query_separator_opt_in():
+    assert VisaMessageInstrument.query_separator is None
+    assert IEC60488.query_separator == ';'
+
+
+def test_bus_id():
+    driver = create_driver({})
+    assert driver.bus_id == 'GPIB0'
+    driver.connection_str = 'GPIB2::3::INSTR'
+    assert driver.bus_id == 'GPIB2'
+    driver.connection_str = 'TCPIP::192.168.0.1::INSTR'
+    assert driver.bus_id is None
+
+
+def test_get_array():
+    np = importorskip('numpy')
+    data = np.arange(5, dtype='<i2').tobytes()
+    driver = create_driver({'TRAC? 1': b'#210' + data + b'\n',
+                            'TRAC? 2': b'#0' + data + b'\n'})
+    trace = driver.get_ch(1).trace
+    assert list(trace) == list(range(5))
+    assert trace.flags.writeable
+    assert driver._driver.pending == b''
+    assert list(driver.get_ch(2).trace) == list(range(5))
+
+
+def test_set_array():
+    np = importorskip('numpy')
+    driver = create_driver({})
+    driver.trace = np.array([1, 2])
+    assert driver._driver.queries == [b'TRAC #14\x01\x00\x02\x00\n']
+
+
+def test_read_binary_into():
+    data = bytes(bytearray(range(10)))
+    driver = create_driver({'DATA?': b'#210' + data + b'\n'})
+    buf = bytearray(12)
+    assert driver.query_binary_into('DATA?', buf) == 10
+    assert bytes(buf[:10]) == data
+    assert driver._driver.reads == [1, 1, 2, 4, 4, 2, 1]
+
+    driver._driver.write('DATA?')
+    view = memoryview(bytearray(10))
+    assert driver.read_binary_into(view, chunk_size=20) == 10
+    assert view.tobytes() == data
+
+
+def test_read_binary_into_array(tmpdir):
+    np = importorskip('numpy')
+    values = np.arange(6, dtype='<f4')
+    driver = create_driver({'DATA?': b'#224' + values.tobytes() + b'\n'})
+    out = np.zeros(6, dtype='<f4')
+    driver.query_binary_into('DATA?', out)
+    assert list(out) == list(values)
+
+    path = str(tmpdir.join('data.bin'))
+    mapped = np.memmap(path, dtype='<f4', mode='w+', shape=(2, 3))
+    driver.query_binary_into('DATA?', mapped)
+    mapped.flush()
+    assert list(np.fromfile(path, dtype='<f4')) == list(values)
+
+
+def test_read_binary_into_errors():
+    driver = create_driver({'DATA?': b'#210' + b'0'*10 + b'\n',
+                            'BAD?': b'#a'})
+    with raises(ValueError):
+        driver.query_binary_into('DATA?', bytearray(5))
+    with raises(ValueError):
+        driver.query_binary_into('DATA?', b'0'*10)
+    with raises(InstrIOError):
+        driver.query_binary_into('BAD?', bytearray(5))
+
+
+def test_stream_binary():
+    data = bytes(bytearray(range(10)))
+    driver = create_driver({'DATA?': b'#210' + data + b'\n'})
+    stream = driver.stream_binary('DATA?')
+    assert driver._driver.queries == []
+    chunks = [c.tobytes() for c in stream]
+    assert chunks == [data[:4], data[4:8], data[8:]]
+    assert driver._driver.pending == b''
+
+    driver._driver.write('DATA?')
+    stream = driver.stream_binary(chunk_size=6)
+    assert next(stream).tobytes() == data[:6]
+    stream.close()
+    assert driver._driver.pending == b''
+
+
+def test_stream_binary_pool(tmpdir):
+    np = importorskip('numpy')
+    values = np.arange(10, dtype='<i2')
+    driver = create_driver({'DATA?': b'#220' + values.tobytes() + b'\n'})
+    pool = BufferPool(2, 7)
+    chunks = []
+    for chunk in driver.stream_binary('DATA?', dtype='<i2', pool=pool):
+        chunks.append(chunk.copy())
+        if len(chunks) % 2:
+            held = chunk
+        else:
+            pool.release(held)
+            pool.release(chunk)
+    assert [len(c) for c in chunks] == [3, 3, 3, 1]
+    assert list(np.concatenate(chunks)) == list(values)
+
+    path = tmpdir.join('trace.bin')
+    with open(str(path), 'wb') as f:
+        for chunk in driver.stream_binary('DATA?', chunk_size=8):
+            f.write(chunk)
+    assert path.read_binary() == values.tobytes()
+
+
+def test_stream_binary_read_error():
+    driver = create_driver({'DATA?': b'#210' + b'0123456789\n'})
+    pool = BufferPool(1, 4)
+
+    def fail(count):
+        raise InstrIOError('Timeout')
+
+    stream = driver.stream_binary('DATA?', pool=pool)
+    pool.release(next(stream))
+    driver._driver.read_bytes = fail
+    with raises(InstrIOError):
+        next(stream)
+    pool.release(pool.acquire(timeout=0.01))
+
+
+def test_stream_binary_errors():
+    driver = create_driver({'DATA?': b'#13abc\n', 'SHORT?': b'#210abc'})
+    with raises(ValueError):
+        driver.stream_binary('DATA?', dtype='f4', chunk_size=2)
+    with raises(InstrIOError):
+        list(driver.stream_binary('DATA?', dtype='i2'))
+    with raises(InstrIOError):
+        list(driver.stream_binary('SHORT?', chunk_size=2))